@@ -0,0 +1,457 @@
+"""
+Load benchmarks for httpbin.
+
+Drives every router either in-process over ASGI or against a locally started uvicorn
+server, and reports req/s and p50/p99/p999 latency per endpoint, concurrency level and
+payload size. Results are written as JSON; ``compare`` fails when a run regresses
+against a baseline by more than a threshold.
+
+Usage::
+
+    uv run python benchmarks/bench.py run --mode asgi --output baseline.json
+    uv run python benchmarks/bench.py run --mode server --concurrency 1 16 64
+    uv run python benchmarks/bench.py compare baseline.json current.json --threshold 10
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One endpoint to benchmark; ``{size}`` in the path is filled from the payload size"""
+
+    name: str
+    method: str = "GET"
+    path: str = ""
+    headers: tuple[tuple[str, str], ...] = ()
+    # How the payload size is applied: "body" sends that many bytes, "path" fills {size}
+    payload: str | None = None
+    # Only run when this boolean setting is on (e.g. an opt-in router)
+    setting: str | None = None
+
+    def url(self, size: int) -> str:
+        return (self.path or self.name).format(size=size)
+
+
+SCENARIOS: tuple[Scenario, ...] = (
+    # HTTP methods
+    Scenario("/get"),
+    Scenario("/post", method="POST", payload="body"),
+    Scenario("/put", method="PUT", payload="body"),
+    Scenario("/patch", method="PATCH", payload="body"),
+    Scenario("/delete", method="DELETE"),
+    # Status codes
+    Scenario("/status/{codes}", path="/status/200"),
+    Scenario("/status/{codes} (list)", path="/status/200,201,204"),
+    # Request inspection
+    Scenario("/headers"),
+    Scenario("/ip"),
+    Scenario("/user-agent"),
+    # Response formats
+    Scenario("/json"),
+    Scenario("/json (gzip)", path="/json", headers=(("Accept-Encoding", "gzip"),)),
+    Scenario("/html"),
+    Scenario("/xml"),
+    Scenario("/robots.txt"),
+    Scenario("/gzip"),
+    Scenario("/deflate"),
+    Scenario("/brotli"),
+    Scenario("/image", headers=(("Accept", "image/webp,image/*;q=0.8"),)),
+    Scenario("/image/png"),
+    Scenario("/image/svg (gzip)", path="/image/svg", headers=(("Accept-Encoding", "gzip"),)),
+    Scenario("/image/{width}x{height}", path="/image/256x256"),
+    # Dynamic behavior
+    Scenario("/delay/{seconds}", path="/delay/0"),
+    Scenario("/uuid"),
+    Scenario("/base64/{value}", path="/base64/SGVsbG8gV29ybGQ="),
+    Scenario("/bytes/{n}", path="/bytes/{size}", payload="path"),
+    Scenario("/stream/{n}", path="/stream/10"),
+    Scenario("/stream-bytes/{n}", path="/stream-bytes/{size}", payload="path"),
+    Scenario("/range/{n}", path="/range/{size}", payload="path"),
+    Scenario("/payload", path="/payload?size={size}", payload="path"),
+    Scenario("/payload (ndjson)", path="/payload?items=100&format=ndjson"),
+    Scenario("/drip", path="/drip?numbytes={size}&duration=0&delay=0", payload="path"),
+    Scenario("/limit/{rate}", path="/limit/1000000/s"),
+    Scenario("/limit/{rate} (429)", path="/limit/1/d"),
+    # Redirects (one hop each; the suite does not follow Location)
+    Scenario("/redirect/{n}", path="/redirect/5"),
+    Scenario("/relative-redirect/{n}", path="/relative-redirect/5"),
+    Scenario("/absolute-redirect/{n}", path="/absolute-redirect/5"),
+    Scenario("/redirect-to", path="/redirect-to?url=/get"),
+    # Caching
+    Scenario("/cache"),
+    Scenario("/cache (304)", path="/cache", headers=(("If-None-Match", '"x"'),)),
+    Scenario("/cache/{n}", path="/cache/60"),
+    Scenario("/etag/{etag}", path="/etag/abc"),
+    Scenario("/etag/{etag} (304)", path="/etag/abc", headers=(("If-None-Match", '"abc"'),)),
+    # Realtime
+    Scenario("/sse", path="/sse?count=1&interval=0.01"),
+    # Metrics
+    Scenario("/metrics", setting="METRICS_ENABLED"),
+)
+
+
+@dataclass
+class Result:
+    endpoint: str
+    mode: str
+    concurrency: int
+    payload_size: int
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p99_ms: float
+    p999_ms: float
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class ASGIDriver:
+    """
+    Calls the ASGI app directly with a synthetic scope, so in-process numbers measure
+    the application rather than an HTTP client library.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def request(
+        self, method: str, url: str, content: bytes | None, headers: dict[str, str]
+    ) -> int:
+        path, _, query = url.partition("?")
+        body = content or b""
+        raw_headers = [(b"host", b"testserver"), (b"user-agent", b"httpbin-bench")]
+        raw_headers += [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+        if content is not None:
+            raw_headers.append((b"content-length", str(len(body)).encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        status = 0
+        request_sent = False
+        disconnected = asyncio.Event()
+
+        async def receive() -> dict:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        await self.app(scope, receive, send)
+        disconnected.set()
+        return status
+
+
+class HTTPDriver:
+    """
+    Minimal keep-alive HTTP/1.1 client for server mode. Each benchmark worker owns one
+    connection, so the load generator stays far cheaper than the server under test.
+    """
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self._connections: dict[int, tuple[asyncio.StreamReader, asyncio.StreamWriter]] = {}
+
+    async def request(
+        self, method: str, url: str, content: bytes | None, headers: dict[str, str]
+    ) -> int:
+        task_id = id(asyncio.current_task())
+        connection = self._connections.get(task_id)
+        if connection is None:
+            connection = await asyncio.open_connection(self.host, self.port)
+            self._connections[task_id] = connection
+        reader, writer = connection
+
+        lines = [f"{method} {url} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        if content is not None:
+            lines.append(f"Content-Length: {len(content)}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (content or b""))
+
+        head = await reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        status = int(status_line.split(" ", 2)[1])
+        response_headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in response_headers:
+            await reader.readexactly(int(response_headers["content-length"]))
+        elif response_headers.get("transfer-encoding") == "chunked":
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        return status
+
+    async def close(self) -> None:
+        for _, writer in self._connections.values():
+            writer.close()
+        self._connections.clear()
+
+
+async def measure(
+    driver: ASGIDriver | HTTPDriver,
+    scenario: Scenario,
+    size: int,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> tuple[int, int, float, list[float]]:
+    """Hammer one scenario with ``concurrency`` workers; returns counts and latencies"""
+    url = scenario.url(size)
+    body = b"x" * size if scenario.payload == "body" else None
+    headers = dict(scenario.headers)
+    latencies: list[float] = []
+    errors = 0
+    recording = False
+    deadline = 0.0
+
+    async def worker() -> None:
+        nonlocal errors
+        while True:
+            start = time.perf_counter()
+            if start >= deadline:
+                return
+            try:
+                status = await driver.request(scenario.method, url, body, headers)
+                failed = status >= 500
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                failed = True
+            elapsed = time.perf_counter() - start
+            if recording:
+                latencies.append(elapsed)
+                errors += failed
+
+    async def run_for(seconds: float) -> float:
+        nonlocal deadline
+        started = time.perf_counter()
+        deadline = started + seconds
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - started
+
+    if warmup > 0:
+        await run_for(warmup)
+    recording = True
+    elapsed = await run_for(duration)
+    return len(latencies), errors, elapsed, latencies
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _start_server(workers: int) -> tuple[subprocess.Popen, int]:
+    """Start uvicorn on a free local port and wait until it answers"""
+    port = _free_port()
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "httpbin.main:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ]
+    process = subprocess.Popen(command)
+    for _ in range(200):
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return process, port
+        except OSError:
+            await asyncio.sleep(0.05)
+    process.terminate()
+    raise RuntimeError("uvicorn did not start within 10 seconds")
+
+
+def _select(names: list[str] | None) -> list[Scenario]:
+    from httpbin.config import settings
+
+    selected = []
+    for scenario in SCENARIOS:
+        if names and scenario.name not in names and scenario.url(0) not in names:
+            continue
+        if scenario.setting and not getattr(settings, scenario.setting):
+            print(f"Skipping {scenario.name}: HTTPBIN_{scenario.setting} is off", flush=True)
+            continue
+        selected.append(scenario)
+    if not selected:
+        raise SystemExit(f"No scenarios match {names}")
+    return selected
+
+
+async def run_benchmarks(args: argparse.Namespace) -> list[Result]:
+    process = None
+    if args.mode == "asgi":
+        from httpbin.main import app
+
+        asgi_driver = ASGIDriver(app)
+    else:
+        process, port = await _start_server(args.workers)
+
+    results = []
+    try:
+        for scenario in _select(args.endpoint):
+            sizes = args.payload_sizes if scenario.payload else [0]
+            for size in sizes:
+                for concurrency in args.concurrency:
+                    cell = (scenario, size, concurrency, args.duration, args.warmup)
+                    if process is None:
+                        count, errors, elapsed, latencies = await measure(asgi_driver, *cell)
+                    else:
+                        http_driver = HTTPDriver("127.0.0.1", port)
+                        try:
+                            count, errors, elapsed, latencies = await measure(http_driver, *cell)
+                        finally:
+                            await http_driver.close()
+                    latencies.sort()
+                    result = Result(
+                        endpoint=scenario.name,
+                        mode=args.mode,
+                        concurrency=concurrency,
+                        payload_size=size,
+                        requests=count,
+                        errors=errors,
+                        rps=round(count / elapsed, 1) if elapsed else 0.0,
+                        p50_ms=round(percentile(latencies, 0.50) * 1000, 3),
+                        p99_ms=round(percentile(latencies, 0.99) * 1000, 3),
+                        p999_ms=round(percentile(latencies, 0.999) * 1000, 3),
+                    )
+                    results.append(result)
+                    print(
+                        f"{result.endpoint:<28} c={concurrency:<4} size={size:<8} "
+                        f"{result.rps:>10.1f} req/s  p50={result.p50_ms:.3f}ms "
+                        f"p99={result.p99_ms:.3f}ms p999={result.p999_ms:.3f}ms"
+                        + (f"  errors={errors}" if errors else ""),
+                        flush=True,
+                    )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+    return results
+
+
+def _key(result: dict) -> tuple:
+    return (result["endpoint"], result["mode"], result["concurrency"], result["payload_size"])
+
+
+def compare(baseline_path: Path, current_path: Path, threshold: float) -> int:
+    """Print a per-cell comparison; returns the number of regressions past threshold %"""
+    baseline = {_key(r): r for r in json.loads(baseline_path.read_text())["results"]}
+    current = {_key(r): r for r in json.loads(current_path.read_text())["results"]}
+
+    regressions = 0
+    for key in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[key], current[key]
+        rps_change = (after["rps"] - before["rps"]) / before["rps"] * 100 if before["rps"] else 0
+        p99_change = (
+            (after["p99_ms"] - before["p99_ms"]) / before["p99_ms"] * 100 if before["p99_ms"] else 0
+        )
+        regressed = rps_change < -threshold or p99_change > threshold
+        regressions += regressed
+        endpoint, mode, concurrency, size = key
+        print(
+            f"{'REGRESSION' if regressed else 'ok':<10} {endpoint:<28} {mode:<6} "
+            f"c={concurrency:<4} size={size:<8} req/s {before['rps']:>10.1f} -> "
+            f"{after['rps']:>10.1f} ({rps_change:+.1f}%)  p99 {before['p99_ms']:.3f} -> "
+            f"{after['p99_ms']:.3f}ms ({p99_change:+.1f}%)"
+        )
+
+    missing = len(baseline.keys() - current.keys())
+    if missing:
+        print(f"{missing} baseline cell(s) not present in the current run")
+    print(f"{regressions} regression(s) beyond {threshold}%")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="httpbin load benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmark suite")
+    run.add_argument("--mode", choices=["asgi", "server"], default="asgi")
+    run.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    run.add_argument("--payload-sizes", type=int, nargs="+", default=[64, 4096, 65536])
+    run.add_argument("--duration", type=float, default=2.0, help="Seconds measured per cell")
+    run.add_argument("--warmup", type=float, default=0.5, help="Seconds discarded per cell")
+    run.add_argument("--workers", type=int, default=1, help="uvicorn workers in server mode")
+    run.add_argument("--endpoint", nargs="+", help="Only run these scenarios")
+    run.add_argument("--output", type=Path, help="Write results as JSON to this file")
+
+    cmp = commands.add_parser("compare", help="Compare two result files")
+    cmp.add_argument("baseline", type=Path)
+    cmp.add_argument("current", type=Path)
+    cmp.add_argument("--threshold", type=float, default=10.0, help="Allowed regression in percent")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        return 1 if compare(args.baseline, args.current, args.threshold) else 0
+
+    results = asyncio.run(run_benchmarks(args))
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "mode": args.mode,
+                "duration": args.duration,
+                "workers": args.workers if args.mode == "server" else None,
+            },
+            "results": [asdict(result) for result in results],
+        }
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"Wrote {len(results)} results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
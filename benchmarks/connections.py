@@ -0,0 +1,213 @@
+"""
+Idle and active connection capacity of one httpbin worker.
+
+Starts a single uvicorn worker, then:
+
+* holds ``--idle`` server-sent event streams and ``--idle`` WebSocket echo
+  connections open without traffic and reports the server memory each one costs;
+* opens ``--active`` ``/sse`` subscribers ticking every ``--interval`` seconds and
+  reports the events delivered per second and how late they arrived;
+* runs ``--active`` WebSocket clients echoing messages back to back and reports
+  the round trips per second.
+
+The client runs in this process, so on one machine the active figures are a lower
+bound. The memory figures read the worker's RSS from /proc, so they need Linux.
+
+Usage::
+
+    uv run python benchmarks/connections.py --idle 10000 --active 1000
+"""
+
+import argparse
+import asyncio
+import resource
+import socket
+import subprocess
+import sys
+import time
+from contextlib import suppress
+from pathlib import Path
+
+from websockets.asyncio.client import connect
+
+HOST = "127.0.0.1"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def _rss(pid: int) -> int:
+    """Resident set size of a process in bytes"""
+    with Path(f"/proc/{pid}/status").open() as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError("VmRSS not found")
+
+
+async def _start_server(port: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "httpbin.main:app",
+            "--host",
+            HOST,
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "--backlog",
+            "65535",
+        ]
+    )
+    for _ in range(200):
+        with suppress(OSError):
+            _, writer = await asyncio.open_connection(HOST, port)
+            writer.close()
+            return server
+        await asyncio.sleep(0.05)
+    server.kill()
+    raise RuntimeError("server did not start")
+
+
+async def _open_sse(port: int, query: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(f"GET /sse?{query} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+    await reader.readuntil(b"\r\n\r\n")
+    return reader, writer
+
+
+async def _open_many(factory, count: int, batch: int = 500) -> list:
+    opened = []
+    for start in range(0, count, batch):
+        opened += await asyncio.gather(*(factory() for _ in range(min(batch, count - start))))
+    return opened
+
+
+async def _idle(port: int, pid: int, count: int) -> dict:
+    baseline = _rss(pid)
+    streams = await _open_many(lambda: _open_sse(port, "count=100000&interval=10"), count)
+    await asyncio.sleep(0.5)
+    sse_bytes = (_rss(pid) - baseline) // count
+
+    baseline = _rss(pid)
+    websockets = await _open_many(lambda: connect(f"ws://{HOST}:{port}/ws/echo"), count)
+    await asyncio.sleep(0.5)
+    ws_bytes = (_rss(pid) - baseline) // count
+
+    for _, writer in streams:
+        writer.close()
+    await asyncio.gather(*(websocket.close() for websocket in websockets))
+    return {
+        "idle_connections": count,
+        "bytes_per_idle_sse": sse_bytes,
+        "bytes_per_idle_ws": ws_bytes,
+    }
+
+
+async def _active_sse(port: int, count: int, interval: float, duration: float) -> dict:
+    ticks = max(1, int(duration / interval))
+    streams = await _open_many(lambda: _open_sse(port, f"count={ticks}&interval={interval}"), count)
+    lags: list[float] = []
+    dropped = 0
+
+    async def consume(reader: asyncio.StreamReader) -> None:
+        nonlocal dropped
+        while True:
+            line = await reader.readline()
+            if not line or line == b"0\r\n":
+                return
+            if line.startswith(b": dropped "):
+                dropped += int(line[10:])
+            elif line.startswith(b"data: "):
+                sent = float(line.rsplit(b'"time":', 1)[1].rstrip(b"}\r\n"))
+                lags.append(time.time() - sent)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(consume(reader) for reader, _ in streams))
+    elapsed = time.perf_counter() - start
+    for _, writer in streams:
+        writer.close()
+
+    lags.sort()
+    return {
+        "active_sse": count,
+        "sse_events_per_second": round(len(lags) / elapsed),
+        "sse_expected_per_second": round(count / interval),
+        "sse_dropped_ticks": dropped,
+        "sse_lag_p50_ms": round(lags[len(lags) // 2] * 1000, 1),
+        "sse_lag_p99_ms": round(lags[int(len(lags) * 0.99)] * 1000, 1),
+    }
+
+
+async def _active_ws(port: int, count: int, duration: float) -> dict:
+    websockets = await _open_many(lambda: connect(f"ws://{HOST}:{port}/ws/echo"), count)
+    deadline = time.perf_counter() + duration
+    round_trips = 0
+
+    async def echo(websocket) -> None:
+        nonlocal round_trips
+        while time.perf_counter() < deadline:
+            await websocket.send("ping")
+            await websocket.recv()
+            round_trips += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(echo(websocket) for websocket in websockets))
+    elapsed = time.perf_counter() - start
+    await asyncio.gather(*(websocket.close() for websocket in websockets))
+    return {"active_ws": count, "ws_round_trips_per_second": round(round_trips / elapsed)}
+
+
+async def run(idle: int, active: int, interval: float, duration: float) -> dict:
+    port = _free_port()
+    server = await _start_server(port)
+    try:
+        result = await _idle(port, server.pid, idle)
+        result |= await _active_sse(port, active, interval, duration)
+        result |= await _active_ws(port, active, duration)
+        result["worker_rss_mb"] = _rss(server.pid) // (1024 * 1024)
+    finally:
+        server.terminate()
+        server.wait()
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="httpbin connection capacity")
+    parser.add_argument("--idle", type=int, default=5_000, help="Idle connections of each kind")
+    parser.add_argument("--active", type=int, default=1_000, help="Active connections of each kind")
+    parser.add_argument("--interval", type=float, default=0.1, help="Active /sse tick interval")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of active traffic")
+    parser.add_argument(
+        "--memory-mb", type=int, default=1024, help="Worker memory budget for the estimate"
+    )
+    args = parser.parse_args(argv)
+
+    # Every connection uses a descriptor here and in the worker
+    needed = 2 * args.idle + args.active + 1024
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        print(f"raise the open file limit to at least {needed} (ulimit -n)", file=sys.stderr)
+        return 1
+
+    result = asyncio.run(run(args.idle, args.active, args.interval, args.duration))
+    for key, value in result.items():
+        print(f"{key:<26}{value}")
+    budget = args.memory_mb * 1024 * 1024
+    for kind in ("sse", "ws"):
+        per_connection = max(result[f"bytes_per_idle_{kind}"], 1)
+        print(
+            f"{'idle_' + kind + '_capacity':<26}~{budget // per_connection:,} "
+            f"connections per {args.memory_mb} MB"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
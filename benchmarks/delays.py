@@ -0,0 +1,121 @@
+"""
+Pending delay capacity of one httpbin worker.
+
+Opens ``--count`` concurrent ``/delay`` requests in-process over ASGI, holds them all
+open, and reports the memory each pending delay costs and how long scheduling and
+waking them took. The memory figure bounds how many delays one worker can hold.
+
+Usage::
+
+    uv run python benchmarks/delays.py --count 50000 --delay 5
+"""
+
+import argparse
+import asyncio
+import gc
+import resource
+import sys
+import time
+
+from httpbin.main import create_app
+from httpbin.timers import get_scheduler
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process in bytes"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+async def _request(app, path: str, connected: asyncio.Event, statuses: list[int]) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+    sent_body = False
+
+    async def receive():
+        nonlocal sent_body
+        if not sent_body:
+            sent_body = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await connected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await app(scope, receive, send)
+
+
+async def run(count: int, delay: float, disconnect: bool) -> dict:
+    app = create_app()
+    connected = asyncio.Event()
+    statuses: list[int] = []
+    path = f"/delay/{delay}"
+    # Warm up routing and the scheduler outside the measurement
+    await _request(app, "/delay/0", connected, statuses)
+
+    gc.collect()
+    rss_before = _peak_rss()
+    start = time.perf_counter()
+    tasks = [asyncio.ensure_future(_request(app, path, connected, statuses)) for _ in range(count)]
+    scheduler = get_scheduler()
+    while scheduler.pending < count:
+        await asyncio.sleep(0.01)
+    scheduled = time.perf_counter() - start
+    held = _peak_rss() - rss_before
+
+    start = time.perf_counter()
+    if disconnect:
+        connected.set()
+    await asyncio.gather(*tasks)
+    finished = time.perf_counter() - start
+
+    return {
+        "count": count,
+        "max_pending": scheduler.max_pending,
+        "bytes_per_delay": held // count,
+        "schedule_seconds": round(scheduled, 3),
+        "finish_seconds": round(finished, 3),
+        "peak_rss_mb": _peak_rss() // (1024 * 1024),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="httpbin pending delay capacity")
+    parser.add_argument("--count", type=int, default=50_000, help="Concurrent delays to open")
+    parser.add_argument("--delay", type=float, default=5.0, help="Seconds each request waits")
+    parser.add_argument(
+        "--disconnect",
+        action="store_true",
+        help="Disconnect every client once all delays are pending instead of waiting",
+    )
+    parser.add_argument(
+        "--memory-mb", type=int, default=1024, help="Worker memory budget for the estimate"
+    )
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run(args.count, args.delay, args.disconnect))
+    for key, value in result.items():
+        print(f"{key:<18}{value}")
+    print(
+        f"{'capacity':<18}~{args.memory_mb * 1024 * 1024 // result['bytes_per_delay']:,} "
+        f"delays per {args.memory_mb} MB"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
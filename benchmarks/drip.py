@@ -0,0 +1,150 @@
+"""
+Throttled download capacity of one httpbin worker.
+
+Opens ``--count`` concurrent ``/drip?rate=`` downloads in-process over ASGI and
+reports how closely each stream kept to its rate, the memory each one costs and
+how many distinct ticks the shared scheduler had to wake for. With
+``--disconnect``, every client goes away halfway through and the time for all
+streams to stop is reported instead.
+
+Usage::
+
+    uv run python benchmarks/drip.py --count 5000 --rate 7000 --seconds 5
+"""
+
+import argparse
+import asyncio
+import gc
+import resource
+import statistics
+import sys
+import time
+
+from httpbin.main import create_app
+from httpbin.timers import get_scheduler
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process in bytes"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _Download:
+    """One in-process client recording when its body bytes arrive"""
+
+    def __init__(self, app, query: str, disconnected: asyncio.Event) -> None:
+        self.app = app
+        self.query = query.encode()
+        self.disconnected = disconnected
+        self.received = 0
+        self.first = self.last = 0.0
+
+    async def run(self) -> None:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/drip",
+            "raw_path": b"/drip",
+            "query_string": self.query,
+            "root_path": "",
+            "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 1),
+            "server": ("bench", 80),
+        }
+        sent_body = False
+
+        async def receive():
+            nonlocal sent_body
+            if not sent_body:
+                sent_body = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await self.disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                now = time.perf_counter()
+                if not self.received:
+                    self.first = now
+                self.received += len(message["body"])
+                self.last = now
+
+        await self.app(scope, receive, send)
+
+
+async def run(count: int, rate: float, seconds: float, disconnect: bool) -> dict:
+    app = create_app()
+    numbytes = int(rate * seconds)
+    query = f"numbytes={numbytes}&rate={rate}&delay=0"
+    disconnected = asyncio.Event()
+    # Warm up routing and the scheduler outside the measurement
+    await _Download(app, "numbytes=1&delay=0", disconnected).run()
+
+    gc.collect()
+    rss_before = _peak_rss()
+    downloads = [_Download(app, query, disconnected) for _ in range(count)]
+    tasks = [asyncio.ensure_future(download.run()) for download in downloads]
+    scheduler = get_scheduler()
+
+    # Sample how many distinct deadlines the scheduler holds while streams are pending
+    ticks = []
+    deadline = time.perf_counter() + (seconds / 2 if disconnect else seconds)
+    while time.perf_counter() < deadline and not all(task.done() for task in tasks):
+        ticks.append(len(scheduler._ticks))
+        await asyncio.sleep(0.05)
+    held = _peak_rss() - rss_before
+
+    start = time.perf_counter()
+    if disconnect:
+        disconnected.set()
+    await asyncio.gather(*tasks)
+    finished = time.perf_counter() - start
+
+    result = {
+        "count": count,
+        "target_rate": rate,
+        "bytes_per_stream": held // count,
+        "max_pending": scheduler.max_pending,
+        "max_distinct_ticks": max(ticks, default=0),
+        "finish_seconds": round(finished, 3),
+        "peak_rss_mb": _peak_rss() // (1024 * 1024),
+    }
+    if not disconnect:
+        # Byte k is due k / rate seconds after the first, so n bytes span (n - 1) / rate
+        rates = sorted(
+            (download.received - 1) / (download.last - download.first)
+            for download in downloads
+            if download.last > download.first
+        )
+        result |= {
+            "rate_median": round(statistics.median(rates)),
+            "rate_min": round(rates[0]),
+            "rate_max": round(rates[-1]),
+        }
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="httpbin throttled download capacity")
+    parser.add_argument("--count", type=int, default=5_000, help="Concurrent downloads")
+    parser.add_argument("--rate", type=float, default=7_000, help="Bytes per second per stream")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Length of each download")
+    parser.add_argument(
+        "--disconnect",
+        action="store_true",
+        help="Disconnect every client halfway through instead of finishing",
+    )
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run(args.count, args.rate, args.seconds, args.disconnect))
+    for key, value in result.items():
+        print(f"{key:<20}{value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
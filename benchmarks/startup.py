@@ -0,0 +1,142 @@
+"""
+Cold start benchmarks for httpbin.
+
+Measures, in fresh interpreters, how long ``import httpbin.main`` takes and how long a
+server takes from launch to its first successful response, for the default app and a
+minimal sidecar configuration. Exits 1 when the median time to first response of any
+configuration exceeds ``--budget-ms``.
+
+Usage::
+
+    uv run python benchmarks/startup.py
+    uv run python benchmarks/startup.py --runs 10 --budget-ms 200 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Environment overrides applied on top of the caller's environment
+CONFIGURATIONS: dict[str, dict[str, str]] = {
+    "default": {},
+    "minimal": {
+        "HTTPBIN_ENABLED_ROUTERS": "status_codes",
+        "HTTPBIN_DOCS_ENABLED": "false",
+    },
+}
+
+_IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import httpbin.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(env: dict[str, str]) -> float:
+    """Seconds spent importing httpbin.main (and building the app) in a new interpreter"""
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SNIPPET], env=env, check=True, capture_output=True
+    )
+    return float(output.stdout)
+
+
+def _probe(port: int) -> bool:
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+            sock.sendall(b"GET /status/200 HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            return sock.recv(64).startswith(b"HTTP/1.1 200")
+    except OSError:
+        return False
+
+
+def measure_first_response(env: dict[str, str], timeout: float = 30.0) -> float:
+    """Seconds from launching a single-worker server until GET /status/200 succeeds"""
+    port = _free_port()
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "httpbin.main:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ]
+    start = time.perf_counter()
+    process = subprocess.Popen(command, env=env)
+    try:
+        while time.perf_counter() - start < timeout:
+            if _probe(port):
+                return time.perf_counter() - start
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+            time.sleep(0.002)
+        raise RuntimeError(f"uvicorn did not answer within {timeout} seconds")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def run(args: argparse.Namespace) -> dict:
+    results = {}
+    for name in args.config or CONFIGURATIONS:
+        env = {**os.environ, **CONFIGURATIONS[name]}
+        imports = [measure_import(env) for _ in range(args.runs)]
+        first = [measure_first_response(env) for _ in range(args.runs)]
+        results[name] = {
+            "import_ms": round(statistics.median(imports) * 1000, 1),
+            "first_response_ms": round(statistics.median(first) * 1000, 1),
+            "first_response_max_ms": round(max(first) * 1000, 1),
+        }
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="httpbin cold start benchmarks")
+    parser.add_argument("--runs", type=int, default=5, help="Launches per configuration")
+    parser.add_argument(
+        "--config", nargs="+", choices=sorted(CONFIGURATIONS), help="Configurations to run"
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="Fail when a median time to first response exceeds this many milliseconds",
+    )
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    print(f"{'configuration':<16}{'import ms':>12}{'first response ms':>20}{'max ms':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<16}{result['import_ms']:>12}{result['first_response_ms']:>20}"
+            f"{result['first_response_max_ms']:>10}"
+        )
+    if args.output:
+        args.output.write_text(json.dumps({"python": sys.version, "results": results}, indent=2))
+
+    if args.budget_ms is not None:
+        over = [n for n, r in results.items() if r["first_response_ms"] > args.budget_ms]
+        if over:
+            print(f"Over the {args.budget_ms:g} ms budget: {', '.join(over)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
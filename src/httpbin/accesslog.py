@@ -0,0 +1,141 @@
+"""Structured JSON access log, encoded and written in batches by a background thread"""
+
+import atexit
+import sys
+import threading
+from collections import deque
+from datetime import UTC, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO
+
+from httpbin.responses import json_dumps
+
+# What the middleware queues for each request
+AccessRecord = tuple[float, str, str, bytes, str | None, int, float, int, int, str]
+
+
+class AccessLogWriter:
+    """
+    A bounded queue of access log records and the daemon thread that writes them.
+
+    The event loop only appends a tuple. Encoding and I/O happen on the thread, which
+    wakes every ``flush_interval`` seconds, or as soon as ``batch_size`` records are
+    waiting, and writes everything queued in one call. When the queue holds
+    ``max_size`` records, new ones are dropped and counted rather than waited for;
+    the count is written to the log as a ``{"dropped": N}`` line.
+
+    The thread starts with the first record, so a process that never serves a
+    request (e.g. the server supervisor) never opens the log.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        max_size: int = 65_536,
+        flush_interval: float = 0.5,
+        batch_size: int = 1024,
+    ) -> None:
+        self.path = path
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._reported = 0
+        self._records: deque[AccessRecord] = deque()
+        self._wake = threading.Event()
+        # Serialises flushes between the thread and close()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stream: BinaryIO | None = None
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def append(self, record: AccessRecord) -> None:
+        """Queue a record without blocking; drop and count it when the queue is full"""
+        records = self._records
+        if len(records) >= self.max_size:
+            self.dropped += 1
+            return
+        records.append(record)
+        if self._thread is None:
+            self._start()
+        elif len(records) == self.batch_size:
+            self._wake.set()
+
+    def _start(self) -> None:
+        if self.path is None:
+            self._stream = sys.stdout.buffer
+        else:
+            self._stream = Path(self.path).open("ab")  # noqa: SIM115 - closed by close()
+        self._thread = threading.Thread(target=self._run, name="httpbin-access-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Encode and write every record queued so far"""
+        with self._lock:
+            records = self._records
+            lines = [_encode(records.popleft()) for _ in range(len(records))]
+            dropped = self.dropped
+            if dropped != self._reported:
+                lines.append(b'{"dropped":%d}' % (dropped - self._reported))
+                self._reported = dropped
+            if lines and self._stream is not None:
+                self._stream.write(b"\n".join(lines) + b"\n")
+                self._stream.flush()
+
+    def close(self) -> None:
+        """Stop the thread and write out whatever is still queued"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        if self._stream is not None and self.path is not None:
+            self._stream.close()
+
+
+@lru_cache(maxsize=8)
+def _iso_second(second: int) -> str:
+    # Formatting a datetime costs more than encoding the rest of the record, and a
+    # batch mostly shares a handful of seconds
+    return datetime.fromtimestamp(second, UTC).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _encode(record: AccessRecord) -> bytes:
+    (
+        timestamp,
+        method,
+        path,
+        query,
+        route,
+        status,
+        duration,
+        request_bytes,
+        response_bytes,
+        client,
+    ) = record
+    return json_dumps(
+        {
+            "time": f"{_iso_second(int(timestamp))}.{int(timestamp % 1 * 1000):03d}Z",
+            "method": method,
+            "path": f"{path}?{query.decode('latin-1')}" if query else path,
+            "route": route,
+            "status": status,
+            "duration_ms": round(duration * 1000, 3),
+            "request_bytes": request_bytes,
+            "response_bytes": response_bytes,
+            "client": client,
+        }
+    )
@@ -0,0 +1,85 @@
+import gzip
+import zlib
+from functools import lru_cache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is an optional extra
+    brotli = None
+
+# Preferred order when the client weights several codings equally (smallest output first)
+SUPPORTED_ENCODINGS: tuple[str, ...] = ("br", "gzip", "deflate") if brotli else ("gzip", "deflate")
+
+DEFAULT_LEVEL = 6
+
+
+def compress(data: bytes, encoding: str, level: int = DEFAULT_LEVEL) -> bytes:
+    """Compress data with the given content-coding"""
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if encoding == "deflate":
+        return zlib.compress(data, level)
+    if encoding == "br" and brotli is not None:
+        # Brotli quality runs 0-11; map the zlib-style 1-9 level onto it
+        return brotli.compress(data, quality=min(level + 2, 11))
+    raise ValueError(f"Unsupported content-coding: {encoding}")
+
+
+class StreamCompressor:
+    """Incremental compressor that emits output for every chunk it is given"""
+
+    def __init__(self, encoding: str, level: int = DEFAULT_LEVEL) -> None:
+        if encoding == "br" and brotli is not None:
+            self._brotli = brotli.Compressor(quality=min(level + 2, 11))
+            self._zlib = None
+        elif encoding in ("gzip", "deflate"):
+            # wbits 31 writes a gzip container, 15 a zlib ("deflate") one
+            wbits = 31 if encoding == "gzip" else 15
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, wbits)
+            self._brotli = None
+        else:
+            raise ValueError(f"Unsupported content-coding: {encoding}")
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so the peer can decode it immediately"""
+        if self._zlib is not None:
+            return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+        return self._brotli.process(data) + self._brotli.flush()
+
+    def finish(self) -> bytes:
+        """Terminate the compressed stream"""
+        if self._zlib is not None:
+            return self._zlib.flush(zlib.Z_FINISH)
+        return self._brotli.finish()
+
+
+@lru_cache(maxsize=256)
+def negotiate_encoding(
+    accept_encoding: str, available: tuple[str, ...] = SUPPORTED_ENCODINGS
+) -> str | None:
+    """
+    Pick the best content-coding from an Accept-Encoding header.
+    Returns None when the identity coding should be used.
+    """
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params[:2].lower() == "q=":
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    default = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for coding in available:
+        weight = weights.get(coding, default)
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
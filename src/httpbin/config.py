@@ -1,5 +1,41 @@
+import os
+from types import UnionType
+from typing import Any, get_args, get_origin
+
+# Every setting can be overridden with an environment variable of the same name and
+# this prefix, e.g. HTTPBIN_WORKERS=8 or HTTPBIN_CORS_ORIGINS=https://a.example,https://b.example
+ENV_PREFIX = "HTTPBIN_"
+
+_TRUE = frozenset({"1", "true", "yes", "on"})
+_FALSE = frozenset({"0", "false", "no", "off"})
+
+
+def _parse_env_value(raw: str, annotation: Any) -> Any:
+    """Convert an environment variable string to the type of a Settings annotation"""
+    if get_origin(annotation) is UnionType:
+        if raw.strip().lower() in ("", "none", "null"):
+            return None
+        (annotation,) = (arg for arg in get_args(annotation) if arg is not type(None))
+
+    if get_origin(annotation) is list:
+        (item_type,) = get_args(annotation)
+        return [
+            _parse_env_value(item.strip(), item_type) for item in raw.split(",") if item.strip()
+        ]
+
+    if annotation is bool:
+        value = raw.strip().lower()
+        if value in _TRUE:
+            return True
+        if value in _FALSE:
+            return False
+        raise ValueError(f"Invalid boolean value: {raw!r}")
+
+    return annotation(raw.strip()) if annotation in (int, float) else annotation(raw)
+
+
 class Settings:
-    """Application settings"""
+    """Application settings, overridable through HTTPBIN_* environment variables"""
 
     # Application info
     APP_NAME: str = "httpbin"
@@ -12,9 +48,121 @@ class Settings:
     CORS_ALLOW_METHODS: list[str] = ["*"]
     CORS_ALLOW_HEADERS: list[str] = ["*"]
 
+    # Routers to include; disabled routers are never imported
+    ENABLED_ROUTERS: list[str] = [
+        "http_methods",
+        "status_codes",
+        "request_inspection",
+        "response_formats",
+        "dynamic",
+        "realtime",
+        "caching",
+        "redirects",
+    ]
+    # Serve /docs and /redoc
+    DOCS_ENABLED: bool = True
+    # Pre-generated OpenAPI schema (see `httpbin --export-openapi`)
+    OPENAPI_FILE: str | None = None
+
+    # Serve /status, /uuid, /ip, /user-agent, /robots.txt and conditional /cache and
+    # /etag responses without FastAPI routing
+    FAST_LANE_ENABLED: bool = True
+
+    # Server (used by the `httpbin` command)
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WORKERS: int | None = None  # None uses one worker per CPU
+    LOOP: str = "auto"  # auto, asyncio or uvloop
+    HTTP: str = "auto"  # auto, h11 or httptools
+    BACKLOG: int = 2048
+    TIMEOUT_KEEP_ALIVE: int = 5
+    LIMIT_CONCURRENCY: int | None = None
+    REUSE_PORT: bool = False
+    RELOAD: bool = False  # Development only; implies a single worker
+    LOG_LEVEL: str = "info"
+    ACCESS_LOG: bool = True
+    # "text" is uvicorn's access log; "json" replaces it with structured lines that a
+    # background thread writes in batches to ACCESS_LOG_FILE (stdout when unset)
+    ACCESS_LOG_FORMAT: str = "text"
+    ACCESS_LOG_FILE: str | None = None
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0  # Share of requests logged
+    ACCESS_LOG_QUEUE_SIZE: int = 65_536  # Records beyond this are dropped and counted
+    ACCESS_LOG_FLUSH_INTERVAL: float = 0.5
+
+    # JSON serialization: "auto" prefers orjson, then msgspec, then the stdlib
+    JSON_BACKEND: str = "auto"
+    # Use the fast JSON response class as the default for every route
+    JSON_DEFAULT_RESPONSE: bool = False
+
+    # Response compression middleware
+    COMPRESSION_ENABLED: bool = False
+    COMPRESSION_LEVEL: int = 6
+    COMPRESSION_MINIMUM_SIZE: int = 500
+    COMPRESSION_CACHE_SIZE: int = 128
+
+    # Per-route metrics exposed at /metrics, off by default
+    METRICS_ENABLED: bool = False
+    # Directory shared by all workers to aggregate metrics across processes
+    METRICS_MULTIPROCESS_DIR: str | None = None
+    METRICS_FLUSH_INTERVAL: float = 1.0
+
+    # Per-client token-bucket rate limit (e.g. 100/s or 6000/m), off by default.
+    # Clients are keyed on the first X-Forwarded-For entry, else the peer address.
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT: str = "100/s"
+    RATE_LIMIT_MAX_CLIENTS: int = 100_000  # Least recently seen clients are forgotten
+
+    # Inject faults requested with an X-Httpbin-Fault header or ?fault= into any
+    # endpoint; waits are capped at MAX_DELAY_SECONDS
+    FAULT_INJECTION_ENABLED: bool = False
+
+    # Request body limits
+    MAX_BODY_BYTES: int = 100 * 1024 * 1024  # 100MB, larger bodies get a 413
+    BODY_DIGEST_THRESHOLD: int = 1024 * 1024  # Larger bodies are echoed as size + sha256
+    MULTIPART_SPOOL_MAX_SIZE: int = 1024 * 1024  # Larger uploads are spooled to disk
+
     # Request limits
     MAX_DELAY_SECONDS: int = 10
     MAX_REDIRECT_COUNT: int = 10
 
+    # /uuid?count= limits for JSON and streamed NDJSON responses
+    MAX_UUID_COUNT: int = 10_000
+    MAX_UUID_STREAM_COUNT: int = 1_000_000
+
+    # /bytes limits; unseeded responses are slices of a per-worker random pool
+    MAX_BYTES_SIZE: int = 100 * 1024 * 1024  # 100MB
+    RANDOM_POOL_SIZE: int = 4 * 1024 * 1024
+
+    # /image/{width}x{height} limits; rendered sizes are kept in an LRU of this many
+    MAX_IMAGE_SIZE: int = 4096  # Pixels per side
+    IMAGE_CACHE_SIZE: int = 128
+
+    # /payload limits
+    MAX_PAYLOAD_SIZE: int = 1024 * 1024 * 1024  # 1GB
+    MAX_PAYLOAD_ITEMS: int = 10_000_000
+    MAX_PAYLOAD_DEPTH: int = 256
+
+    # Longest /drip transfer, in seconds
+    MAX_DRIP_DURATION: int = 600
+
+    # Streaming limits
+    MAX_STREAM_LINES: int = 100_000
+    MAX_STREAM_BYTES: int = 10 * 1024 * 1024 * 1024  # 10GB
+    STREAM_CHUNK_SIZE: int = 10 * 1024
+    MAX_STREAM_CHUNK_SIZE: int = 1024 * 1024
+
+    # /sse and /ws/stream ticks; subscribers of one interval share each tick
+    MIN_TICK_INTERVAL: float = 0.01
+
+    # Range limits
+    MAX_RANGE_SIZE: int = 1024 * 1024 * 1024 * 1024  # 1TB virtual file
+    MAX_RANGE_PARTS: int = 64
+
+    def __init__(self) -> None:
+        for name, annotation in type(self).__annotations__.items():
+            raw = os.environ.get(ENV_PREFIX + name)
+            if raw is not None:
+                setattr(self, name, _parse_env_value(raw, annotation))
+
 
 settings = Settings()
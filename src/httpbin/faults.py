@@ -0,0 +1,160 @@
+"""Fault specs for the fault injection middleware, parsed once per distinct value"""
+
+import json
+import math
+import random
+import re
+from collections.abc import Callable
+from functools import lru_cache
+
+from httpbin.responses import PrebuiltResponse
+
+# A duration: a number with an optional unit, seconds by default
+_DURATION = re.compile(r"\s*(\d+(?:\.\d*)?|\.\d+)\s*(us|ms|s)?\s*", re.IGNORECASE)
+_UNITS = {"us": 1e-6, "ms": 1e-3, "s": 1.0}
+_PERCENTILE = re.compile(r"p(\d{1,2}(?:\.\d+)?)", re.IGNORECASE)
+
+# Pareto shape of the 80/20 rule, used when none is given
+_PARETO_SHAPE = 1.16
+
+
+def parse_duration(value: str) -> float:
+    """Parse ``250ms``, ``1.5s``, ``800us`` or ``2`` (seconds) into seconds"""
+    match = _DURATION.fullmatch(value)
+    if match is None:
+        raise ValueError(f"Invalid duration: {value!r}")
+    return float(match[1]) * _UNITS[(match[2] or "s").lower()]
+
+
+def _probability(value: str) -> float:
+    probability = float(value)
+    if not 0.0 <= probability <= 1.0:
+        raise ValueError(f"Invalid probability: {value!r}")
+    return probability
+
+
+def _latency(value: str) -> Callable[[], float]:
+    """
+    Build a sampler for ``200ms`` / ``fixed:200ms``, ``uniform:100ms,300ms``,
+    ``normal:200ms,50ms`` (mean, standard deviation), ``pareto:50ms[,1.16]``
+    (scale, shape) or ``pNN:200ms`` (exponential whose NN-th percentile is 200ms).
+    """
+    kind, sep, arguments = value.partition(":")
+    kind = kind.strip().lower()
+    if not sep:
+        kind, arguments = "fixed", value
+    args = [argument.strip() for argument in arguments.split(",")]
+
+    if kind == "fixed" and len(args) == 1:
+        seconds = parse_duration(args[0])
+        return lambda: seconds
+    if kind == "uniform" and len(args) == 2:
+        low, high = sorted(map(parse_duration, args))
+        return lambda: random.uniform(low, high)
+    if kind == "normal" and len(args) == 2:
+        mean, deviation = map(parse_duration, args)
+        return lambda: max(random.gauss(mean, deviation), 0.0)
+    if kind == "pareto" and len(args) in (1, 2):
+        scale = parse_duration(args[0])
+        shape = float(args[1]) if len(args) == 2 else _PARETO_SHAPE
+        if not shape > 0:
+            raise ValueError(f"Invalid pareto shape: {args[1]!r}")
+        return lambda: scale * random.paretovariate(shape)
+    percentile = _PERCENTILE.fullmatch(kind)
+    if percentile is not None and len(args) == 1:
+        quantile = float(percentile[1]) / 100
+        if not 0.0 < quantile < 1.0:
+            raise ValueError(f"Invalid percentile: {kind!r}")
+        # P(X <= t) = 1 - exp(-t / mean) for an exponential distribution
+        mean = parse_duration(args[0]) / -math.log(1.0 - quantile)
+        return lambda: random.expovariate(1.0 / mean) if mean else 0.0
+    raise ValueError(f"Invalid latency: {value!r}")
+
+
+@lru_cache(maxsize=256)
+def _json_response(status_code: int, detail: str) -> PrebuiltResponse:
+    body = json.dumps({"detail": detail}, separators=(",", ":")).encode("utf-8")
+    return PrebuiltResponse(
+        body,
+        status_code=status_code,
+        raw_headers=[
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"content-type", b"application/json"),
+        ],
+    )
+
+
+class FaultSpec:
+    """
+    The faults requested by one ``X-Httpbin-Fault`` value, e.g.
+    ``latency=p99:200ms;error=0.01:503;reset=0.1;ttfb=500ms;trickle=64/100ms``.
+    """
+
+    __slots__ = (
+        "latency",
+        "error_rate",
+        "error_response",
+        "reset_rate",
+        "ttfb",
+        "trickle_size",
+        "trickle_interval",
+    )
+
+    def __init__(self) -> None:
+        self.latency: Callable[[], float] | None = None
+        self.error_rate = 0.0
+        self.error_response = _json_response(500, "Injected fault")
+        self.reset_rate = 0.0
+        self.ttfb = 0.0
+        self.trickle_size = 0
+        self.trickle_interval = 0.0
+
+    @property
+    def shapes_response(self) -> bool:
+        """Whether the response itself is delayed, trickled or cut short"""
+        return bool(self.ttfb or self.trickle_size or self.reset_rate)
+
+
+def _parse(spec: str) -> FaultSpec:
+    fault = FaultSpec()
+    for item in spec.split(";"):
+        if not item.strip():
+            continue
+        key, sep, value = item.partition("=")
+        key = key.strip().lower()
+        if not sep:
+            raise ValueError(f"Invalid fault: {item.strip()!r}, expected key=value")
+        if key == "latency":
+            fault.latency = _latency(value)
+        elif key == "error":
+            rate, _, code = value.partition(":")
+            fault.error_rate = _probability(rate)
+            status_code = int(code) if code.strip() else 500
+            if not 400 <= status_code < 600:
+                raise ValueError(f"Invalid error status: {code!r}")
+            fault.error_response = _json_response(status_code, "Injected fault")
+        elif key == "reset":
+            fault.reset_rate = _probability(value)
+        elif key == "ttfb":
+            fault.ttfb = parse_duration(value)
+        elif key == "trickle":
+            size, _, interval = value.partition("/")
+            fault.trickle_size = int(size)
+            fault.trickle_interval = parse_duration(interval or "1s")
+            if fault.trickle_size < 1:
+                raise ValueError(f"Invalid trickle size: {size!r}")
+        else:
+            raise ValueError(f"Unknown fault: {key!r}")
+    return fault
+
+
+@lru_cache(maxsize=1024)
+def parse_fault_spec(spec: str) -> FaultSpec | PrebuiltResponse:
+    """
+    Parse a fault spec. Invalid specs resolve to a prebuilt 400 response, so that
+    repeated invalid values are cached too.
+    """
+    try:
+        return _parse(spec)
+    except ValueError as exc:
+        return _json_response(400, f"Invalid fault spec: {exc}")
@@ -0,0 +1,121 @@
+"""Image assets for /image, read once at startup, and PNGs rendered to a given size"""
+
+import struct
+import zlib
+from functools import lru_cache
+from pathlib import Path
+
+ASSETS_DIR = Path(__file__).parent / "assets"
+
+# Formats served by /image/{format}. When an Accept header weights several of them
+# equally, the earlier one wins: PNG first, as every client can decode it.
+IMAGE_TYPES = {
+    "png": "image/png",
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+    "svg": "image/svg+xml",
+}
+
+# Immutable bytes of each bundled asset
+IMAGES = {name: (ASSETS_DIR / f"image.{name}").read_bytes() for name in IMAGE_TYPES}
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_ZLIB_HEADER = b"\x78\x9c"  # deflate, 32K window, default level
+_ADLER_BASE = 65521
+# Side of a checkerboard square and its two RGB colours
+_SQUARE = 16
+_COLOURS = (b"\xee\xee\xee", b"\xcc\xcc\xcc")
+
+
+@lru_cache(maxsize=256)
+def negotiate_image(accept: str) -> str | None:
+    """
+    Pick the format in IMAGE_TYPES an Accept header prefers: by weight, then by how
+    specifically the header names it (``image/webp`` over ``image/*`` over ``*/*``),
+    then by IMAGE_TYPES order. Returns None when none is acceptable.
+    """
+    weights: dict[str, float] = {}
+    for item in accept.split(","):
+        media_range, *params = item.split(";")
+        media_range = media_range.strip().lower()
+        if not media_range:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[media_range] = weight
+
+    best, best_rank = None, (0.0, 0)
+    for name, media_type in IMAGE_TYPES.items():
+        # The most specific range naming the type decides its weight, even q=0
+        ranges = (media_type, media_type.split("/")[0] + "/*", "*/*")
+        for specificity, media_range in zip((2, 1, 0), ranges, strict=True):
+            if media_range in weights:
+                rank = (weights[media_range], specificity)
+                if rank[0] > 0.0 and rank > best_rank:
+                    best, best_rank = name, rank
+                break
+    return best
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def adler32_combine(adler1: int, adler2: int, length2: int) -> int:
+    """zlib's adler32_combine: the Adler-32 of A + B from those of A and B (length2 bytes)"""
+    remainder = length2 % _ADLER_BASE
+    sum1 = adler1 & 0xFFFF
+    sum2 = remainder * sum1 % _ADLER_BASE
+    sum1 += (adler2 & 0xFFFF) + _ADLER_BASE - 1
+    sum2 += (adler1 >> 16) + (adler2 >> 16) + _ADLER_BASE - remainder
+    return (sum1 % _ADLER_BASE) | (sum2 % _ADLER_BASE) << 16
+
+
+def render_png(width: int, height: int) -> bytes:
+    """
+    Render a width x height grey checkerboard PNG.
+
+    The image repeats every two bands of squares, so one such period is deflated
+    once, with a full flush so it never refers back to earlier data, and its output
+    repeated; the checksum is combined the same way. Within a band only the first
+    row holds pixels, the rest use the Up filter and are all zeros. Rendering costs
+    the same whatever the height.
+    """
+    pattern = (_COLOURS[0] * _SQUARE + _COLOURS[1] * _SQUARE) * (width // (2 * _SQUARE) + 2)
+    up_row = b"\x02" + bytes(width * 3)
+    period = b"".join(
+        b"\x00" + pattern[offset : offset + width * 3] + up_row * (_SQUARE - 1)
+        for offset in (0, _SQUARE * 3)
+    )
+    repeats, rows_left = divmod(height, 2 * _SQUARE)
+    tail = period[: rows_left * len(up_row)]
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)  # raw deflate, framed below
+    deflated_period = compressor.compress(period) + compressor.flush(zlib.Z_FULL_FLUSH)
+    finisher = zlib.compressobj(6, zlib.DEFLATED, -15)
+    deflated_tail = finisher.compress(tail) + finisher.flush()
+
+    period_checksum = zlib.adler32(period)
+    checksum = 1  # Adler-32 of no data
+    for _ in range(repeats):
+        checksum = adler32_combine(checksum, period_checksum, len(period))
+    checksum = zlib.adler32(tail, checksum)
+
+    image_data = b"".join(
+        (_ZLIB_HEADER, deflated_period * repeats, deflated_tail, struct.pack(">I", checksum))
+    )
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)  # 8-bit RGB
+    return b"".join(
+        (
+            _PNG_SIGNATURE,
+            _png_chunk(b"IHDR", header),
+            _png_chunk(b"IDAT", image_data),
+            _png_chunk(b"IEND", b""),
+        )
+    )
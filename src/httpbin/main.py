@@ -1,29 +1,112 @@
+import argparse
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any
+
 from fastapi import FastAPI
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 
 from httpbin.config import settings
-from httpbin.routers import (
-    dynamic_router,
-    http_methods_router,
-    request_inspection_router,
-    response_formats_router,
-    status_codes_router,
-)
+from httpbin.routers import load_router
 
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application"""
 
+    # Keep FastAPI's placeholder default so routes keep pydantic's dump_json fast path
+    default_response_class = Default(JSONResponse)
+    if settings.JSON_DEFAULT_RESPONSE:
+        from httpbin.responses import FastJSONResponse
+
+        default_response_class = FastJSONResponse
+
     app = FastAPI(
         title=settings.APP_NAME,
         version=settings.APP_VERSION,
         description=settings.APP_DESCRIPTION,
-        docs_url="/docs",
-        redoc_url="/redoc",
+        docs_url="/docs" if settings.DOCS_ENABLED else None,
+        redoc_url="/redoc" if settings.DOCS_ENABLED else None,
+        default_response_class=default_response_class,
     )
 
-    # Add CORS middleware
+    # Middleware. add_middleware puts each layer in front of those added before it, so
+    # they are added innermost first. From the outside in, a request passes:
+    #
+    #   access log -> CORS -> rate limit -> fault injection -> fast lane -> metrics
+    #   -> compression -> routing
+    #
+    # The access log sees every request, preflights and rejections included. CORS is
+    # in front of every layer that answers on its own (429s, injected errors,
+    # fast-laned responses), so those responses get the same CORS headers as routed
+    # ones. The rate limit comes next, so rejected requests cost as little as
+    # possible; faults apply to everything behind it, fast lane included.
+
+    # Add optional response compression
+    if settings.COMPRESSION_ENABLED:
+        from httpbin.middleware import CompressionMiddleware
+
+        app.add_middleware(
+            CompressionMiddleware,
+            level=settings.COMPRESSION_LEVEL,
+            minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+            cache_size=settings.COMPRESSION_CACHE_SIZE,
+        )
+
+    # Add per-route metrics (fast-laned requests are recorded by the fast lane)
+    if settings.METRICS_ENABLED:
+        from httpbin.metrics import MetricsRegistry
+        from httpbin.middleware import MetricsMiddleware
+
+        app.state.metrics = MetricsRegistry(
+            multiprocess_dir=settings.METRICS_MULTIPROCESS_DIR,
+            flush_interval=settings.METRICS_FLUSH_INTERVAL,
+        )
+        app.add_middleware(MetricsMiddleware, registry=app.state.metrics)
+
+    # Answer probe endpoints without FastAPI routing
+    if settings.FAST_LANE_ENABLED:
+        from httpbin.middleware import FastLaneMiddleware
+
+        app.add_middleware(
+            FastLaneMiddleware,
+            routes={
+                route.path
+                for name in settings.ENABLED_ROUTERS
+                for route in load_router(name).routes
+            },
+            registry=getattr(app.state, "metrics", None),
+            compression=settings.COMPRESSION_ENABLED,
+        )
+
+    # Inject faults into any endpoint, fast lane included
+    if settings.FAULT_INJECTION_ENABLED:
+        from httpbin.middleware import FaultInjectionMiddleware
+
+        app.add_middleware(
+            FaultInjectionMiddleware,
+            max_delay=settings.MAX_DELAY_SECONDS,
+            max_trickle=settings.MAX_DRIP_DURATION,
+        )
+
+    # Limit each client in front of everything but CORS, fast lane included
+    if settings.RATE_LIMIT_ENABLED:
+        from httpbin.middleware import RateLimitMiddleware
+        from httpbin.ratelimit import parse_rate
+
+        rate, burst = parse_rate(settings.RATE_LIMIT)
+        app.add_middleware(
+            RateLimitMiddleware,
+            rate=rate,
+            burst=burst,
+            max_clients=settings.RATE_LIMIT_MAX_CLIENTS,
+            registry=getattr(app.state, "metrics", None),
+        )
+
+    # Add CORS headers to every response
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.CORS_ORIGINS,
@@ -32,18 +115,42 @@ def create_app() -> FastAPI:
         allow_headers=settings.CORS_ALLOW_HEADERS,
     )
 
-    # Include routers
-    app.include_router(http_methods_router)
-    app.include_router(status_codes_router)
-    app.include_router(request_inspection_router)
-    app.include_router(response_formats_router)
-    app.include_router(dynamic_router)
+    # Log every request from a background thread
+    if settings.ACCESS_LOG and settings.ACCESS_LOG_FORMAT == "json":
+        from httpbin.accesslog import AccessLogWriter
+        from httpbin.middleware import AccessLogMiddleware
+
+        app.state.access_log = AccessLogWriter(
+            path=settings.ACCESS_LOG_FILE,
+            max_size=settings.ACCESS_LOG_QUEUE_SIZE,
+            flush_interval=settings.ACCESS_LOG_FLUSH_INTERVAL,
+        )
+        app.add_middleware(
+            AccessLogMiddleware,
+            writer=app.state.access_log,
+            sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+        )
+    elif settings.ACCESS_LOG_FORMAT not in ("text", "json"):
+        raise ValueError(f"Unknown access log format: {settings.ACCESS_LOG_FORMAT}")
+
+    # Include routers; disabled routers are never imported
+    for name in settings.ENABLED_ROUTERS:
+        app.include_router(load_router(name))
+    if settings.METRICS_ENABLED:
+        app.include_router(load_router("metrics"))
+
+    # Serve a schema generated at build time instead of building it on first request
+    if settings.OPENAPI_FILE:
+        schema = json.loads(Path(settings.OPENAPI_FILE).read_text())
+        app.openapi = lambda: schema
 
     # Root endpoint
-    @app.get("/")
-    async def root():
-        """Redirect to API documentation"""
-        return RedirectResponse(url="/docs")
+    if settings.DOCS_ENABLED:
+
+        @app.get("/")
+        async def root():
+            """Redirect to API documentation"""
+            return RedirectResponse(url="/docs")
 
     return app
 
@@ -52,16 +159,109 @@ def create_app() -> FastAPI:
 app = create_app()
 
 
-def main():
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line options; defaults come from Settings (and HTTPBIN_* variables)"""
+    parser = argparse.ArgumentParser(prog="httpbin", description=settings.APP_DESCRIPTION)
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.WORKERS,
+        help="Worker processes (default: one per CPU)",
+    )
+    parser.add_argument("--loop", choices=["auto", "asyncio", "uvloop"], default=settings.LOOP)
+    parser.add_argument("--http", choices=["auto", "h11", "httptools"], default=settings.HTTP)
+    parser.add_argument("--backlog", type=int, default=settings.BACKLOG)
+    parser.add_argument("--timeout-keep-alive", type=int, default=settings.TIMEOUT_KEEP_ALIVE)
+    parser.add_argument(
+        "--limit-concurrency",
+        type=int,
+        default=settings.LIMIT_CONCURRENCY,
+        help="Maximum concurrent connections per worker before responding with 503",
+    )
+    parser.add_argument(
+        "--reuse-port",
+        action=argparse.BooleanOptionalAction,
+        default=settings.REUSE_PORT,
+        help="Bind with SO_REUSEPORT so several httpbin processes can share the port",
+    )
+    parser.add_argument(
+        "--reload",
+        "--dev",
+        action=argparse.BooleanOptionalAction,
+        default=settings.RELOAD,
+        help="Development mode: a single worker that reloads on code changes",
+    )
+    parser.add_argument("--log-level", default=settings.LOG_LEVEL)
+    parser.add_argument(
+        "--access-log", action=argparse.BooleanOptionalAction, default=settings.ACCESS_LOG
+    )
+    parser.add_argument(
+        "--export-openapi",
+        type=Path,
+        metavar="PATH",
+        help="Write the OpenAPI schema to PATH and exit (serve it with HTTPBIN_OPENAPI_FILE)",
+    )
+    return parser.parse_args(argv)
+
+
+def server_options(args: argparse.Namespace) -> dict[str, Any]:
+    """Translate parsed options into uvicorn.run keyword arguments"""
+    options: dict[str, Any] = {
+        "host": args.host,
+        "port": args.port,
+        "loop": args.loop,
+        "http": args.http,
+        "backlog": args.backlog,
+        "timeout_keep_alive": args.timeout_keep_alive,
+        "limit_concurrency": args.limit_concurrency,
+        "log_level": args.log_level,
+        # The JSON access log replaces uvicorn's
+        "access_log": args.access_log and settings.ACCESS_LOG_FORMAT != "json",
+    }
+    if args.reload:
+        options["reload"] = True
+    else:
+        options["workers"] = args.workers or _cpu_count()
+    return options
+
+
+def _cpu_count() -> int:
+    """CPUs available to this process (respects affinity masks, e.g. in containers)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _reuse_port_socket(host: str, port: int, backlog: int) -> socket.socket:
+    """Bind a listening socket with SO_REUSEPORT for uvicorn to serve from"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def main(argv: list[str] | None = None) -> None:
     """Run the application with uvicorn"""
     import uvicorn
 
-    uvicorn.run(
-        "httpbin.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-    )
+    args = parse_args(argv)
+    if args.export_openapi:
+        args.export_openapi.write_text(json.dumps(app.openapi()))
+        return
+
+    options = server_options(args)
+
+    if args.reuse_port and not args.reload:
+        sock = _reuse_port_socket(options.pop("host"), options.pop("port"), args.backlog)
+        options["fd"] = sock.fileno()
+
+    uvicorn.run("httpbin.main:app", **options)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,202 @@
+"""Per-worker request metrics with Prometheus text exposition"""
+
+import json
+import os
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+# Requests rejected by the rate limiter before routing
+RATE_LIMITED_ROUTE = "<rate-limited>"
+# Requests in flight on a path whose route the router has not matched yet
+PENDING_ROUTE = "<pending>"
+
+
+class RouteStats:
+    """Counters for one (method, route template) pair"""
+
+    __slots__ = ("statuses", "buckets", "duration_sum", "response_bytes", "in_flight")
+
+    def __init__(self) -> None:
+        self.statuses: dict[int, int] = {}
+        # One slot per bucket plus the +Inf overflow; cumulated at exposition time
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.duration_sum = 0.0
+        self.response_bytes = 0
+        self.in_flight = 0
+
+    def observe(self, status: int, duration: float, response_bytes: int) -> None:
+        statuses = self.statuses
+        statuses[status] = statuses.get(status, 0) + 1
+        self.buckets[bisect_left(LATENCY_BUCKETS, duration)] += 1
+        self.duration_sum += duration
+        self.response_bytes += response_bytes
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "statuses": {str(status): count for status, count in self.statuses.items()},
+            "buckets": self.buckets,
+            "duration_sum": self.duration_sum,
+            "response_bytes": self.response_bytes,
+            "in_flight": self.in_flight,
+        }
+
+    def merge(self, data: dict[str, Any], include_gauges: bool = True) -> None:
+        for status, count in data["statuses"].items():
+            self.statuses[int(status)] = self.statuses.get(int(status), 0) + count
+        self.buckets = [a + b for a, b in zip(self.buckets, data["buckets"], strict=True)]
+        self.duration_sum += data["duration_sum"]
+        self.response_bytes += data["response_bytes"]
+        if include_gauges:
+            self.in_flight += data["in_flight"]
+
+
+class MetricsRegistry:
+    """
+    Holds the metrics of one worker process.
+
+    When ``multiprocess_dir`` is set, the worker periodically writes a snapshot to
+    ``<dir>/metrics-<pid>.json`` and exposition merges the snapshots of all workers.
+    """
+
+    def __init__(self, multiprocess_dir: str | None = None, flush_interval: float = 1.0) -> None:
+        self.routes: dict[tuple[str, str], RouteStats] = {}
+        self.multiprocess_dir = Path(multiprocess_dir) if multiprocess_dir else None
+        self.flush_interval = flush_interval
+        self._next_flush = 0.0
+
+    def stats(self, method: str, route: str) -> RouteStats:
+        key = (method, route)
+        stats = self.routes.get(key)
+        if stats is None:
+            stats = self.routes[key] = RouteStats()
+        return stats
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "routes": [
+                {"method": method, "route": route, **stats.to_dict()}
+                for (method, route), stats in self.routes.items()
+            ],
+        }
+
+    def maybe_flush(self, now: float) -> None:
+        """Write this worker's snapshot if the flush interval has elapsed"""
+        if self.multiprocess_dir is None or now < self._next_flush:
+            return
+        self._next_flush = now + self.flush_interval
+        self.flush()
+
+    def flush(self) -> None:
+        if self.multiprocess_dir is None:
+            return
+        self.multiprocess_dir.mkdir(parents=True, exist_ok=True)
+        target = self.multiprocess_dir / f"metrics-{os.getpid()}.json"
+        temporary = target.with_suffix(".tmp")
+        temporary.write_text(json.dumps(self.snapshot()))
+        temporary.replace(target)
+
+    def collect(self) -> dict[tuple[str, str], RouteStats]:
+        """Return the metrics to expose, merged across workers in multiprocess mode"""
+        if self.multiprocess_dir is None:
+            return self.routes
+
+        self.flush()
+        merged: dict[tuple[str, str], RouteStats] = {}
+        for path in self.multiprocess_dir.glob("metrics-*.json"):
+            try:
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            # Counters of exited workers still count; their in-flight gauges do not
+            alive = _pid_alive(snapshot["pid"])
+            for entry in snapshot["routes"]:
+                key = (entry["method"], entry["route"])
+                stats = merged.get(key)
+                if stats is None:
+                    stats = merged[key] = RouteStats()
+                stats.merge(entry, include_gauges=alive)
+        return merged
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        routes = sorted(self.collect().items())
+        lines = [
+            "# HELP httpbin_requests_total Total HTTP requests by route, method and status.",
+            "# TYPE httpbin_requests_total counter",
+        ]
+        for (method, route), stats in routes:
+            labels = f'route="{_escape(route)}",method="{method}"'
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f'httpbin_requests_total{{{labels},status="{status}"}} {count}')
+
+        lines += [
+            "# HELP httpbin_request_duration_seconds Request latency by route and method.",
+            "# TYPE httpbin_request_duration_seconds histogram",
+        ]
+        for (method, route), stats in routes:
+            labels = f'route="{_escape(route)}",method="{method}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stats.buckets, strict=False):
+                cumulative += count
+                lines.append(
+                    f'httpbin_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                )
+            total = sum(stats.buckets)
+            lines.append(f'httpbin_request_duration_seconds_bucket{{{labels},le="+Inf"}} {total}')
+            lines.append(f"httpbin_request_duration_seconds_sum{{{labels}}} {stats.duration_sum}")
+            lines.append(f"httpbin_request_duration_seconds_count{{{labels}}} {total}")
+
+        lines += [
+            "# HELP httpbin_response_bytes_total Response body bytes sent by route and method.",
+            "# TYPE httpbin_response_bytes_total counter",
+        ]
+        for (method, route), stats in routes:
+            labels = f'route="{_escape(route)}",method="{method}"'
+            lines.append(f"httpbin_response_bytes_total{{{labels}}} {stats.response_bytes}")
+
+        lines += [
+            "# HELP httpbin_requests_in_flight Requests currently being served.",
+            "# TYPE httpbin_requests_in_flight gauge",
+        ]
+        for (method, route), stats in routes:
+            labels = f'route="{_escape(route)}",method="{method}"'
+            lines.append(f"httpbin_requests_in_flight{{{labels}}} {stats.in_flight}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,34 @@
+"""
+Pure ASGI middleware.
+
+Middleware modules are imported on first use, so disabled features add nothing to
+start-up time.
+"""
+
+from importlib import import_module
+from typing import Any
+
+_MIDDLEWARE_MODULES = {
+    "AccessLogMiddleware": "httpbin.middleware.access_log",
+    "CompressionMiddleware": "httpbin.middleware.compression",
+    "FastLaneMiddleware": "httpbin.middleware.fast_lane",
+    "FaultInjectionMiddleware": "httpbin.middleware.fault_injection",
+    "MetricsMiddleware": "httpbin.middleware.metrics",
+    "RateLimitMiddleware": "httpbin.middleware.rate_limit",
+}
+
+
+def __getattr__(attribute: str) -> Any:
+    if attribute in _MIDDLEWARE_MODULES:
+        return getattr(import_module(_MIDDLEWARE_MODULES[attribute]), attribute)
+    raise AttributeError(f"module {__name__!r} has no attribute {attribute!r}")
+
+
+__all__ = [
+    "AccessLogMiddleware",
+    "CompressionMiddleware",
+    "FastLaneMiddleware",
+    "FaultInjectionMiddleware",
+    "MetricsMiddleware",
+    "RateLimitMiddleware",
+]
@@ -0,0 +1,71 @@
+import random
+from time import perf_counter, time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from httpbin.accesslog import AccessLogWriter
+from httpbin.utils import get_client_ip
+
+
+class AccessLogMiddleware:
+    """
+    Queue a structured access log record for each HTTP request: method, path, route
+    template, status, latency, request and response body bytes and client IP (keyed
+    like ``/ip``). With ``sample_rate`` below 1 only that share of requests is logged.
+
+    It is the outermost middleware, so CORS preflights, fast-laned and rate-limited
+    requests are logged too; the last have no route. The request never waits on the
+    log: records are written by the AccessLogWriter's thread, or dropped when it falls
+    behind.
+    """
+
+    def __init__(self, app: ASGIApp, writer: AccessLogWriter, sample_rate: float = 1.0) -> None:
+        self.app = app
+        self.writer = writer
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or (
+            self.sample_rate < 1.0 and random.random() >= self.sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        timestamp = time()
+        start = perf_counter()
+        status = 500
+        request_bytes = 0
+        response_bytes = 0
+
+        async def receive_wrapper() -> Message:
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            self.writer.append(
+                (
+                    timestamp,
+                    scope["method"],
+                    scope["path"],
+                    scope["query_string"],
+                    getattr(scope.get("route"), "path", None),
+                    status,
+                    perf_counter() - start,
+                    request_bytes,
+                    response_bytes,
+                    get_client_ip(scope),
+                )
+            )
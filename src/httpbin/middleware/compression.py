@@ -0,0 +1,236 @@
+import re
+from collections import OrderedDict
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from httpbin.compression import (
+    SUPPORTED_ENCODINGS,
+    StreamCompressor,
+    compress,
+    negotiate_encoding,
+)
+
+# Responses that must not be re-encoded: already encoded, partial, or without a body
+_SKIP_STATUS = frozenset({204, 206, 304})
+
+# Media types that are compressed already, so encoding them again costs CPU for no gain,
+# and event streams, which must reach the client as each event is sent
+_SKIP_MEDIA_TYPES = (
+    b"image/",
+    b"audio/",
+    b"video/",
+    b"font/woff",
+    b"application/gzip",
+    b"application/x-gzip",
+    b"application/zip",
+    b"application/zstd",
+    b"application/x-bzip2",
+    b"application/x-xz",
+    b"application/x-7z-compressed",
+    b"text/event-stream",
+)
+
+# Entity tags of encoded representations, as suffixed by _encoded_headers
+_ENCODED_TAGS = {
+    encoding: re.compile(rb'"([^"]*)-' + re.escape(encoding.encode("latin-1")) + rb'"')
+    for encoding in SUPPORTED_ENCODINGS
+}
+
+
+class CompressionMiddleware:
+    """
+    Compress responses according to the request's Accept-Encoding header.
+
+    Complete bodies at least ``minimum_size`` bytes long are compressed in one go, and
+    byte-identical bodies are served from a bounded LRU cache of compressed output.
+    Streamed bodies are compressed chunk by chunk as they pass through, so the
+    middleware never holds more than one chunk of a response. Images (other than SVG),
+    audio, video and archives are compressed already and pass through untouched.
+
+    An encoded response is a different representation, so a strong ETag gets the
+    encoding as a suffix (``"tag"`` becomes ``"tag-gzip"``, as StaticPayload names
+    its variants). If-None-Match tags carrying the negotiated suffix are passed on
+    to the app in both forms, and a 304 for them echoes the suffixed tag.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        level: int = 6,
+        minimum_size: int = 500,
+        cache_size: int = 128,
+        cache_max_body: int = 64 * 1024,
+    ) -> None:
+        self.app = app
+        self.level = level
+        self.minimum_size = minimum_size
+        self.cache_size = cache_size
+        self.cache_max_body = cache_max_body
+        self._cache: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        if_none_match = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                encoding = negotiate_encoding(value.decode("latin-1"))
+            elif name == b"if-none-match":
+                if_none_match = value
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Identity tags the client holds an encoded representation of
+        revalidated: frozenset[bytes] = frozenset()
+        if if_none_match is not None:
+            revalidated = frozenset(
+                b'"%s"' % tag for tag in _ENCODED_TAGS[encoding].findall(if_none_match)
+            )
+            if revalidated:
+                scope = {**scope, "headers": _with_identity_tags(scope["headers"], revalidated)}
+
+        start_message: Message | None = None
+        compressor: StreamCompressor | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = message.get("headers", [])
+                if (
+                    message["status"] in _SKIP_STATUS
+                    or message["status"] < 200
+                    or any(
+                        name in (b"content-encoding", b"content-range")
+                        or (name == b"content-type" and _skip_media_type(value))
+                        for name, value in headers
+                    )
+                ):
+                    passthrough = True
+                    if message["status"] == 304 and revalidated:
+                        message = {
+                            **message,
+                            "headers": [
+                                (name, _encoded_etag(value, encoding))
+                                if name == b"etag" and value in revalidated
+                                else (name, value)
+                                for name, value in headers
+                            ],
+                        }
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None and not more_body:
+                # The whole body arrived in a single message
+                if len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressed = self._compress(bytes(body), encoding)
+                headers = _encoded_headers(start_message, encoding, len(compressed))
+                await send({**start_message, "headers": headers})
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            if compressor is None:
+                compressor = StreamCompressor(encoding, self.level)
+                headers = _encoded_headers(start_message, encoding, None)
+                await send({**start_message, "headers": headers})
+
+            chunk = compressor.compress(body) if body else b""
+            if not more_body:
+                chunk += compressor.finish()
+            if chunk or not more_body:
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        """Compress a complete body, reusing cached output for identical bodies"""
+        if len(body) > self.cache_max_body or not self.cache_size:
+            return compress(body, encoding, self.level)
+
+        key = (encoding, body)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        compressed = compress(body, encoding, self.level)
+        self._cache[key] = compressed
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return compressed
+
+
+def _skip_media_type(content_type: bytes) -> bool:
+    """Whether a response of this type is passed through; SVG is text and compresses well"""
+    content_type = content_type.lower()
+    return content_type.startswith(_SKIP_MEDIA_TYPES) and not content_type.startswith(
+        b"image/svg+xml"
+    )
+
+
+def _encoded_etag(etag: bytes, encoding: str) -> bytes:
+    """Suffix a strong entity tag with the encoding; weak tags are left as they are"""
+    if etag.startswith(b'"'):
+        return b'%s-%s"' % (etag[:-1], encoding.encode("latin-1"))
+    return etag
+
+
+def _with_identity_tags(
+    headers: list[tuple[bytes, bytes]], tags: frozenset[bytes]
+) -> list[tuple[bytes, bytes]]:
+    """Add the identity forms of encoded tags to If-None-Match, keeping the originals"""
+    extra = b", ".join(sorted(tags))
+    return [
+        (name, value + b", " + extra) if name == b"if-none-match" else (name, value)
+        for name, value in headers
+    ]
+
+
+def _encoded_headers(
+    start_message: Message, encoding: str, content_length: int | None
+) -> list[tuple[bytes, bytes]]:
+    """Rewrite response headers for an encoded body"""
+    headers = []
+    vary = None
+    for name, value in start_message.get("headers", []):
+        if name == b"content-length":
+            continue
+        if name == b"vary":
+            vary = value
+            continue
+        if name == b"etag":
+            value = _encoded_etag(value, encoding)
+        headers.append((name, value))
+
+    headers.append((b"content-encoding", encoding.encode("latin-1")))
+    if vary is None:
+        vary = b"Accept-Encoding"
+    elif b"accept-encoding" not in vary.lower():
+        vary += b", Accept-Encoding"
+    headers.append((b"vary", vary))
+    if content_length is not None:
+        headers.append((b"content-length", str(content_length).encode("latin-1")))
+    return headers
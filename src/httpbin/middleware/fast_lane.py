@@ -0,0 +1,202 @@
+import json
+import random
+import uuid
+from collections.abc import Callable, Collection
+from functools import cache
+from importlib import import_module
+from time import perf_counter
+from typing import NamedTuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from httpbin.config import settings
+from httpbin.metrics import MetricsRegistry
+from httpbin.responses import PrebuiltResponse
+from httpbin.utils import get_client_ip
+
+Headers = list[tuple[bytes, bytes]]
+Result = tuple[int, Headers, bytes]
+
+_STATUS_ROUTE = "/status/{codes}"
+_ETAG_ROUTE = "/etag/{etag}"
+_RELATIVE_REDIRECT_ROUTE = "/relative-redirect/{n}"
+_ABSOLUTE_REDIRECT_ROUTE = "/absolute-redirect/{n}"
+_REDIRECT_ROUTE = "/redirect/{n}"
+_STATUS_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE"})
+_CONTENT_TYPE_JSON = (b"content-type", b"application/json")
+
+
+def _dumps(value: str) -> bytes:
+    # Byte-identical to Starlette's JSONResponse and pydantic's output for a string
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json(body: bytes) -> Result:
+    return 200, [(b"content-length", str(len(body)).encode("latin-1")), _CONTENT_TYPE_JSON], body
+
+
+def _unpack(response: PrebuiltResponse) -> Result:
+    return response.status_code, response.raw_headers, response.body
+
+
+def _header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class LaneRoute(NamedTuple):
+    """Stands in for the matched route in the scope of fast-laned requests"""
+
+    path: str
+
+
+_lane_route = cache(LaneRoute)
+
+
+class FastLaneMiddleware:
+    """
+    Serve trivial probe endpoints straight from ASGI, in front of FastAPI: no routing,
+    dependency injection, response models or the middleware behind it.
+
+    It reproduces what the layers behind it would add: the request's metrics under
+    its route template and, for middleware in front of it, the route in the scope.
+    CORS sits in front of it, so its responses get the usual CORS headers. It only
+    answers what it can answer byte-for-byte like the app: GET requests without a
+    query string (any method for ``/status/{codes}``) on mounted routes, and without
+    Accept-Encoding when compression is enabled.
+    ``/cache`` and ``/etag/{etag}`` are only answered when the prebuilt 304 or 412
+    applies, and the redirect chains only for hop counts within the cap. Everything
+    else falls through unchanged.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        routes: Collection[str],
+        registry: MetricsRegistry | None = None,
+        compression: bool = False,
+    ) -> None:
+        self.app = app
+        self.registry = registry
+        self.compression = compression
+        handlers: dict[str, Callable[[Scope], Result | None]] = {
+            "/uuid": self._uuid,
+            "/ip": self._ip,
+            "/user-agent": self._user_agent,
+            "/robots.txt": self._robots_txt,
+            "/cache": self._cache,
+        }
+        self.handlers = {path: handler for path, handler in handlers.items() if path in routes}
+
+        # The routers behind these routes are mounted, so importing them costs nothing
+        self._status_spec = None
+        if _STATUS_ROUTE in routes:
+            self._status_spec = import_module("httpbin.routers.status_codes").parse_status_spec
+        if "/robots.txt" in routes:
+            self._robots = import_module("httpbin.routers.response_formats").ROBOTS_TXT_PAYLOAD
+        if "/cache" in routes or _ETAG_ROUTE in routes:
+            self._caching = import_module("httpbin.routers.caching")
+        self._etags = _ETAG_ROUTE in routes
+        self._redirect_routes = {
+            f"/{route.split('/')[1]}/": route
+            for route in (_REDIRECT_ROUTE, _RELATIVE_REDIRECT_ROUTE, _ABSOLUTE_REDIRECT_ROUTE)
+            if route in routes
+        }
+        if self._redirect_routes:
+            self._redirects = import_module("httpbin.routers.redirects")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["query_string"] or scope.get("root_path"):
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        dispatched = self._dispatch(scope)
+        if dispatched is None:
+            await self.app(scope, receive, send)
+            return
+
+        route, (status, headers, body) = dispatched
+        # Middleware in front of the fast lane (the access log) reads the route from here
+        scope["route"] = _lane_route(route)
+        # A copy, as CORSMiddleware edits the headers of the message in place
+        await send({"type": "http.response.start", "status": status, "headers": [*headers]})
+        await send({"type": "http.response.body", "body": body})
+
+        if self.registry is not None:
+            now = perf_counter()
+            self.registry.stats(scope["method"], route).observe(status, now - start, len(body))
+            self.registry.maybe_flush(now)
+
+    def _dispatch(self, scope: Scope) -> tuple[str, Result] | None:
+        """Return the route template and response for requests the fast lane answers"""
+        if self.compression:
+            for name, _ in scope["headers"]:
+                if name == b"accept-encoding":
+                    return None
+
+        path = scope["path"]
+        method = scope["method"]
+        handler = self.handlers.get(path)
+        if handler is not None:
+            if method != "GET":
+                return None
+            result = handler(scope)
+            return None if result is None else (path, result)
+
+        if self._status_spec is not None and path.startswith("/status/"):
+            codes = path[8:]
+            if codes and "/" not in codes and method in _STATUS_METHODS:
+                return _STATUS_ROUTE, _unpack(self._status_spec(codes).choose(random.random))
+        elif self._etags and path.startswith("/etag/"):
+            etag = path[6:]
+            if etag and "/" not in etag and method == "GET":
+                response = self._caching.conditional_etag_response(
+                    etag, _header(scope, b"if-match"), _header(scope, b"if-none-match")
+                )
+                if response is not None:
+                    return _ETAG_ROUTE, _unpack(response)
+        elif self._redirect_routes and method == "GET":
+            prefix, _, hops = path.rpartition("/")
+            route = self._redirect_routes.get(prefix + "/")
+            if route is not None and hops.isascii() and hops.isdigit():
+                response = self._redirect(route, scope, int(hops))
+                if response is not None:
+                    return route, _unpack(response)
+        return None
+
+    def _redirect(self, route: str, scope: Scope, n: int) -> PrebuiltResponse | None:
+        """The prebuilt hop for n, or None to let the app answer out-of-range counts"""
+        if route == _ABSOLUTE_REDIRECT_ROUTE:
+            base = self._redirects.redirect_base(scope)
+            chain = self._redirects.absolute_redirects(base, settings.MAX_REDIRECT_COUNT)
+        else:
+            chain = self._redirects.relative_redirects(settings.MAX_REDIRECT_COUNT)
+        return chain[n - 1] if 1 <= n <= len(chain) else None
+
+    @staticmethod
+    def _uuid(scope: Scope) -> Result:
+        return _json(b'{"uuid":"%s"}' % str(uuid.uuid4()).encode("ascii"))
+
+    @staticmethod
+    def _ip(scope: Scope) -> Result:
+        return _json(b'{"origin":%s}' % _dumps(get_client_ip(scope)))
+
+    @staticmethod
+    def _user_agent(scope: Scope) -> Result:
+        return _json(b'{"user-agent":%s}' % _dumps(_header(scope, b"user-agent") or ""))
+
+    def _cache(self, scope: Scope) -> Result | None:
+        for name, _ in scope["headers"]:
+            if name == b"if-none-match" or name == b"if-modified-since":
+                return _unpack(self._caching.CACHE_NOT_MODIFIED)
+        return None
+
+    def _robots_txt(self, scope: Scope) -> Result:
+        return _unpack(
+            self._robots.select(
+                _header(scope, b"accept-encoding"), _header(scope, b"if-none-match")
+            )
+        )
@@ -0,0 +1,130 @@
+import random
+from urllib.parse import parse_qsl
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from httpbin.faults import FaultSpec, parse_fault_spec
+from httpbin.timers import get_scheduler
+
+FAULT_HEADER = b"x-httpbin-fault"
+FAULT_QUERY_PARAMETER = "fault"
+
+
+class InjectedResetError(ConnectionResetError):
+    """Raised mid-body to make the server drop the connection"""
+
+
+class FaultInjectionMiddleware:
+    """
+    Inject latency, errors, slow first bytes, trickled bodies and connection resets
+    into any request that asks for them with an ``X-Httpbin-Fault`` header or a
+    ``fault`` query parameter, e.g. ``latency=p99:200ms;error=0.01``.
+
+    Specs are parsed once per distinct value (see httpbin.faults). Requests without
+    a fault cost one scan of the header names. Waits use the shared delay scheduler
+    and each one is capped at ``max_delay`` seconds. A trickled body waits at most
+    ``max_trickle`` seconds in total; whatever is left after that is sent at once.
+    """
+
+    def __init__(self, app: ASGIApp, max_delay: float, max_trickle: float) -> None:
+        self.app = app
+        self.max_delay = max_delay
+        self.max_trickle = max_trickle
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == FAULT_HEADER:
+                spec = value.decode("latin-1")
+                break
+        else:
+            query_string = scope["query_string"]
+            if b"fault=" not in query_string:
+                await self.app(scope, receive, send)
+                return
+            spec = dict(parse_qsl(query_string.decode("latin-1"))).get(FAULT_QUERY_PARAMETER)
+            if spec is None:
+                await self.app(scope, receive, send)
+                return
+
+        fault = parse_fault_spec(spec)
+        if not isinstance(fault, FaultSpec):
+            await fault(scope, receive, send)
+            return
+
+        if fault.latency is not None:
+            await self._sleep(fault.latency())
+        if fault.error_rate and random.random() < fault.error_rate:
+            await fault.error_response(scope, receive, send)
+            return
+        if not fault.shapes_response:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, self._shaped_send(fault, send))
+        except InjectedResetError:
+            # Leave the response unfinished, so the server drops the connection
+            pass
+
+    async def _sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            await get_scheduler().schedule(min(seconds, self.max_delay))
+
+    def _shaped_send(self, fault: FaultSpec, send: Send) -> Send:
+        reset = fault.reset_rate and random.random() < fault.reset_rate
+        size = fault.trickle_size
+        interval = min(fault.trickle_interval, self.max_delay)
+        body_started = False
+        trickled = 0.0
+
+        async def shaped_send(message: Message) -> None:
+            nonlocal body_started, trickled
+            if message["type"] == "http.response.start":
+                await self._sleep(fault.ttfb)
+                await send(message)
+                return
+            body = message.get("body", b"")
+            if message["type"] != "http.response.body" or not body:
+                await send(message)
+                return
+
+            if reset:
+                # Send part of the body, then make the server drop the connection
+                half = body[: len(body) // 2]
+                await send({"type": "http.response.body", "body": half, "more_body": True})
+                raise InjectedResetError("Injected connection reset")
+            if not size:
+                await send(message)
+                return
+
+            # Send the body in pieces of `size` bytes, one per trickle interval, until
+            # the trickle has waited max_trickle seconds
+            more_body = message.get("more_body", False)
+            for start in range(0, len(body), size):
+                if body_started:
+                    if trickled >= self.max_trickle:
+                        await send(
+                            {
+                                "type": "http.response.body",
+                                "body": body[start:],
+                                "more_body": more_body,
+                            }
+                        )
+                        return
+                    wait = min(interval, self.max_trickle - trickled)
+                    trickled += wait
+                    await self._sleep(wait)
+                body_started = True
+                end = start + size
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": body[start:end],
+                        "more_body": more_body or end < len(body),
+                    }
+                )
+
+        return shaped_send
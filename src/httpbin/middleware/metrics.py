@@ -0,0 +1,93 @@
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from httpbin.metrics import PENDING_ROUTE, UNMATCHED_ROUTE, MetricsRegistry, RouteStats
+
+
+class MetricsMiddleware:
+    """
+    Record per-route request counts, latency histograms, response bytes and in-flight
+    gauges into a MetricsRegistry.
+
+    Requests are labelled with their route template (``/status/{codes}``) rather than
+    the concrete URL. The template is only known once the router has run, so the
+    ``(method, path) -> stats`` mapping is cached: repeat paths are attributed (and
+    counted in flight) from the start of the request. A new path is counted in flight
+    under ``<pending>`` until the router has matched it, which is checked whenever
+    the app receives or sends, and then moved to its route.
+    """
+
+    def __init__(
+        self, app: ASGIApp, registry: MetricsRegistry, path_cache_size: int = 4096
+    ) -> None:
+        self.app = app
+        self.registry = registry
+        self.path_cache_size = path_cache_size
+        self._paths: dict[tuple[str, str], RouteStats] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        path_key = (scope["method"], scope["path"])
+        stats = self._paths.get(path_key)
+        pending = None
+        if stats is None:
+            pending = self.registry.stats(scope["method"], PENDING_ROUTE)
+            pending.in_flight += 1
+        else:
+            stats.in_flight += 1
+
+        status = 500
+        response_bytes = 0
+
+        def settle() -> None:
+            """Move a pending request's in-flight count to its route once it is routed"""
+            nonlocal stats, pending
+            if pending is not None and scope.get("route") is not None:
+                pending.in_flight -= 1
+                pending = None
+                stats = self._resolve(scope, path_key)
+                stats.in_flight += 1
+
+        async def receive_wrapper() -> Message:
+            settle()
+            return await receive()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                settle()
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive if pending is None else receive_wrapper, send_wrapper)
+        finally:
+            if pending is not None:
+                pending.in_flight -= 1
+                stats = self._resolve(scope, path_key)
+            else:
+                stats.in_flight -= 1
+            now = perf_counter()
+            stats.observe(status, now - start, response_bytes)
+            self.registry.maybe_flush(now)
+
+    def _resolve(self, scope: Scope, path_key: tuple[str, str]) -> RouteStats:
+        """Look up the stats for a path seen for the first time, once it is routed"""
+        route = scope.get("route")
+        template = getattr(route, "path", None)
+        if template is None:
+            # Unmatched paths are not cached, so scanners cannot fill the cache
+            return self.registry.stats(scope["method"], UNMATCHED_ROUTE)
+
+        stats = self.registry.stats(scope["method"], template)
+        if len(self._paths) >= self.path_cache_size:
+            self._paths.clear()
+        self._paths[path_key] = stats
+        return stats
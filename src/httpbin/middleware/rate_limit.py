@@ -0,0 +1,48 @@
+from time import perf_counter
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from httpbin.metrics import RATE_LIMITED_ROUTE, MetricsRegistry
+from httpbin.ratelimit import TokenBuckets, too_many_requests
+from httpbin.utils import get_client_ip
+
+
+class RateLimitMiddleware:
+    """
+    Limit each client IP (the first X-Forwarded-For entry, else the peer address) to
+    ``rate`` requests per second with bursts of up to ``burst``.
+
+    Allowed requests pass through untouched; only rejections get RateLimit-* headers,
+    along with Retry-After. It sits in front of everything but CORS, fast lane
+    included, so rejected requests never reach routing: they are counted in the
+    metrics under a ``<rate-limited>`` route.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate: float,
+        burst: int,
+        max_clients: int = 100_000,
+        registry: MetricsRegistry | None = None,
+    ) -> None:
+        self.app = app
+        self.rate = rate
+        self.burst = burst
+        self.registry = registry
+        self.buckets = TokenBuckets(max_clients)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            start = perf_counter()
+            tokens = self.buckets.take(get_client_ip(scope), self.rate, self.burst, start)
+            if tokens < 0.0:
+                response = too_many_requests(tokens, self.rate, self.burst)
+                await response(scope, receive, send)
+                if self.registry is not None:
+                    now = perf_counter()
+                    stats = self.registry.stats(scope["method"], RATE_LIMITED_ROUTE)
+                    stats.observe(429, now - start, len(response.body))
+                    self.registry.maybe_flush(now)
+                return
+        await self.app(scope, receive, send)
@@ -0,0 +1,134 @@
+"""Deterministic JSON documents of a requested size or shape, streamed from pre-encoded records"""
+
+import json
+import random
+from collections.abc import AsyncIterator
+from functools import lru_cache
+from typing import NamedTuple
+
+# Records cycle through this many pre-encoded variants per (seed, depth), so the
+# repeated parts of a document are encoded once however large it grows
+_VARIANTS = 16
+# Records are batched into chunks of about this size
+_CHUNK_SIZE = 64 * 1024
+
+_WORDS = (
+    "alpha",
+    "bravo",
+    "charlie",
+    "delta",
+    "echo",
+    "foxtrot",
+    "golf",
+    "hotel",
+    "india",
+    "juliet",
+    "kilo",
+    "lima",
+    "mike",
+    "november",
+    "oscar",
+    "papa",
+)
+
+# The last record of a sized document grows by '"pad":"",' plus its padding
+_PAD_OVERHEAD = len(b'"pad":"",')
+# Longest '{"id":N,' prefix, for ids up to 20 digits
+_MAX_ID_PREFIX = len(b'{"id":,') + 20
+
+
+class PayloadLayout(NamedTuple):
+    """How records are framed in one /payload format"""
+
+    head: bytes
+    separator: bytes
+    tail: bytes
+    media_type: str
+
+
+PAYLOAD_LAYOUTS = {
+    "json": PayloadLayout(b'{"items":[', b",", b"]}", "application/json"),
+    "array": PayloadLayout(b"[", b",", b"]", "application/json"),
+    "ndjson": PayloadLayout(b"", b"\n", b"\n", "application/x-ndjson"),
+}
+
+
+@lru_cache(maxsize=16)
+def record_bodies(seed: int, depth: int) -> tuple[bytes, ...]:
+    """
+    The pre-encoded record variants for seed and depth, without their leading
+    ``{"id":N,``. Record i of a document is ``{"id":i,`` + ``bodies[i % len(bodies)]``.
+    """
+    rng = random.Random(seed)
+    bodies = []
+    for _ in range(_VARIANTS):
+        # Built from the innermost level out, so no recursion is needed
+        child = None
+        for level in range(depth, 0, -1):
+            node = {
+                "level": level,
+                "label": rng.choice(_WORDS),
+                "values": [rng.randrange(1000) for _ in range(3)],
+            }
+            if child is not None:
+                node["child"] = child
+            child = node
+        record = {
+            "name": f"{rng.choice(_WORDS)}-{rng.randrange(10_000)}",
+            "active": rng.random() < 0.5,
+            "score": round(rng.uniform(0, 100), 2),
+            "tags": rng.sample(_WORDS, 3),
+        }
+        if child is not None:
+            record["child"] = child
+        bodies.append(json.dumps(record, separators=(",", ":")).encode("ascii")[1:])
+    return tuple(bodies)
+
+
+def minimum_size(layout: PayloadLayout, bodies: tuple[bytes, ...]) -> int:
+    """The smallest exact size a document can have: one padded record"""
+    return len(layout.head) + len(b'{"id":0,') + len(bodies[0]) + _PAD_OVERHEAD + len(layout.tail)
+
+
+async def payload_chunks(
+    layout: PayloadLayout,
+    bodies: tuple[bytes, ...],
+    items: int | None = None,
+    size: int | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    Yield a document of ``items`` records, or of exactly ``size`` bytes, in chunks
+    of about 64KB. For a sized document, records are added while the next one would
+    still fit after them; the last one is padded with a ``"pad"`` string to make up
+    the difference. Only the chunk being built is held in memory.
+    """
+    separator = layout.separator
+    variants = len(bodies)
+    # Room left for records in a sized document, and the most the next one can need
+    budget = 0 if size is None else size - len(layout.head) - len(layout.tail)
+    slack = len(separator) + _MAX_ID_PREFIX + max(map(len, bodies)) + _PAD_OVERHEAD
+
+    parts = [layout.head]
+    buffered = 0
+    i = 0
+    while items is None or i < items:
+        prefix = b'%s{"id":%d,' % (separator if i else b"", i)
+        body = bodies[i % variants]
+        if size is not None:
+            length = len(prefix) + len(body)
+            budget -= length
+            if budget < slack:
+                following = b'%s{"id":%d,' % (separator, i + 1)
+                if budget < len(following) + len(bodies[(i + 1) % variants]) + _PAD_OVERHEAD:
+                    prefix += b'"pad":"%s",' % (b"x" * (budget - _PAD_OVERHEAD))
+                    items = i + 1
+        parts.append(prefix)
+        parts.append(body)
+        buffered += len(body)
+        if buffered >= _CHUNK_SIZE:
+            yield b"".join(parts)
+            parts.clear()
+            buffered = 0
+        i += 1
+    parts.append(layout.tail)
+    yield b"".join(parts)
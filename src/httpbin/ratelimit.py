@@ -0,0 +1,106 @@
+"""Token-bucket rate limiting with memory-bounded per-client state"""
+
+import math
+from collections import OrderedDict
+from collections.abc import Hashable
+from functools import lru_cache
+
+from httpbin.responses import PrebuiltResponse
+
+# Window suffixes accepted by parse_rate, in seconds
+_WINDOWS = {"s": 1.0, "m": 60.0, "h": 3600.0, "d": 86400.0}
+
+_TOO_MANY_REQUESTS_BODY = b'{"detail":"Too Many Requests"}'
+
+
+@lru_cache(maxsize=256)
+def parse_rate(spec: str) -> tuple[float, int]:
+    """
+    Parse ``N`` (per second) or ``N/s``, ``N/m``, ``N/h``, ``N/d`` into
+    (tokens per second, burst). The bucket holds N tokens and refills over the
+    window. Raises ValueError for invalid specs.
+    """
+    count, _, window = spec.strip().partition("/")
+    try:
+        limit = int(count)
+        seconds = _WINDOWS[window.strip().lower() or "s"]
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate: {spec!r}, expected e.g. 10/s or 100/m") from None
+    if limit < 1:
+        raise ValueError(f"Invalid rate: {spec!r}, the count must be at least 1")
+    return limit / seconds, limit
+
+
+class TokenBuckets:
+    """
+    Token buckets keyed by client, held in an LRU of at most ``max_size`` entries.
+
+    A bucket is a two-item list (tokens, last refill) updated in place. Evicting a
+    bucket forgets its client, which then starts again from a full bucket, so memory
+    stays bounded however many distinct clients show up.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.rejected = 0
+        self._buckets: OrderedDict[Hashable, list[float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def take(self, key: Hashable, rate: float, burst: int, now: float) -> float:
+        """
+        Take one token from ``key``'s bucket. Returns the tokens left, or the negative
+        deficit when the bucket is empty, in which case nothing is taken.
+        """
+        buckets = self._buckets
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = [float(burst), now]
+            if len(buckets) > self.max_size:
+                buckets.popitem(last=False)
+        else:
+            buckets.move_to_end(key)
+            tokens = bucket[0] + (now - bucket[1]) * rate
+            bucket[0] = tokens if tokens < burst else float(burst)
+            bucket[1] = now
+
+        tokens = bucket[0] - 1.0
+        if tokens >= 0.0:
+            bucket[0] = tokens
+        else:
+            self.rejected += 1
+        return tokens
+
+
+def rate_limit_headers(tokens: float, rate: float, burst: int) -> dict[str, str]:
+    """RateLimit-* headers (IETF draft) for a bucket left with ``tokens``"""
+    remaining = max(tokens, 0.0)
+    return {
+        "RateLimit-Limit": str(burst),
+        "RateLimit-Remaining": str(int(remaining)),
+        "RateLimit-Reset": str(math.ceil((burst - remaining) / rate)),
+    }
+
+
+@lru_cache(maxsize=1024)
+def _too_many_requests(burst: int, retry_after: int, reset: int) -> PrebuiltResponse:
+    return PrebuiltResponse(
+        _TOO_MANY_REQUESTS_BODY,
+        status_code=429,
+        raw_headers=[
+            (b"content-length", str(len(_TOO_MANY_REQUESTS_BODY)).encode("latin-1")),
+            (b"content-type", b"application/json"),
+            (b"retry-after", str(retry_after).encode("latin-1")),
+            (b"ratelimit-limit", str(burst).encode("latin-1")),
+            (b"ratelimit-remaining", b"0"),
+            (b"ratelimit-reset", str(reset).encode("latin-1")),
+        ],
+    )
+
+
+def too_many_requests(deficit: float, rate: float, burst: int) -> PrebuiltResponse:
+    """The prebuilt 429 for a bucket ``deficit`` tokens short of one request"""
+    return _too_many_requests(
+        burst, max(math.ceil(-deficit / rate), 1), math.ceil((burst - deficit - 1.0) / rate)
+    )
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import math
+from collections.abc import AsyncIterable, Callable
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from httpbin.compression import SUPPORTED_ENCODINGS, compress, negotiate_encoding
+from httpbin.config import settings
+from httpbin.utils import etag_matches
+
+
+def _finite(content: Any) -> Any:
+    """Replace NaN and infinities with None, recursing into lists and dicts"""
+    if isinstance(content, float):
+        return content if math.isfinite(content) else None
+    if isinstance(content, dict):
+        return {key: _finite(value) for key, value in content.items()}
+    if isinstance(content, list | tuple):
+        return [_finite(value) for value in content]
+    return content
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    try:
+        text = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+    except ValueError:
+        # Non-finite floats are encoded as null, as orjson and msgspec do
+        text = json.dumps(
+            _finite(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        )
+    return text.encode("utf-8")
+
+
+def _load_json_backend(name: str) -> Callable[[Any], bytes]:
+    """Resolve the JSON encoder named by ``settings.JSON_BACKEND``"""
+    if name in ("auto", "orjson"):
+        try:
+            import orjson
+
+            return orjson.dumps
+        except ImportError:
+            if name == "orjson":
+                raise
+    if name in ("auto", "msgspec"):
+        try:
+            import msgspec
+
+            return msgspec.json.encode
+        except ImportError:
+            if name == "msgspec":
+                raise
+    if name in ("auto", "json"):
+        return _stdlib_dumps
+    raise ValueError(f"Unknown JSON backend: {name}")
+
+
+_backend_dumps = _load_json_backend(settings.JSON_BACKEND)
+
+
+def json_dumps(content: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes with the fastest available encoder"""
+    try:
+        return _backend_dumps(content)
+    except (TypeError, ValueError, OverflowError):
+        # Fast encoders reject a few inputs the stdlib handles (e.g. >64-bit integers)
+        return _stdlib_dumps(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson or msgspec when available"""
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+class PrebuiltResponse(Response):
+    """
+    A response whose status, headers and body are encoded once and reused.
+
+    Instances are safe to share between requests: each send gets its own copy of the
+    header list, because middleware such as CORS mutate the outgoing headers in place.
+    """
+
+    def __init__(
+        self,
+        body: bytes = b"",
+        status_code: int = 200,
+        raw_headers: list[tuple[bytes, bytes]] | None = None,
+    ) -> None:
+        self.status_code = status_code
+        self.body = body
+        self.background = None
+        self.raw_headers = raw_headers or []
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": list(self.raw_headers),
+            }
+        )
+        await send({"type": "http.response.body", "body": self.body})
+
+
+class BodyStreamResponse(Response):
+    """
+    Send an async iterable of chunks as a chunked body.
+
+    Unlike StreamingResponse, it does not listen for a disconnect while sending, as
+    that consumes ``receive``. Use it when producing the content reads the request
+    body. An exception mid-stream aborts the response.
+    """
+
+    def __init__(
+        self, content: AsyncIterable[bytes], status_code: int = 200, media_type: str | None = None
+    ) -> None:
+        self.content = content
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        async for chunk in self.content:
+            if chunk:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+
+class StaticPayload:
+    """
+    Immutable content encoded once at startup, with a strong ETag and
+    pre-compressed variants selected by Accept-Encoding.
+
+    Already-compressed media (PNG, JPEG, ...) should pass ``compressible=False``;
+    ``vary`` names further request headers the response was selected by.
+    """
+
+    def __init__(
+        self,
+        content: str | bytes,
+        media_type: str,
+        vary: tuple[str, ...] = (),
+        compressible: bool = True,
+    ) -> None:
+        body = content.encode("utf-8") if isinstance(content, str) else content
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.vary = ", ".join((*vary, "Accept-Encoding") if compressible else vary)
+
+        self.etag = f'"{digest}"'
+        self.responses: dict[str | None, PrebuiltResponse] = {
+            None: self._build(body, media_type, self.etag, None)
+        }
+        etags = [self.etag]
+        for encoding in SUPPORTED_ENCODINGS if compressible else ():
+            compressed = compress(body, encoding, level=9)
+            # Tiny payloads can grow when compressed; only keep variants that pay off
+            if len(compressed) < len(body):
+                etag = f'"{digest}-{encoding}"'
+                etags.append(etag)
+                self.responses[encoding] = self._build(compressed, media_type, etag, encoding)
+
+        self.etags = tuple(etags)
+        self.encodings = tuple(encoding for encoding in self.responses if encoding)
+        self.not_modified = {
+            encoding: PrebuiltResponse(
+                status_code=304,
+                raw_headers=[
+                    header for header in response.raw_headers if header[0] in (b"etag", b"vary")
+                ],
+            )
+            for encoding, response in self.responses.items()
+        }
+
+    def _build(
+        self, body: bytes, media_type: str, etag: str, encoding: str | None
+    ) -> PrebuiltResponse:
+        raw_headers = [
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"content-type", media_type.encode("latin-1")),
+            (b"etag", etag.encode("latin-1")),
+        ]
+        if self.vary:
+            raw_headers.append((b"vary", self.vary.encode("latin-1")))
+        if encoding:
+            raw_headers.append((b"content-encoding", encoding.encode("latin-1")))
+        return PrebuiltResponse(body, raw_headers=raw_headers)
+
+    def response(self, request: Request) -> PrebuiltResponse:
+        """Select the variant (or a 304) for this request without encoding anything"""
+        headers = request.headers
+        return self.select(headers.get("accept-encoding"), headers.get("if-none-match"))
+
+    def select(self, accept_encoding: str | None, if_none_match: str | None) -> PrebuiltResponse:
+        """Select the variant (or a 304) for the given request header values"""
+        encoding = negotiate_encoding(accept_encoding, self.encodings) if accept_encoding else None
+        if if_none_match and etag_matches(if_none_match, self.etags):
+            return self.not_modified[encoding]
+        return self.responses[encoding]
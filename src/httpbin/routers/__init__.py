@@ -1,8 +1,45 @@
-from httpbin.routers.dynamic import router as dynamic_router
-from httpbin.routers.http_methods import router as http_methods_router
-from httpbin.routers.request_inspection import router as request_inspection_router
-from httpbin.routers.response_formats import router as response_formats_router
-from httpbin.routers.status_codes import router as status_codes_router
+"""
+Feature routers.
+
+Routers are imported on first use, so routers disabled in settings.ENABLED_ROUTERS
+are never imported. ``from httpbin.routers import dynamic_router`` still works.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from fastapi import APIRouter
+
+# Router name (as used in settings.ENABLED_ROUTERS) -> module
+ROUTER_MODULES = {
+    "http_methods": "httpbin.routers.http_methods",
+    "status_codes": "httpbin.routers.status_codes",
+    "request_inspection": "httpbin.routers.request_inspection",
+    "response_formats": "httpbin.routers.response_formats",
+    "dynamic": "httpbin.routers.dynamic",
+    "realtime": "httpbin.routers.realtime",
+    "caching": "httpbin.routers.caching",
+    "redirects": "httpbin.routers.redirects",
+    "metrics": "httpbin.routers.metrics",
+}
+
+
+def load_router(name: str) -> "APIRouter":
+    """Import a router module by name and return its router"""
+    try:
+        module = ROUTER_MODULES[name]
+    except KeyError:
+        raise ValueError(f"Unknown router: {name}") from None
+    return import_module(module).router
+
+
+def __getattr__(attribute: str) -> "APIRouter":
+    name = attribute.removesuffix("_router")
+    if attribute.endswith("_router") and name in ROUTER_MODULES:
+        return load_router(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {attribute!r}")
+
 
 __all__ = [
     "http_methods_router",
@@ -10,4 +47,9 @@ __all__ = [
     "request_inspection_router",
     "response_formats_router",
     "dynamic_router",
+    "realtime_router",
+    "caching_router",
+    "redirects_router",
+    "metrics_router",
+    "load_router",
 ]
@@ -0,0 +1,131 @@
+import re
+import time
+from email.utils import formatdate
+from functools import lru_cache
+from typing import NamedTuple
+
+from fastapi import APIRouter, HTTPException, Request
+
+from httpbin.responses import FastJSONResponse, PrebuiltResponse, json_dumps
+from httpbin.schemas import RequestInfo
+from httpbin.utils import etag_matches, get_request_data
+
+router = APIRouter(tags=["Caching"])
+
+# /cache validators are fixed when the worker starts. The ETag derives from the start
+# second, so workers started together agree and a proxy may revalidate against any.
+_STARTED = int(time.time())
+CACHE_ETAG = f'"{_STARTED:x}"'
+CACHE_LAST_MODIFIED = formatdate(_STARTED, usegmt=True)
+_CACHE_HEADERS = {"ETag": CACHE_ETAG, "Last-Modified": CACHE_LAST_MODIFIED}
+CACHE_NOT_MODIFIED = PrebuiltResponse(
+    status_code=304,
+    raw_headers=[
+        (b"etag", CACHE_ETAG.encode("latin-1")),
+        (b"last-modified", CACHE_LAST_MODIFIED.encode("latin-1")),
+    ],
+)
+
+# Validators and prebuilt responses of /etag/{etag} and /cache/{n}, keyed on the path
+_VALIDATOR_CACHE_SIZE = 1024
+
+# etagc (RFC 9110 section 8.8.3) without obs-text: paths arrive decoded as UTF-8, so
+# non-ASCII characters can't be sent back as the bytes the client wrote
+_ETAG_CHARACTERS = re.compile(r"[\x21\x23-\x7e]+")
+_INVALID_ETAG_BODY = json_dumps(
+    {"detail": "ETags may only contain printable ASCII characters other than '\"'"}
+)
+INVALID_ETAG = PrebuiltResponse(
+    _INVALID_ETAG_BODY,
+    status_code=400,
+    raw_headers=[
+        (b"content-length", str(len(_INVALID_ETAG_BODY)).encode("latin-1")),
+        (b"content-type", b"application/json"),
+    ],
+)
+
+
+class EntityTagResponses(NamedTuple):
+    """The headers and prebuilt conditional responses of one /etag/{etag}"""
+
+    etag: str
+    headers: dict[str, str]
+    not_modified: PrebuiltResponse
+    precondition_failed: PrebuiltResponse
+
+
+@lru_cache(maxsize=_VALIDATOR_CACHE_SIZE)
+def _entity_tag_responses(etag: str) -> EntityTagResponses | None:
+    """The responses for a valid ``/etag/{etag}``, or None when it can't be an ETag"""
+    if _ETAG_CHARACTERS.fullmatch(etag) is None:
+        return None
+    quoted = f'"{etag}"'
+    header = (b"etag", quoted.encode("latin-1"))
+    return EntityTagResponses(
+        etag=quoted,
+        headers={"ETag": quoted},
+        not_modified=PrebuiltResponse(status_code=304, raw_headers=[header]),
+        precondition_failed=PrebuiltResponse(
+            status_code=412, raw_headers=[(b"content-length", b"0"), header]
+        ),
+    )
+
+
+def conditional_etag_response(
+    etag: str, if_match: str | None, if_none_match: str | None
+) -> PrebuiltResponse | None:
+    """
+    Evaluate If-Match, then If-None-Match (RFC 9110 section 13.2.2) for ``/etag/{etag}``.
+    Returns the prebuilt 400 (for an invalid ETag), 412 or 304, or None when the request
+    should get the content.
+    """
+    responses = _entity_tag_responses(etag)
+    if responses is None:
+        return INVALID_ETAG
+    if if_match is not None and not etag_matches(if_match, responses.etag, strong=True):
+        return responses.precondition_failed
+    if if_none_match is not None and etag_matches(if_none_match, responses.etag):
+        return responses.not_modified
+    return None
+
+
+@lru_cache(maxsize=_VALIDATOR_CACHE_SIZE)
+def _max_age_headers(n: int) -> dict[str, str]:
+    return {"Cache-Control": f"public, max-age={n}"}
+
+
+@router.get("/cache", response_model=RequestInfo)
+async def cache(request: Request):
+    """
+    Returns GET request data with Last-Modified and ETag headers, or a 304 Not Modified
+    when an If-Modified-Since or If-None-Match header is present.
+    """
+    headers = request.headers
+    if "if-modified-since" in headers or "if-none-match" in headers:
+        return CACHE_NOT_MODIFIED
+    return FastJSONResponse(await get_request_data(request), headers=_CACHE_HEADERS)
+
+
+@router.get("/cache/{n}", response_model=RequestInfo)
+async def cache_control(n: int, request: Request):
+    """Returns GET request data with Cache-Control: public, max-age=n"""
+    if n < 0:
+        raise HTTPException(status_code=400, detail="n must not be negative")
+    return FastJSONResponse(await get_request_data(request), headers=_max_age_headers(n))
+
+
+@router.get("/etag/{etag}", response_model=RequestInfo)
+async def etag(etag: str, request: Request):
+    """
+    Returns GET request data with the given ETag. If-None-Match lists containing it
+    (or ``*``) get a 304, If-Match lists without it a 412 Precondition Failed.
+    """
+    headers = request.headers
+    conditional = conditional_etag_response(
+        etag, headers.get("if-match"), headers.get("if-none-match")
+    )
+    if conditional is not None:
+        return conditional
+    return FastJSONResponse(
+        await get_request_data(request), headers=_entity_tag_responses(etag).headers
+    )
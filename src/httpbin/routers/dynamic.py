@@ -1,40 +1,214 @@
 import asyncio
+import json
+import math
+import os
+import random
 import secrets
-import uuid
+import string
+from collections.abc import AsyncIterator, Callable
+from functools import cache
+from time import perf_counter
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 
 from httpbin.config import settings
-from httpbin.utils import decode_base64, encode_base64
+from httpbin.payloads import PAYLOAD_LAYOUTS, minimum_size, payload_chunks, record_bodies
+from httpbin.ratelimit import TokenBuckets, parse_rate, rate_limit_headers, too_many_requests
+from httpbin.responses import BodyStreamResponse
+from httpbin.timers import sleep_unless_disconnected, wait_for_tick
+from httpbin.utils import (
+    Base64StreamDecoder,
+    Base64StreamEncoder,
+    decode_base64,
+    encode_base64,
+    get_client_ip,
+    get_request_data,
+    parse_range_header,
+)
+from httpbin.uuids import uuid4_batch, uuid7_clock
 
 router = APIRouter(tags=["Dynamic Behavior"])
 
+# The /range content repeats the lowercase alphabet, so the byte at any offset is
+# known without materialising the body. Chunks are zero-copy views into this block.
+_RANGE_ALPHABET = string.ascii_lowercase.encode("ascii")
+_RANGE_CHUNK_SIZE = 64 * 1024
+_RANGE_BLOCK = memoryview(_RANGE_ALPHABET * (_RANGE_CHUNK_SIZE // len(_RANGE_ALPHABET) + 2))
+_RANGE_BOUNDARY = "3d6b6a416f9b5"
+
+# /drip bodies are zero-copy views into this block of asterisks. Throttled streams are
+# woken on ticks of this interval, aligned across streams so that every stream due on
+# a tick shares one scheduler entry.
+_DRIP_BLOCK = memoryview(b"*" * (64 * 1024))
+_DRIP_TICK_INTERVAL = 0.01
+# Fast streams batch at least this many bytes per wake-up, but wait no longer than
+# _DRIP_MAX_GAP, so slow drips still send each byte close to when it is due
+_DRIP_MIN_CHUNK = 1024
+_DRIP_MAX_GAP = 0.1
+
+# Decoded bytes validated before a /base64/stream/decode response starts
+_BASE64_PREFETCH_SIZE = 64 * 1024
+
+# Streamed /uuid responses are generated and sent this many ids at a time
+_UUID_BATCH_SIZE = 10_000
+
+# Larger /bytes responses are sent in chunks of this size
+_BYTES_CHUNK_SIZE = 256 * 1024
+
+
+# Buckets of /limit/{rate}, keyed on (client IP, rate, burst)
+_limit_buckets = TokenBuckets(settings.RATE_LIMIT_MAX_CLIENTS)
+
+
+@cache
+def _random_pool() -> memoryview:
+    """Random bytes generated once per worker and served as read-only slices"""
+    return memoryview(os.urandom(max(settings.RANDOM_POOL_SIZE, _BYTES_CHUNK_SIZE)))
+
+
+def _pool_slice(size: int) -> memoryview:
+    pool = _random_pool()
+    offset = random.randrange(len(pool) - size + 1)
+    return pool[offset : offset + size]
+
 
 @router.get("/delay/{seconds}")
-async def delay_response(seconds: int):
+async def delay_response(seconds: float, request: Request, jitter: float = 0.0):
     """
-    Delays responding for min(seconds, MAX_DELAY_SECONDS) seconds.
+    Delays responding for min(seconds ± jitter, MAX_DELAY_SECONDS) seconds.
+    The wait is abandoned as soon as the client disconnects.
     """
-    if seconds < 0:
-        raise HTTPException(status_code=400, detail="Delay must be non-negative")
+    if not (math.isfinite(seconds) and math.isfinite(jitter)) or seconds < 0 or jitter < 0:
+        raise HTTPException(
+            status_code=400, detail="Delay and jitter must be finite and non-negative"
+        )
 
-    # Cap the delay at configured maximum
-    actual_delay = min(seconds, settings.MAX_DELAY_SECONDS)
+    # Spread the delay uniformly over ±jitter, then cap it at the configured maximum
+    actual_delay = seconds
+    if jitter:
+        actual_delay = max(seconds + random.uniform(-jitter, jitter), 0.0)
+    actual_delay = min(actual_delay, settings.MAX_DELAY_SECONDS)
 
-    await asyncio.sleep(actual_delay)
+    if actual_delay:
+        await sleep_unless_disconnected(actual_delay, request.receive)
 
     return {
         "delay": actual_delay,
         "requested": seconds,
-        "message": f"Delayed response by {actual_delay} seconds",
+        "jitter": jitter,
+        "message": f"Delayed response by {actual_delay:g} seconds",
     }
 
 
+async def _drip(numbytes: int, rate: float) -> AsyncIterator[memoryview]:
+    """
+    Yield ``numbytes`` asterisks at ``rate`` bytes per second: byte k is due k / rate
+    seconds after the first. Each wake-up sends everything due by then, so a client
+    that reads slowly catches up instead of falling further behind.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    gap = min(_DRIP_MIN_CHUNK / rate, _DRIP_MAX_GAP)
+    last_due = start + (numbytes - 1) / rate
+    sent = 0
+    while True:
+        now = loop.time()
+        due = numbytes if math.isinf(rate) else min(numbytes, int((now - start) * rate) + 1)
+        while sent < due:
+            size = min(due - sent, len(_DRIP_BLOCK))
+            yield _DRIP_BLOCK[:size]
+            sent += size
+        if sent >= numbytes:
+            return
+        wake = max(start + sent / rate, min(now + gap, last_due))
+        await wait_for_tick(math.ceil(wake / _DRIP_TICK_INTERVAL), _DRIP_TICK_INTERVAL)
+
+
+@router.get("/drip")
+async def drip(
+    request: Request,
+    numbytes: int = 10,
+    duration: float | None = None,
+    delay: float = 2.0,
+    code: int = 200,
+    rate: float | None = None,
+):
+    """
+    Drips numbytes bytes over duration seconds (2 by default), or at rate bytes per
+    second, after an initial delay. The stream stops as soon as the client disconnects.
+    """
+    if numbytes < 1 or numbytes > settings.MAX_BYTES_SIZE:
+        raise HTTPException(
+            status_code=400, detail=f"numbytes must be between 1 and {settings.MAX_BYTES_SIZE}"
+        )
+    if duration is not None and rate is not None:
+        raise HTTPException(status_code=400, detail="duration and rate are mutually exclusive")
+    if not 0 <= delay <= settings.MAX_DELAY_SECONDS:
+        raise HTTPException(
+            status_code=400, detail=f"delay must be between 0 and {settings.MAX_DELAY_SECONDS}"
+        )
+    if not 200 <= code < 600 or code in (204, 304):
+        raise HTTPException(status_code=400, detail="code must allow a response body")
+
+    if rate is None:
+        duration = 2.0 if duration is None else duration
+        if not 0 <= duration <= settings.MAX_DRIP_DURATION:
+            raise HTTPException(
+                status_code=400,
+                detail=f"duration must be between 0 and {settings.MAX_DRIP_DURATION}",
+            )
+        # One byte every duration / numbytes seconds, starting with the first, as httpbin
+        rate = numbytes / duration if duration else math.inf
+    elif not rate > 0 or (numbytes - 1) / rate > settings.MAX_DRIP_DURATION:
+        raise HTTPException(
+            status_code=400,
+            detail=f"rate must be positive and drip the body within {settings.MAX_DRIP_DURATION}s",
+        )
+
+    if delay and not await sleep_unless_disconnected(delay, request.receive):
+        return Response(status_code=code)
+
+    return StreamingResponse(
+        _drip(numbytes, rate),
+        status_code=code,
+        media_type="application/octet-stream",
+        headers={"content-length": str(numbytes)},
+    )
+
+
+@router.get("/limit/{rate:path}")
+async def rate_limit(rate: str, request: Request):
+    """
+    Applies a token-bucket limit of rate (N, N/s, N/m, N/h or N/d) per client IP.
+    Allowed requests report their quota in RateLimit-* headers; requests over the
+    limit get a 429 with Retry-After.
+    """
+    try:
+        per_second, burst = parse_rate(rate)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from None
+
+    key = (get_client_ip(request.scope), per_second, burst)
+    tokens = _limit_buckets.take(key, per_second, burst, perf_counter())
+    if tokens < 0.0:
+        return too_many_requests(tokens, per_second, burst)
+    headers = rate_limit_headers(tokens, per_second, burst)
+    return Response(
+        b'{"limit":%d,"remaining":%d,"reset":%s}'
+        % (burst, int(tokens), headers["RateLimit-Reset"].encode("ascii")),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
 @router.get("/base64/{value}")
 async def decode_base64_value(value: str):
     """Decodes a base64-encoded string"""
-    decoded = decode_base64(value)
+    try:
+        decoded = decode_base64(value)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid base64 input: {e}") from None
     return {"decoded": decoded, "original": value}
 
 
@@ -49,17 +223,302 @@ async def encode_to_base64(data: dict):
     return {"encoded": encoded, "original": text}
 
 
+async def _transcode(
+    chunks: AsyncIterator[bytes], codec: Base64StreamEncoder | Base64StreamDecoder, head: bytes
+) -> AsyncIterator[bytes]:
+    yield head
+    async for chunk in chunks:
+        yield codec.feed(chunk)
+    yield codec.finish()
+
+
+@router.post("/base64/stream/encode")
+async def encode_base64_stream(request: Request, urlsafe: bool = False):
+    """Base64-encodes the raw request body as it streams in, in constant memory"""
+    encoder = Base64StreamEncoder(urlsafe)
+    return BodyStreamResponse(
+        _transcode(request.stream(), encoder, b""), media_type="text/plain; charset=us-ascii"
+    )
+
+
+@router.post("/base64/stream/decode")
+async def decode_base64_stream(request: Request, urlsafe: bool = False):
+    """
+    Decodes a base64 request body as it streams in, in constant memory.
+    The first 64KB of output are decoded before responding, so malformed bodies get
+    a 400; an error later in a larger stream aborts the response.
+    """
+    decoder = Base64StreamDecoder(urlsafe)
+    chunks = request.stream()
+    head = b""
+    try:
+        async for chunk in chunks:
+            head += decoder.feed(chunk)
+            if len(head) >= _BASE64_PREFETCH_SIZE:
+                break
+        else:
+            head += decoder.finish()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from None
+
+    return BodyStreamResponse(
+        _transcode(chunks, decoder, head), media_type="application/octet-stream"
+    )
+
+
 @router.get("/uuid")
-async def generate_uuid():
-    """Generates a random UUID"""
-    return {"uuid": str(uuid.uuid4())}
+async def generate_uuid(version: int = 4, count: int | None = None, format: str = "json"):
+    """
+    Generates a random (version 4) or time-ordered (version 7) UUID.
+    With count, returns {"uuids": [...]} up to MAX_UUID_COUNT, or streams one
+    {"uuid": ...} line per id up to MAX_UUID_STREAM_COUNT with format=ndjson.
+    """
+    if version not in (4, 7):
+        raise HTTPException(status_code=400, detail="version must be 4 or 7")
+    if format not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be json or ndjson")
+    generate = uuid4_batch if version == 4 else uuid7_clock.batch
+
+    if format == "ndjson":
+        return _stream_uuids(generate, 1 if count is None else count)
+
+    if count is None:
+        return {"uuid": generate(1)[0]}
+    if count < 1 or count > settings.MAX_UUID_COUNT:
+        raise HTTPException(
+            status_code=400,
+            detail=f"count must be between 1 and {settings.MAX_UUID_COUNT}; "
+            "use format=ndjson for more",
+        )
+    body = b'{"uuids":["%s"]}' % '","'.join(generate(count)).encode("ascii")
+    return Response(content=body, media_type="application/json")
+
+
+def _stream_uuids(generate: Callable[[int], list[str]], count: int) -> StreamingResponse:
+    if count < 1 or count > settings.MAX_UUID_STREAM_COUNT:
+        raise HTTPException(
+            status_code=400, detail=f"count must be between 1 and {settings.MAX_UUID_STREAM_COUNT}"
+        )
+
+    async def lines() -> AsyncIterator[bytes]:
+        # Generate and encode in batches, so memory stays flat regardless of count
+        remaining = count
+        while remaining > 0:
+            size = min(_UUID_BATCH_SIZE, remaining)
+            remaining -= size
+            yield b"".join(b'{"uuid":"%s"}\n' % u.encode("ascii") for u in generate(size))
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.get("/bytes/{n}")
-async def random_bytes(n: int):
-    """Generates n random bytes"""
-    if n < 1 or n > 102400:  # Max 100KB
-        raise HTTPException(status_code=400, detail="n must be between 1 and 102400")
+async def random_bytes(n: int, seed: int | None = None, secure: bool = False):
+    """
+    Generates n random bytes: reproducible with seed, from the OS CSPRNG with
+    secure=true, otherwise zero-copy slices of a per-worker random pool.
+    """
+    if n < 1 or n > settings.MAX_BYTES_SIZE:
+        raise HTTPException(
+            status_code=400, detail=f"n must be between 1 and {settings.MAX_BYTES_SIZE}"
+        )
+    if secure and seed is not None:
+        raise HTTPException(status_code=400, detail="seed cannot be combined with secure=true")
+
+    if secure:
+        generate = secrets.token_bytes
+    elif seed is not None:
+        # Chunks are multiples of 4 bytes, so the output equals Random(seed).randbytes(n)
+        generate = random.Random(seed).randbytes
+    else:
+        generate = _pool_slice
+
+    if n <= _BYTES_CHUNK_SIZE:
+        return Response(content=generate(n), media_type="application/octet-stream")
+
+    async def chunks() -> AsyncIterator[bytes | memoryview]:
+        remaining = n
+        while remaining > 0:
+            size = min(_BYTES_CHUNK_SIZE, remaining)
+            remaining -= size
+            yield generate(size)
+
+    return StreamingResponse(
+        chunks(), media_type="application/octet-stream", headers={"content-length": str(n)}
+    )
+
+
+@router.get("/stream/{n}")
+async def stream_json(n: int, request: Request):
+    """Streams n newline-delimited JSON objects, each echoing the request data"""
+    if n < 1 or n > settings.MAX_STREAM_LINES:
+        raise HTTPException(
+            status_code=400, detail=f"n must be between 1 and {settings.MAX_STREAM_LINES}"
+        )
+
+    # Encode the request data once; each line only differs by its leading id
+    payload = json.dumps(
+        await get_request_data(request), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    tail = payload[1:] + b"\n"
+
+    async def lines() -> AsyncIterator[bytes]:
+        for i in range(n):
+            yield b'{"id":%d,' % i + tail
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/payload")
+async def payload(
+    size: int | None = None,
+    depth: int = 2,
+    items: int | None = None,
+    seed: int = 0,
+    format: str = "json",
+):
+    """
+    Streams a deterministic JSON document of items records (10 by default), each
+    nested depth levels deep, or of exactly size bytes. format=array sends a bare
+    array and format=ndjson one record per line. The same seed gives the same bytes.
+    """
+    layout = PAYLOAD_LAYOUTS.get(format)
+    if layout is None:
+        raise HTTPException(status_code=400, detail="format must be json, array or ndjson")
+    if not 0 <= depth <= settings.MAX_PAYLOAD_DEPTH:
+        raise HTTPException(
+            status_code=400, detail=f"depth must be between 0 and {settings.MAX_PAYLOAD_DEPTH}"
+        )
+    if size is not None and items is not None:
+        raise HTTPException(status_code=400, detail="size cannot be combined with items")
+    bodies = record_bodies(seed, depth)
+
+    if size is not None:
+        minimum = minimum_size(layout, bodies)
+        if not minimum <= size <= settings.MAX_PAYLOAD_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"size must be between {minimum} and {settings.MAX_PAYLOAD_SIZE}",
+            )
+        return StreamingResponse(
+            payload_chunks(layout, bodies, size=size),
+            media_type=layout.media_type,
+            headers={"content-length": str(size)},
+        )
+
+    items = 10 if items is None else items
+    if not 1 <= items <= settings.MAX_PAYLOAD_ITEMS:
+        raise HTTPException(
+            status_code=400, detail=f"items must be between 1 and {settings.MAX_PAYLOAD_ITEMS}"
+        )
+    return StreamingResponse(
+        payload_chunks(layout, bodies, items=items), media_type=layout.media_type
+    )
+
+
+@router.get("/stream-bytes/{n}")
+async def stream_bytes(n: int, chunk_size: int | None = None, seed: int | None = None):
+    """Streams n random bytes in chunks of chunk_size, reproducible when seed is given"""
+    if n < 1 or n > settings.MAX_STREAM_BYTES:
+        raise HTTPException(
+            status_code=400, detail=f"n must be between 1 and {settings.MAX_STREAM_BYTES}"
+        )
+
+    if chunk_size is None:
+        chunk_size = settings.STREAM_CHUNK_SIZE
+    if chunk_size < 1 or chunk_size > settings.MAX_STREAM_CHUNK_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"chunk_size must be between 1 and {settings.MAX_STREAM_CHUNK_SIZE}",
+        )
+
+    rng = random.Random(seed)
+
+    async def chunks() -> AsyncIterator[bytes]:
+        # Only one chunk is alive at a time, so memory stays flat regardless of n
+        remaining = n
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            remaining -= size
+            yield rng.randbytes(size)
+
+    return StreamingResponse(chunks(), media_type="application/octet-stream")
+
+
+async def _range_content(first: int, last: int) -> AsyncIterator[memoryview]:
+    """Yields the /range content for the inclusive byte span [first, last]"""
+    position = first
+    while position <= last:
+        size = min(_RANGE_CHUNK_SIZE, last - position + 1)
+        offset = position % len(_RANGE_ALPHABET)
+        yield _RANGE_BLOCK[offset : offset + size]
+        position += size
+
+
+@router.get("/range/{n}")
+async def range_request(n: int, request: Request):
+    """
+    Serves n bytes of deterministic content honouring Range and If-Range headers.
+    Supports single and multipart byte ranges.
+    """
+    if n < 1 or n > settings.MAX_RANGE_SIZE:
+        raise HTTPException(
+            status_code=400, detail=f"n must be between 1 and {settings.MAX_RANGE_SIZE}"
+        )
+
+    etag = f'"range{n}"'
+    headers = {"Accept-Ranges": "bytes", "ETag": etag}
+
+    ranges = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    # A stale If-Range validator means the client must get the full representation
+    if range_header and (if_range is None or if_range.strip() == etag):
+        ranges = parse_range_header(range_header, n)
+
+    if ranges is None:
+        headers["Content-Length"] = str(n)
+        return StreamingResponse(
+            _range_content(0, n - 1), media_type="application/octet-stream", headers=headers
+        )
+
+    if not ranges or len(ranges) > settings.MAX_RANGE_PARTS:
+        headers["Content-Range"] = f"bytes */{n}"
+        return Response(status_code=416, headers=headers)
+
+    if len(ranges) == 1:
+        first, last = ranges[0]
+        headers["Content-Range"] = f"bytes {first}-{last}/{n}"
+        headers["Content-Length"] = str(last - first + 1)
+        return StreamingResponse(
+            _range_content(first, last),
+            status_code=206,
+            media_type="application/octet-stream",
+            headers=headers,
+        )
+
+    part_headers = [
+        (
+            f"--{_RANGE_BOUNDARY}\r\n"
+            "Content-Type: application/octet-stream\r\n"
+            f"Content-Range: bytes {first}-{last}/{n}\r\n\r\n"
+        ).encode("ascii")
+        for first, last in ranges
+    ]
+    closing = f"\r\n--{_RANGE_BOUNDARY}--\r\n".encode("ascii")
+    length = sum(len(part) for part in part_headers) + len(closing)
+    length += sum(last - first + 1 for first, last in ranges) + 2 * (len(ranges) - 1)
+    headers["Content-Length"] = str(length)
+
+    async def parts() -> AsyncIterator[bytes | memoryview]:
+        for i, (first, last) in enumerate(ranges):
+            yield (b"\r\n" if i else b"") + part_headers[i]
+            async for chunk in _range_content(first, last):
+                yield chunk
+        yield closing
 
-    random_data = secrets.token_bytes(n)
-    return Response(content=random_data, media_type="application/octet-stream")
+    return StreamingResponse(
+        parts(),
+        status_code=206,
+        media_type=f"multipart/byteranges; boundary={_RANGE_BOUNDARY}",
+        headers=headers,
+    )
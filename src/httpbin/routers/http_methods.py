@@ -1,36 +1,41 @@
 from fastapi import APIRouter, Request
 
+from httpbin.responses import FastJSONResponse
 from httpbin.schemas import RequestInfo
 from httpbin.utils import get_request_data
 
 router = APIRouter(tags=["HTTP Methods"])
 
+# The echo endpoints return their dict straight to JSON bytes. RequestInfo is kept as
+# the response_model for the OpenAPI schema, but returning a Response skips FastAPI's
+# pydantic validation and re-serialization of the same data.
+
 
 @router.get("/get", response_model=RequestInfo)
 async def get_method(request: Request):
     """Returns GET request data"""
-    return await get_request_data(request)
+    return FastJSONResponse(await get_request_data(request))
 
 
 @router.post("/post", response_model=RequestInfo)
 async def post_method(request: Request):
     """Returns POST request data"""
-    return await get_request_data(request)
+    return FastJSONResponse(await get_request_data(request))
 
 
 @router.put("/put", response_model=RequestInfo)
 async def put_method(request: Request):
     """Returns PUT request data"""
-    return await get_request_data(request)
+    return FastJSONResponse(await get_request_data(request))
 
 
 @router.patch("/patch", response_model=RequestInfo)
 async def patch_method(request: Request):
     """Returns PATCH request data"""
-    return await get_request_data(request)
+    return FastJSONResponse(await get_request_data(request))
 
 
 @router.delete("/delete", response_model=RequestInfo)
 async def delete_method(request: Request):
     """Returns DELETE request data"""
-    return await get_request_data(request)
+    return FastJSONResponse(await get_request_data(request))
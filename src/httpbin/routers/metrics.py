@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+router = APIRouter(tags=["Metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(request: Request):
+    """Returns per-route request metrics in the Prometheus text format"""
+    return PlainTextResponse(request.app.state.metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
+from functools import lru_cache
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from httpbin.config import settings
+from httpbin.timers import current_tick, wait_for_tick
+
+router = APIRouter(tags=["Realtime"])
+
+# Event-stream responses must reach the client as they are produced
+_SSE_HEADERS = {"cache-control": "no-cache", "x-accel-buffering": "no"}
+
+# Encoded tick payloads kept for subscribers that are a few ticks behind
+_TICK_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=_TICK_CACHE_SIZE)
+def _tick_tail(interval: float, tick: int) -> bytes:
+    """
+    Encode everything after the id of a tick's JSON payload, once per tick: every
+    subscriber of the interval shares these bytes, including the wall clock time.
+    """
+    return b'"tick":%d,"interval":%s,"time":%s}' % (
+        tick,
+        json.dumps(interval).encode("ascii"),
+        json.dumps(round(time.time(), 3)).encode("ascii"),
+    )
+
+
+def _validate(count: int, interval: float | None, name: str) -> None:
+    if count < 1 or count > settings.MAX_STREAM_LINES:
+        raise HTTPException(
+            status_code=400, detail=f"{name} must be between 1 and {settings.MAX_STREAM_LINES}"
+        )
+    if interval is not None and not (
+        settings.MIN_TICK_INTERVAL <= interval <= settings.MAX_DELAY_SECONDS
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"interval must be between {settings.MIN_TICK_INTERVAL} "
+                f"and {settings.MAX_DELAY_SECONDS}"
+            ),
+        )
+
+
+async def _ticks(count: int, interval: float) -> AsyncIterator[tuple[int, bytes, int]]:
+    """
+    Yield (id, shared payload tail, ticks skipped) for ``count`` ticks of ``interval``.
+
+    The consumer sends each tick before asking for the next one, so a slow client
+    holds up only its own generator. Ticks that passed meanwhile are skipped and
+    counted rather than queued: a slow subscriber costs no more memory than a fast one.
+    """
+    tick = current_tick(interval) + 1
+    dropped = 0
+    for event_id in range(count):
+        await wait_for_tick(tick, interval)
+        yield event_id, _tick_tail(interval, tick), dropped
+        latest = current_tick(interval)
+        dropped = max(latest - tick - 1, 0)
+        tick = max(latest, tick + 1)
+
+
+@router.get("/sse")
+async def server_sent_events(count: int = 10, interval: float = 1.0):
+    """
+    Streams count server-sent events, one every interval seconds. Subscribers of
+    the same interval receive the same ticks; ticks missed by a slow client are
+    skipped and reported in a ``: dropped N`` comment.
+    """
+    _validate(count, interval, "count")
+
+    async def events() -> AsyncIterator[bytes]:
+        async for event_id, tail, dropped in _ticks(count, interval):
+            frame = b'id: %d\ndata: {"id":%d,' % (event_id, event_id) + tail + b"\n\n"
+            yield b": dropped %d\n" % dropped + frame if dropped else frame
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
+
+@router.websocket("/ws/echo")
+async def websocket_echo(websocket: WebSocket):
+    """Echoes every text or binary message back to the client"""
+    await websocket.accept()
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            # Each echo is sent before the next message is read, so a client that stops
+            # reading stops being read from instead of filling a buffer
+            if message.get("text") is not None:
+                await websocket.send_text(message["text"])
+            else:
+                await websocket.send_bytes(message.get("bytes") or b"")
+    except WebSocketDisconnect:
+        pass
+
+
+async def _until_disconnect(websocket: WebSocket) -> None:
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@router.websocket("/ws/stream/{n}")
+async def websocket_stream(websocket: WebSocket, n: int, interval: float | None = None):
+    """
+    Sends n JSON text messages, back to back or one per tick of interval seconds,
+    then closes the connection. Incoming messages are ignored.
+    """
+    try:
+        _validate(n, interval, "n")
+    except HTTPException as exc:
+        await websocket.close(code=1008, reason=exc.detail)
+        return
+    await websocket.accept()
+
+    async def produce() -> None:
+        if interval is None:
+            for i in range(n):
+                await websocket.send_text(f'{{"id":{i}}}')
+            return
+        async for event_id, tail, dropped in _ticks(n, interval):
+            message = b'{"id":%d,' % event_id + tail
+            if dropped:
+                message = message[:-1] + b',"dropped":%d}' % dropped
+            await websocket.send_text(message.decode("ascii"))
+
+    # Stop producing as soon as the client goes away, even between ticks
+    producer = asyncio.ensure_future(produce())
+    watcher = asyncio.ensure_future(_until_disconnect(websocket))
+    try:
+        done, _ = await asyncio.wait({producer, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        producer.cancel()
+        watcher.cancel()
+    if producer in done:
+        try:
+            producer.result()
+        except WebSocketDisconnect:
+            return
+        await websocket.close()
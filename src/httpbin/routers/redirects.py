@@ -0,0 +1,102 @@
+from functools import cache, lru_cache
+from urllib.parse import quote
+
+from fastapi import APIRouter, HTTPException, Request
+
+from httpbin.config import settings
+from httpbin.responses import PrebuiltResponse
+
+router = APIRouter(tags=["Redirects"])
+
+# Characters kept as they are in /redirect-to Locations; anything else (spaces,
+# control characters, non-ASCII) is percent-encoded, which also rules out header
+# injection through CR/LF
+_LOCATION_SAFE = ":/?#[]@!$&'()*+,;=%~"
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Absolute redirect chains, keyed on the client-supplied base URL
+_ABSOLUTE_CACHE_SIZE = 64
+
+
+def _redirect(location: str, status_code: int = 302) -> PrebuiltResponse:
+    return PrebuiltResponse(
+        status_code=status_code,
+        raw_headers=[
+            (b"content-length", b"0"),
+            (b"location", location.encode("latin-1")),
+        ],
+    )
+
+
+@cache
+def relative_redirects(cap: int) -> tuple[PrebuiltResponse, ...]:
+    """Prebuilt /relative-redirect responses for hop counts 1..cap, at index n - 1"""
+    return tuple(
+        _redirect("/get" if n == 1 else f"/relative-redirect/{n - 1}") for n in range(1, cap + 1)
+    )
+
+
+@lru_cache(maxsize=_ABSOLUTE_CACHE_SIZE)
+def absolute_redirects(base: str, cap: int) -> tuple[PrebuiltResponse, ...]:
+    """Prebuilt /absolute-redirect responses for one base URL, at index n - 1"""
+    return tuple(
+        _redirect(f"{base}/get" if n == 1 else f"{base}/absolute-redirect/{n - 1}")
+        for n in range(1, cap + 1)
+    )
+
+
+def redirect_base(scope: dict) -> str:
+    """The scheme, host and root path that absolute redirects point at"""
+    scheme = scope.get("scheme", "http")
+    for name, value in scope["headers"]:
+        if name == b"host":
+            host = value.decode("latin-1")
+            break
+    else:
+        server = scope.get("server")
+        if server is None:
+            host = "localhost"
+        elif server[1] == _DEFAULT_PORTS.get(scheme):
+            host = server[0]
+        else:
+            host = f"{server[0]}:{server[1]}"
+    return f"{scheme}://{quote(host, safe=_LOCATION_SAFE)}{scope.get('root_path', '')}"
+
+
+def _hop(chain: tuple[PrebuiltResponse, ...], n: int) -> PrebuiltResponse:
+    if n < 1 or n > len(chain):
+        raise HTTPException(status_code=400, detail=f"n must be between 1 and {len(chain)}")
+    return chain[n - 1]
+
+
+@router.get("/redirect/{n}")
+async def redirect(n: int, request: Request, absolute: bool = False):
+    """302 redirects n times, relatively unless absolute=true, ending at /get"""
+    if absolute:
+        return await absolute_redirect(n, request)
+    return await relative_redirect(n)
+
+
+@router.get("/relative-redirect/{n}")
+async def relative_redirect(n: int):
+    """302 redirects n times with relative Locations, ending at /get"""
+    return _hop(relative_redirects(settings.MAX_REDIRECT_COUNT), n)
+
+
+@router.get("/absolute-redirect/{n}")
+async def absolute_redirect(n: int, request: Request):
+    """302 redirects n times with absolute Locations, ending at /get"""
+    chain = absolute_redirects(redirect_base(request.scope), settings.MAX_REDIRECT_COUNT)
+    return _hop(chain, n)
+
+
+@router.get("/redirect-to")
+@router.post("/redirect-to")
+@router.put("/redirect-to")
+@router.patch("/redirect-to")
+@router.delete("/redirect-to")
+async def redirect_to(url: str, status_code: int = 302):
+    """Redirects to url with the given 3xx status code (302 by default)"""
+    if not 300 <= status_code < 400:
+        raise HTTPException(status_code=400, detail="status_code must be between 300 and 399")
+    return _redirect(quote(url, safe=_LOCATION_SAFE), status_code)
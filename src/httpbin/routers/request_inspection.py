@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Request
 
 from httpbin.schemas import HeadersResponse, IPResponse
+from httpbin.utils import get_client_ip
 
 router = APIRouter(tags=["Request Inspection"])
 
@@ -14,14 +15,7 @@ async def get_headers(request: Request):
 @router.get("/ip", response_model=IPResponse)
 async def get_ip(request: Request):
     """Returns the requester's IP address"""
-    origin = request.client.host if request.client else "unknown"
-
-    # Check for forwarded IP
-    forwarded_for = request.headers.get("x-forwarded-for")
-    if forwarded_for:
-        origin = forwarded_for.split(",")[0].strip()
-
-    return IPResponse(origin=origin)
+    return IPResponse(origin=get_client_ip(request.scope))
 
 
 @router.get("/user-agent")
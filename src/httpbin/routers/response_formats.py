@@ -1,13 +1,21 @@
-from fastapi import APIRouter
-from fastapi.responses import HTMLResponse, JSONResponse, Response
+import json
+from functools import lru_cache
 
-router = APIRouter(tags=["Response Formats"])
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import HTMLResponse, Response
 
+from httpbin.compression import brotli, compress
+from httpbin.config import settings
+from httpbin.images import IMAGE_TYPES, IMAGES, negotiate_image, render_png
+from httpbin.responses import StaticPayload
+from httpbin.utils import get_request_data
 
-@router.get("/json")
-async def get_json():
-    """Returns a sample JSON response"""
-    return JSONResponse(
+router = APIRouter(tags=["Response Formats"])
+
+# The sample documents never change, so they are serialised, hashed and compressed
+# once at import time; each request only picks a prebuilt variant.
+JSON_PAYLOAD = StaticPayload(
+    json.dumps(
         {
             "slideshow": {
                 "author": "Yours Truly",
@@ -25,14 +33,15 @@ async def get_json():
                 ],
                 "title": "Sample Slide Show",
             }
-        }
-    )
-
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ),
+    "application/json",
+)
 
-@router.get("/html", response_class=HTMLResponse)
-async def get_html():
-    """Returns a simple HTML page"""
-    return """
+HTML_PAYLOAD = StaticPayload(
+    """
     <!DOCTYPE html>
     <html>
     <head>
@@ -62,13 +71,12 @@ async def get_html():
         </p>
     </body>
     </html>
-    """
-
+    """,
+    "text/html; charset=utf-8",
+)
 
-@router.get("/xml")
-async def get_xml():
-    """Returns a sample XML response"""
-    xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+XML_PAYLOAD = StaticPayload(
+    """<?xml version="1.0" encoding="UTF-8"?>
 <slideshow>
     <title>Sample Slide Show</title>
     <author>Yours Truly</author>
@@ -81,15 +89,132 @@ async def get_xml():
         <item>Why <em>WonderWidgets</em> are great</item>
         <item>Who <em>buys</em> WonderWidgets</item>
     </slide>
-</slideshow>"""
+</slideshow>""",
+    "application/xml",
+)
+
+ROBOTS_TXT_PAYLOAD = StaticPayload(
+    """User-agent: *
+Disallow: /deny
+""",
+    "text/plain; charset=utf-8",
+)
+
+# Only SVG is worth compressing; the raster formats are compressed already. /image
+# picks its format by Accept, so its variants say so in Vary.
+IMAGE_PAYLOADS = {
+    name: StaticPayload(IMAGES[name], media_type, compressible=name == "svg")
+    for name, media_type in IMAGE_TYPES.items()
+}
+NEGOTIATED_IMAGE_PAYLOADS = {
+    name: StaticPayload(IMAGES[name], media_type, vary=("Accept",), compressible=name == "svg")
+    for name, media_type in IMAGE_TYPES.items()
+}
+_NOT_ACCEPTABLE_DETAIL = f"Acceptable image types: {', '.join(IMAGE_TYPES.values())}"
+
+
+@lru_cache(maxsize=settings.IMAGE_CACHE_SIZE)
+def _sized_image(width: int, height: int) -> StaticPayload:
+    return StaticPayload(render_png(width, height), "image/png", compressible=False)
+
+
+@router.get("/json")
+async def get_json(request: Request):
+    """Returns a sample JSON response"""
+    return JSON_PAYLOAD.response(request)
+
+
+@router.get("/html", response_class=HTMLResponse)
+async def get_html(request: Request):
+    """Returns a simple HTML page"""
+    return HTML_PAYLOAD.response(request)
+
 
-    return Response(content=xml_content, media_type="application/xml")
+@router.get("/xml")
+async def get_xml(request: Request):
+    """Returns a sample XML response"""
+    return XML_PAYLOAD.response(request)
 
 
 @router.get("/robots.txt")
-async def get_robots_txt():
+async def get_robots_txt(request: Request):
     """Returns a robots.txt file"""
-    robots_content = """User-agent: *
-Disallow: /deny
-"""
-    return Response(content=robots_content, media_type="text/plain")
+    return ROBOTS_TXT_PAYLOAD.response(request)
+
+
+@router.get("/image")
+async def get_image(request: Request):
+    """Returns an image in the format the Accept header prefers (PNG, WebP, JPEG or SVG)"""
+    image = negotiate_image(request.headers.get("accept") or "*/*")
+    if image is None:
+        raise HTTPException(
+            status_code=406, detail=_NOT_ACCEPTABLE_DETAIL, headers={"Vary": "Accept"}
+        )
+    return NEGOTIATED_IMAGE_PAYLOADS[image].response(request)
+
+
+@router.get("/image/png")
+async def get_image_png(request: Request):
+    """Returns a PNG image"""
+    return IMAGE_PAYLOADS["png"].response(request)
+
+
+@router.get("/image/jpeg")
+async def get_image_jpeg(request: Request):
+    """Returns a JPEG image"""
+    return IMAGE_PAYLOADS["jpeg"].response(request)
+
+
+@router.get("/image/webp")
+async def get_image_webp(request: Request):
+    """Returns a WebP image"""
+    return IMAGE_PAYLOADS["webp"].response(request)
+
+
+@router.get("/image/svg")
+async def get_image_svg(request: Request):
+    """Returns an SVG image"""
+    return IMAGE_PAYLOADS["svg"].response(request)
+
+
+@router.get("/image/{width:int}x{height:int}")
+async def get_image_sized(width: int, height: int, request: Request):
+    """Returns a width x height checkerboard PNG"""
+    if not (1 <= width <= settings.MAX_IMAGE_SIZE and 1 <= height <= settings.MAX_IMAGE_SIZE):
+        raise HTTPException(
+            status_code=400,
+            detail=f"width and height must be between 1 and {settings.MAX_IMAGE_SIZE}",
+        )
+    return _sized_image(width, height).response(request)
+
+
+async def _compressed_request_data(request: Request, encoding: str, flag: str) -> Response:
+    """Echo the request data as JSON compressed with the given content-coding"""
+    data = await get_request_data(request)
+    data[flag] = True
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return Response(
+        content=compress(body, encoding),
+        media_type="application/json",
+        headers={"Content-Encoding": encoding},
+    )
+
+
+@router.get("/gzip")
+async def get_gzip(request: Request):
+    """Returns gzip-encoded request data"""
+    return await _compressed_request_data(request, "gzip", "gzipped")
+
+
+@router.get("/deflate")
+async def get_deflate(request: Request):
+    """Returns deflate-encoded request data"""
+    return await _compressed_request_data(request, "deflate", "deflated")
+
+
+@router.get("/brotli")
+async def get_brotli(request: Request):
+    """Returns brotli-encoded request data"""
+    if brotli is None:
+        raise HTTPException(status_code=501, detail="brotli support is not installed")
+    return await _compressed_request_data(request, "br", "brotli")
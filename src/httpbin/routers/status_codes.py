@@ -1,42 +1,140 @@
-from fastapi import APIRouter, Response, status
+import math
+import random
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
+from http import HTTPStatus
 
+from fastapi import APIRouter
+
+from httpbin.responses import PrebuiltResponse
 from httpbin.schemas import StatusResponse
 
 router = APIRouter(tags=["Status Codes"])
 
+# Statuses whose responses must not carry a body
+_NO_BODY_STATUS = frozenset({204, 304})
+
+# Parsed /status specs, keyed on the raw path segment
+_SPEC_CACHE_SIZE = 1024
+# Random generators of seeded requests, keyed on (spec, seed)
+_SEEDED_CACHE_SIZE = 1024
+_seeded: OrderedDict[tuple[str, int], random.Random] = OrderedDict()
+
+
+@lru_cache(maxsize=512)
+def _status_response(code: int, message: str | None = None) -> PrebuiltResponse:
+    """Build the response for one status code once; instances are shared between requests"""
+    if message is None:
+        try:
+            message = HTTPStatus(code).phrase
+        except ValueError:
+            message = "Unknown Status"
+    if code in _NO_BODY_STATUS or code < 200:
+        return PrebuiltResponse(status_code=code)
+    body = StatusResponse(code=code, message=message).model_dump_json().encode("utf-8")
+    return PrebuiltResponse(
+        body,
+        status_code=code,
+        raw_headers=[
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"content-type", b"application/json"),
+        ],
+    )
+
+
+def _alias_table(weights: list[float]) -> tuple[list[float], list[int]]:
+    """Build Vose's alias table so a weighted choice costs one random draw"""
+    n = len(weights)
+    total = sum(weights)
+    scaled = [weight * n / total for weight in weights]
+    probability = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        probability[less] = scaled[less]
+        alias[less] = more
+        scaled[more] -= 1.0 - scaled[less]
+        (small if scaled[more] < 1.0 else large).append(more)
+    return probability, alias
+
+
+class StatusMix:
+    """The responses a /status/{codes} spec chooses between, with their alias table"""
+
+    __slots__ = ("responses", "probability", "alias")
+
+    def __init__(self, responses: list[PrebuiltResponse], weights: list[float]) -> None:
+        self.responses = responses
+        self.probability, self.alias = _alias_table(weights)
+
+    def choose(self, random_float: Callable[[], float]) -> PrebuiltResponse:
+        if len(self.responses) == 1:
+            return self.responses[0]
+        draw = random_float() * len(self.responses)
+        index = int(draw)
+        if draw - index >= self.probability[index]:
+            index = self.alias[index]
+        return self.responses[index]
+
+
+def _invalid(message: str) -> StatusMix:
+    return StatusMix([_status_response(400, message)], [1.0])
+
+
+@lru_cache(maxsize=_SPEC_CACHE_SIZE)
+def parse_status_spec(codes: str) -> StatusMix:
+    """
+    Parse ``200``, ``200,404`` (uniform) or ``200:0.9,500:0.1`` (weighted).
+    Invalid specs resolve to a 400 response, so they are cached too.
+    """
+    responses = []
+    weights = []
+    for item in codes.split(","):
+        code, sep, weight = item.strip().partition(":")
+        try:
+            status_code = int(code)
+            probability = float(weight) if sep else 1.0
+        except ValueError:
+            return _invalid("Invalid status code")
+        if not (100 <= status_code < 600):
+            return _invalid("Status code out of range")
+        if not (probability >= 0 and math.isfinite(probability)):
+            return _invalid("Invalid weight")
+        responses.append(_status_response(status_code))
+        weights.append(probability)
+
+    if sum(weights) <= 0:
+        return _invalid("Invalid weight")
+    return StatusMix(responses, weights)
+
+
+def _seeded_random(codes: str, seed: int) -> Callable[[], float]:
+    """Return the generator for (codes, seed), so repeated requests replay one sequence"""
+    key = (codes, seed)
+    rng = _seeded.get(key)
+    if rng is None:
+        rng = _seeded[key] = random.Random(seed)
+        if len(_seeded) > _SEEDED_CACHE_SIZE:
+            _seeded.popitem(last=False)
+    else:
+        _seeded.move_to_end(key)
+    return rng.random
+
 
 @router.get("/status/{codes}")
 @router.post("/status/{codes}")
 @router.put("/status/{codes}")
 @router.patch("/status/{codes}")
 @router.delete("/status/{codes}")
-async def status_codes(codes: str, response: Response):
+async def status_codes(codes: str, seed: int | None = None):
     """
     Returns given HTTP Status code.
-    Supports multiple comma-separated status codes (returns first one).
+    Supports multiple comma-separated status codes, chosen at random, optionally
+    weighted as code:weight (e.g. 200:0.9,500:0.05,503:0.05). With a seed, each
+    worker replays the same sequence of codes for that spec.
     """
-    # Parse status codes (support comma-separated)
-    code_list = [c.strip() for c in codes.split(",")]
-
-    try:
-        status_code = int(code_list[0])
-    except ValueError:
-        status_code = 400
-        response.status_code = status_code
-        return StatusResponse(code=status_code, message="Invalid status code")
-
-    # Validate status code range
-    if not (100 <= status_code < 600):
-        status_code = 400
-        response.status_code = status_code
-        return StatusResponse(code=status_code, message="Status code out of range")
-
-    response.status_code = status_code
-
-    # Get status message
-    try:
-        message = status._status_code_to_phrase.get(status_code, "Unknown Status")
-    except Exception:
-        message = "Unknown Status"
-
-    return StatusResponse(code=status_code, message=message)
+    mix = parse_status_spec(codes)
+    return mix.choose(random.random if seed is None else _seeded_random(codes, seed))
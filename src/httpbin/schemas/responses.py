@@ -9,7 +9,7 @@ class RequestInfo(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
     args: dict[str, Any] = {}
-    data: str = ""
+    data: str | dict[str, Any] = ""
     files: dict[str, Any] = {}
     form: dict[str, Any] = {}
     headers: dict[str, str] = {}
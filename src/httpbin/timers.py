@@ -0,0 +1,125 @@
+"""Shared deadline scheduler for cheap, cancellable delays"""
+
+import asyncio
+import heapq
+import math
+import weakref
+
+from starlette.types import Receive
+
+# Deadlines are rounded up to this many seconds so that waiters due at the same
+# moment share a single heap entry and wake-up
+RESOLUTION = 0.001
+
+
+class DelayScheduler:
+    """
+    Wakes any number of pending delays from one timer per event loop.
+
+    Waiters are bare futures grouped by deadline tick: a tick costs one heap entry
+    and one list, and only the earliest tick holds a loop timer. Cancelled waiters
+    are left in place and skipped when their tick fires.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, resolution: float = RESOLUTION) -> None:
+        self.loop = loop
+        self.resolution = resolution
+        self.pending = 0
+        self.max_pending = 0
+        self._ticks: list[int] = []
+        self._waiters: dict[int, list[asyncio.Future[None]]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_tick: int | None = None
+
+    def schedule(self, delay: float) -> "asyncio.Future[None]":
+        """Return a future resolved once ``delay`` seconds have elapsed"""
+        return self.schedule_at(self.loop.time() + delay)
+
+    def schedule_at(self, deadline: float) -> "asyncio.Future[None]":
+        """Return a future resolved at ``deadline`` on the loop clock"""
+        future = self.loop.create_future()
+        tick = math.ceil(deadline / self.resolution)
+        waiters = self._waiters.get(tick)
+        if waiters is None:
+            waiters = self._waiters[tick] = []
+            heapq.heappush(self._ticks, tick)
+            if self._timer_tick is None or tick < self._timer_tick:
+                self._arm(tick)
+        waiters.append(future)
+        self.pending += 1
+        if self.pending > self.max_pending:
+            self.max_pending = self.pending
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future: "asyncio.Future[None]") -> None:
+        self.pending -= 1
+
+    def _arm(self, tick: int) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_tick = tick
+        self._timer = self.loop.call_at(tick * self.resolution, self._fire)
+
+    def _fire(self) -> None:
+        self._timer = self._timer_tick = None
+        now = self.loop.time()
+        ticks = self._ticks
+        while ticks and ticks[0] * self.resolution <= now:
+            for future in self._waiters.pop(heapq.heappop(ticks)):
+                if not future.done():
+                    future.set_result(None)
+        if ticks:
+            self._arm(ticks[0])
+
+
+_schedulers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, DelayScheduler]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_scheduler() -> DelayScheduler:
+    """Return the delay scheduler of the running event loop"""
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        scheduler = _schedulers[loop] = DelayScheduler(loop)
+    return scheduler
+
+
+def current_tick(interval: float) -> int:
+    """Number of the latest tick of a clock beating every ``interval`` seconds"""
+    return math.floor(asyncio.get_running_loop().time() / interval)
+
+
+async def wait_for_tick(tick: int, interval: float) -> None:
+    """
+    Wait for tick number ``tick`` of an ``interval`` clock. Ticks are aligned on the
+    loop clock, so every subscriber of an interval shares one scheduler entry per tick.
+    """
+    await get_scheduler().schedule_at(tick * interval)
+
+
+async def _cancel_on_disconnect(receive: Receive, future: "asyncio.Future[None]") -> None:
+    while (await receive())["type"] != "http.disconnect":
+        pass
+    future.cancel()
+
+
+async def sleep_unless_disconnected(delay: float, receive: Receive) -> bool:
+    """
+    Sleep for ``delay`` seconds on the shared scheduler, giving up early when the
+    client disconnects. Returns False when the client went away.
+    """
+    future = get_scheduler().schedule(delay)
+    watcher = asyncio.ensure_future(_cancel_on_disconnect(receive, future))
+    try:
+        await future
+    except asyncio.CancelledError:
+        if not watcher.done():
+            # Cancelled from outside rather than by a disconnect
+            raise
+        return False
+    finally:
+        watcher.cancel()
+    return True
@@ -1,7 +1,102 @@
 import base64
+import binascii
+import hashlib
+import json
+import re
+from contextlib import aclosing
+from functools import lru_cache
 from typing import Any
 
-from fastapi import Request, UploadFile
+from fastapi import HTTPException, Request
+from starlette.datastructures import FormData, UploadFile
+from starlette.formparsers import MultiPartParser
+from starlette.types import Message, Receive, Scope
+
+from httpbin.config import settings
+
+_FILE_READ_SIZE = 64 * 1024
+
+
+def _body_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413, detail=f"Request body exceeds {settings.MAX_BODY_BYTES} bytes"
+    )
+
+
+def _limited_receive(receive: Receive) -> Receive:
+    """Wrap receive so the request fails with 413 as soon as MAX_BODY_BYTES is crossed"""
+    received = 0
+
+    async def wrapper() -> Message:
+        nonlocal received
+        message = await receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > settings.MAX_BODY_BYTES:
+                raise _body_too_large()
+        return message
+
+    return wrapper
+
+
+async def _read_body(request: Request) -> tuple[bytes | None, dict[str, Any] | None]:
+    """
+    Stream the request body under MAX_BODY_BYTES.
+
+    Returns ``(body, None)`` for bodies up to BODY_DIGEST_THRESHOLD bytes, otherwise
+    ``(None, {"size": ..., "sha256": ...})`` without keeping the body in memory.
+    """
+    chunks: list[bytes] | None = []
+    hasher = None
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > settings.MAX_BODY_BYTES:
+            raise _body_too_large()
+        if hasher is not None:
+            hasher.update(chunk)
+            continue
+        chunks.append(chunk)
+        if size > settings.BODY_DIGEST_THRESHOLD:
+            hasher = hashlib.sha256()
+            for buffered in chunks:
+                hasher.update(buffered)
+            chunks = None
+
+    if hasher is not None:
+        return None, {"size": size, "sha256": hasher.hexdigest()}
+    return b"".join(chunks), None
+
+
+async def _read_form(request: Request, content_type: str) -> FormData:
+    """
+    Parse a form body under MAX_BODY_BYTES. Multipart bodies get their own parser, so
+    uploads larger than MULTIPART_SPOOL_MAX_SIZE roll over from memory to a temporary
+    file without changing Starlette's default for other apps.
+    """
+    limited = Request(request.scope, receive=_limited_receive(request.receive))
+    if "multipart/form-data" not in content_type:
+        return await limited.form()
+    async with aclosing(limited.stream()) as stream:
+        parser = MultiPartParser(limited.headers, stream)
+        parser.spool_max_size = settings.MULTIPART_SPOOL_MAX_SIZE
+        return await parser.parse()
+
+
+async def _describe_file(upload: UploadFile) -> dict[str, Any]:
+    """Summarize an uploaded file by size and digest, reading it in fixed-size chunks"""
+    hasher = hashlib.sha256()
+    size = 0
+    await upload.seek(0)
+    while chunk := await upload.read(_FILE_READ_SIZE):
+        size += len(chunk)
+        hasher.update(chunk)
+    return {
+        "filename": upload.filename,
+        "content_type": upload.content_type,
+        "size": size,
+        "sha256": hasher.hexdigest(),
+    }
 
 
 async def get_request_data(request: Request) -> dict[str, Any]:
@@ -10,8 +105,13 @@ async def get_request_data(request: Request) -> dict[str, Any]:
     # Get query parameters
     args = dict(request.query_params)
 
-    # Get headers
-    headers = dict(request.headers)
+    # Get headers in a single pass over the raw list (dict(request.headers) rescans the
+    # list for every key). Repeated headers keep their first value, as Headers does.
+    headers: dict[str, str] = {}
+    for key, value in request.headers.raw:
+        name = key.decode("latin-1")
+        if name not in headers:
+            headers[name] = value.decode("latin-1")
 
     # Get client IP
     origin = request.client.host if request.client else "unknown"
@@ -23,41 +123,49 @@ async def get_request_data(request: Request) -> dict[str, Any]:
     method = request.method
 
     # Initialize data containers
-    data = ""
+    data: str | dict[str, Any] = ""
     json_data = None
     form_data = {}
     files = {}
 
+    # Reject declared oversize bodies before reading anything
+    content_length = headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > settings.MAX_BODY_BYTES:
+        raise _body_too_large()
+
     # Try to parse body based on content type
     content_type = headers.get("content-type", "")
 
-    if "application/json" in content_type:
-        try:
-            json_data = await request.json()
-        except Exception:
-            pass
-    elif (
-        "application/x-www-form-urlencoded" in content_type or "multipart/form-data" in content_type
-    ):
+    if "application/x-www-form-urlencoded" in content_type or "multipart/form-data" in content_type:
         try:
-            form = await request.form()
-            for key, value in form.items():
-                if isinstance(value, UploadFile):
-                    files[key] = {
-                        "filename": value.filename,
-                        "content_type": value.content_type,
-                    }
-                else:
-                    form_data[key] = value
+            form = await _read_form(request, content_type)
+            try:
+                for key, value in form.items():
+                    if isinstance(value, UploadFile):
+                        files[key] = await _describe_file(value)
+                    else:
+                        form_data[key] = value
+            finally:
+                await form.close()
+        except HTTPException:
+            raise
         except Exception:
             pass
     else:
-        # Read raw body
-        try:
-            body_bytes = await request.body()
-            data = body_bytes.decode("utf-8") if body_bytes else ""
-        except Exception:
-            pass
+        body_bytes, digest = await _read_body(request)
+        if digest is not None:
+            # Too large to echo: report size and digest instead of content
+            data = digest
+        elif "application/json" in content_type:
+            try:
+                json_data = json.loads(body_bytes)
+            except Exception:
+                pass
+        else:
+            try:
+                data = body_bytes.decode("utf-8") if body_bytes else ""
+            except Exception:
+                pass
 
     return {
         "args": args,
@@ -72,19 +180,171 @@ async def get_request_data(request: Request) -> dict[str, Any]:
     }
 
 
+def get_client_ip(scope: Scope) -> str:
+    """Return the client address, preferring the first X-Forwarded-For entry"""
+    for name, value in scope["headers"]:
+        if name == b"x-forwarded-for":
+            forwarded_for = value.decode("latin-1")
+            if forwarded_for:
+                return forwarded_for.split(",")[0].strip()
+            break
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def parse_range_header(value: str, size: int) -> list[tuple[int, int]] | None:
+    """
+    Parse a ``Range: bytes=...`` header against a resource of ``size`` bytes.
+
+    Returns a list of inclusive ``(first, last)`` byte positions, an empty list when
+    no range is satisfiable, or None when the header is malformed and must be ignored.
+    """
+    unit, _, specs = value.partition("=")
+    if unit.strip().lower() != "bytes" or not specs.strip():
+        return None
+
+    ranges = []
+    for spec in specs.split(","):
+        first, sep, last = spec.strip().partition("-")
+        if not sep:
+            return None
+        try:
+            if first:
+                start = int(first)
+                end = int(last) if last else size - 1
+                if start < 0 or end < start:
+                    return None
+            else:
+                # Suffix range: the final N bytes
+                suffix = int(last)
+                if suffix < 0:
+                    return None
+                if suffix == 0:
+                    continue
+                start, end = max(size - suffix, 0), size - 1
+        except ValueError:
+            return None
+
+        if start < size:
+            ranges.append((start, min(end, size - 1)))
+
+    return ranges
+
+
+# One entity tag of an If-Match / If-None-Match list; bare tokens are accepted as tags
+_ENTITY_TAG = re.compile(r'(W/)?("[^"]*"|[^\s,]+)')
+
+
+@lru_cache(maxsize=1024)
+def parse_entity_tags(header: str) -> tuple[bool, frozenset[str], frozenset[str]]:
+    """
+    Parse an If-Match / If-None-Match list into (wildcard, all tags, strong tags),
+    with the ``W/`` prefix stripped and bare tokens quoted. Repeated header values
+    are parsed once.
+    """
+    wildcard = False
+    tags = set()
+    strong = set()
+    for weak, tag in _ENTITY_TAG.findall(header):
+        if tag == "*":
+            wildcard = True
+            continue
+        if not tag.startswith('"'):
+            tag = f'"{tag}"'
+        tags.add(tag)
+        if not weak:
+            strong.add(tag)
+    return wildcard, frozenset(tags), frozenset(strong)
+
+
+def etag_matches(header: str, etags: tuple[str, ...] | str, strong: bool = False) -> bool:
+    """
+    Check an If-None-Match / If-Match header value against one or more strong entity
+    tags. Uses the weak comparison function, so ``W/"x"`` matches ``"x"``, unless
+    ``strong`` is set (as If-Match requires).
+    """
+    wildcard, tags, strong_tags = parse_entity_tags(header)
+    if wildcard:
+        return True
+    candidates = strong_tags if strong else tags
+    if isinstance(etags, str):
+        return etags in candidates
+    return not candidates.isdisjoint(etags)
+
+
 def decode_base64(value: str) -> str:
-    """Decode base64 string"""
-    try:
-        decoded_bytes = base64.b64decode(value)
-        return decoded_bytes.decode("utf-8")
-    except Exception as e:
-        return f"Error decoding base64: {str(e)}"
+    """Decode a base64 string to UTF-8 text; raises ValueError for invalid input"""
+    return base64.b64decode(value, validate=True).decode("utf-8")
 
 
 def encode_base64(value: str) -> str:
     """Encode string to base64"""
-    try:
-        encoded_bytes = base64.b64encode(value.encode("utf-8"))
-        return encoded_bytes.decode("utf-8")
-    except Exception as e:
-        return f"Error encoding base64: {str(e)}"
+    return base64.b64encode(value.encode("utf-8")).decode("ascii")
+
+
+# Map the URL-safe alphabet onto the standard one, and the standard-only characters
+# onto one that strict decoding rejects
+_URLSAFE_DECODE = bytes.maketrans(b"-_+/", b"+/**")
+_URLSAFE_ENCODE = bytes.maketrans(b"+/", b"-_")
+_WHITESPACE = b" \t\r\n"
+
+
+class Base64StreamEncoder:
+    """Base64-encode a byte stream chunk by chunk, carrying partial 3-byte groups"""
+
+    def __init__(self, urlsafe: bool = False) -> None:
+        self.table = _URLSAFE_ENCODE if urlsafe else None
+        self.pending = b""
+
+    def feed(self, chunk: bytes) -> bytes:
+        data = self.pending + chunk
+        usable = len(data) - len(data) % 3
+        self.pending = data[usable:]
+        return self._encode(data[:usable])
+
+    def finish(self) -> bytes:
+        data, self.pending = self.pending, b""
+        return self._encode(data)
+
+    def _encode(self, data: bytes) -> bytes:
+        if not data:
+            return b""
+        encoded = binascii.b2a_base64(data, newline=False)
+        return encoded.translate(self.table) if self.table else encoded
+
+
+class Base64StreamDecoder:
+    """
+    Decode a base64 stream chunk by chunk, carrying partial 4-character groups.
+
+    Whitespace is ignored and final padding is optional; any other character
+    outside the alphabet, or data after padding, raises ValueError.
+    """
+
+    def __init__(self, urlsafe: bool = False) -> None:
+        self.table = _URLSAFE_DECODE if urlsafe else None
+        self.pending = b""
+        self.padded = False
+
+    def feed(self, chunk: bytes) -> bytes:
+        data = self.pending + chunk.translate(self.table, _WHITESPACE)
+        usable = len(data) - len(data) % 4
+        self.pending = data[usable:]
+        return self._decode(data[:usable])
+
+    def finish(self) -> bytes:
+        data, self.pending = self.pending, b""
+        if len(data) % 4 == 1:
+            raise ValueError("Truncated base64 input")
+        return self._decode(data + b"=" * (-len(data) % 4))
+
+    def _decode(self, data: bytes) -> bytes:
+        if not data:
+            return b""
+        if self.padded:
+            raise ValueError("Data after base64 padding")
+        self.padded = data.endswith(b"=")
+        try:
+            return binascii.a2b_base64(data, strict_mode=True)
+        except binascii.Error as e:
+            raise ValueError(f"Invalid base64 input: {e}") from None
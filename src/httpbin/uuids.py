@@ -0,0 +1,60 @@
+"""Bulk UUID generation: random (v4) and time-ordered (v7) identifiers"""
+
+import os
+import time
+
+_VARIANT = "89ab"
+_RAND_B_MASK = (1 << 62) - 1
+_COUNTER_MAX = 0xFFF
+
+
+def _format(hex32: str) -> str:
+    return f"{hex32[:8]}-{hex32[8:12]}-{hex32[12:16]}-{hex32[16:20]}-{hex32[20:]}"
+
+
+def uuid4_batch(count: int) -> list[str]:
+    """Generate ``count`` version 4 UUIDs from a single os.urandom read"""
+    digits = os.urandom(16 * count).hex()
+    uuids = []
+    for start in range(0, 32 * count, 32):
+        h = digits[start : start + 32]
+        # Force the version nibble to 4 and the variant bits to 10
+        variant = _VARIANT[int(h[16], 16) & 3]
+        uuids.append(f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{variant}{h[17:20]}-{h[20:]}")
+    return uuids
+
+
+class UUID7Clock:
+    """
+    Issue time-ordered version 7 UUIDs (RFC 9562).
+
+    The 12-bit ``rand_a`` field holds a counter that increases within a millisecond,
+    so identifiers from one worker are strictly increasing. When the counter runs
+    out, the timestamp is advanced by a millisecond rather than going backwards.
+    """
+
+    def __init__(self) -> None:
+        self.last_ms = 0
+        self.counter = 0
+
+    def batch(self, count: int) -> list[str]:
+        """Generate ``count`` increasing version 7 UUIDs from a single os.urandom read"""
+        random_bits = os.urandom(8 * count)
+        ms = max(time.time_ns() // 1_000_000, self.last_ms)
+        counter = self.counter + 1 if ms == self.last_ms else 0
+        uuids = []
+        for start in range(0, 8 * count, 8):
+            if counter > _COUNTER_MAX:
+                ms += 1
+                counter = 0
+            rand_b = int.from_bytes(random_bits[start : start + 8]) & _RAND_B_MASK
+            value = (ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | rand_b
+            uuids.append(_format(f"{value:032x}"))
+            counter += 1
+        self.last_ms = ms
+        self.counter = counter - 1
+        return uuids
+
+
+# One clock per worker process
+uuid7_clock = UUID7Clock()
@@ -0,0 +1,139 @@
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from httpbin.accesslog import AccessLogWriter
+from httpbin.config import settings
+from httpbin.main import create_app, parse_args, server_options
+
+
+def _record(path: str = "/get") -> tuple:
+    return (0.0, "GET", path, b"", "/get", 200, 0.0012, 0, 10, "127.0.0.1")
+
+
+class TestAccessLogWriter:
+    """Test the bounded, batched access log writer"""
+
+    def test_writes_json_lines(self, tmp_path):
+        """Test records are encoded as one JSON object per line"""
+        log = tmp_path / "access.log"
+        writer = AccessLogWriter(str(log))
+        writer.append((1767225600.25, "POST", "/post", b"a=1", "/post", 201, 0.0045, 3, 40, "::1"))
+        writer.close()
+        assert json.loads(log.read_text()) == {
+            "time": "2026-01-01T00:00:00.250Z",
+            "method": "POST",
+            "path": "/post?a=1",
+            "route": "/post",
+            "status": 201,
+            "duration_ms": 4.5,
+            "request_bytes": 3,
+            "response_bytes": 40,
+            "client": "::1",
+        }
+
+    def test_overflow_dropped_and_counted(self, tmp_path):
+        """Test a full queue drops new records and reports how many"""
+        log = tmp_path / "access.log"
+        writer = AccessLogWriter(str(log), max_size=3, flush_interval=60)
+        for i in range(5):
+            writer.append(_record(f"/{i}"))
+        assert len(writer) == 3
+        assert writer.dropped == 2
+        writer.close()
+        lines = [json.loads(line) for line in log.read_text().splitlines()]
+        assert [line.get("path") for line in lines[:3]] == ["/0", "/1", "/2"]
+        assert lines[3] == {"dropped": 2}
+
+    def test_background_flush(self, tmp_path):
+        """Test the thread writes a full batch without waiting for the interval"""
+        log = tmp_path / "access.log"
+        writer = AccessLogWriter(str(log), flush_interval=60, batch_size=2)
+        writer.append(_record())
+        writer.append(_record())
+        deadline = time.monotonic() + 5
+        while not log.read_text() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(log.read_text().splitlines()) == 2
+        writer.close()
+
+
+class TestAccessLogMiddleware:
+    """Test the structured access log middleware"""
+
+    @pytest.fixture
+    def logged(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "ACCESS_LOG_FORMAT", "json")
+        monkeypatch.setattr(settings, "ACCESS_LOG_FILE", str(tmp_path / "access.log"))
+        app = create_app()
+        client = TestClient(app)
+
+        def lines():
+            app.state.access_log.flush()
+            text = (tmp_path / "access.log").read_text()
+            return [json.loads(line) for line in text.splitlines()]
+
+        return client, lines
+
+    def test_logs_requests(self, logged):
+        """Test each request is logged with its route, sizes and client"""
+        client, lines = logged
+        client.post("/post?y=1", content=b"hello")
+        (entry,) = lines()
+        assert entry["method"] == "POST"
+        assert entry["path"] == "/post?y=1"
+        assert entry["route"] == "/post"
+        assert entry["status"] == 200
+        assert entry["request_bytes"] == 5
+        assert entry["response_bytes"] > 0
+        assert entry["duration_ms"] >= 0
+        assert entry["client"] == "testclient"
+
+    def test_fast_lane_and_unmatched(self, logged):
+        """Test fast-laned requests keep their route and unknown paths have none"""
+        client, lines = logged
+        client.get("/status/418", headers={"X-Forwarded-For": "203.0.113.9"})
+        client.get("/no/such/path")
+        fast, unmatched = lines()
+        assert (fast["route"], fast["status"], fast["client"]) == (
+            "/status/{codes}",
+            418,
+            "203.0.113.9",
+        )
+        assert (unmatched["route"], unmatched["status"]) == (None, 404)
+
+    def test_logs_preflight(self, logged):
+        """Test CORS preflights, answered before routing, are logged without a route"""
+        client, lines = logged
+        client.options(
+            "/get",
+            headers={"Origin": "https://example.com", "Access-Control-Request-Method": "GET"},
+        )
+        (entry,) = lines()
+        assert (entry["method"], entry["route"], entry["status"]) == ("OPTIONS", None, 200)
+
+    def test_sampling(self, monkeypatch, logged):
+        """Test a zero sample rate logs nothing"""
+        monkeypatch.setattr(settings, "ACCESS_LOG_SAMPLE_RATE", 0.0)
+        app = create_app()
+        for _ in range(20):
+            TestClient(app).get("/get")
+        assert len(app.state.access_log) == 0
+
+    def test_replaces_uvicorn_access_log(self, monkeypatch):
+        """Test uvicorn's access log is turned off when the JSON one is on"""
+        assert server_options(parse_args([]))["access_log"] is True
+        monkeypatch.setattr(settings, "ACCESS_LOG_FORMAT", "json")
+        assert server_options(parse_args([]))["access_log"] is False
+
+    def test_off_by_default(self, client):
+        """Test the default app has no JSON access log"""
+        assert not hasattr(client.app.state, "access_log")
+
+    def test_unknown_format(self, monkeypatch):
+        """Test an unknown format fails at startup"""
+        monkeypatch.setattr(settings, "ACCESS_LOG_FORMAT", "xml")
+        with pytest.raises(ValueError, match="access log format"):
+            create_app()
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+from starlette.routing import Match
+
+from benchmarks import bench
+from httpbin.routers import ROUTER_MODULES, load_router
+
+
+def _result(endpoint: str, rps: float, p99_ms: float, concurrency: int = 1) -> dict:
+    return {
+        "endpoint": endpoint,
+        "mode": "asgi",
+        "concurrency": concurrency,
+        "payload_size": 0,
+        "requests": 100,
+        "errors": 0,
+        "rps": rps,
+        "p50_ms": p99_ms / 2,
+        "p99_ms": p99_ms,
+        "p999_ms": p99_ms * 2,
+    }
+
+
+def _write(path, *results: dict):
+    path.write_text(json.dumps({"meta": {}, "results": list(results)}))
+    return path
+
+
+class TestBench:
+    """Test the load benchmark suite's statistics and regression check"""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles, including the edges"""
+        values = [float(i) for i in range(1, 1001)]
+        assert bench.percentile(values, 0.50) == 500.0
+        assert bench.percentile(values, 0.99) == 990.0
+        assert bench.percentile(values, 0.999) == 999.0
+        assert bench.percentile(values, 1.0) == 1000.0
+        assert bench.percentile(values, 0.0) == 1.0
+        assert bench.percentile([7.0], 0.99) == 7.0
+        assert bench.percentile([], 0.5) == 0.0
+
+    def test_compare(self, tmp_path, capsys):
+        """Test cells past the threshold on req/s or p99 count as regressions"""
+        baseline = _write(
+            tmp_path / "baseline.json",
+            _result("/get", 1000.0, 1.0),
+            _result("/ip", 1000.0, 1.0),
+            _result("/uuid", 1000.0, 1.0),
+            _result("/json", 0.0, 0.0),
+            _result("/html", 1000.0, 1.0),
+        )
+        current = _write(
+            tmp_path / "current.json",
+            _result("/get", 950.0, 1.05),  # within 10%
+            _result("/ip", 800.0, 1.0),  # throughput down 20%
+            _result("/uuid", 1000.0, 1.5),  # p99 up 50%
+            _result("/json", 500.0, 1.0),  # no baseline to compare against
+        )
+        assert bench.compare(baseline, current, threshold=10.0) == 2
+        output = capsys.readouterr().out
+        assert output.count("REGRESSION") == 2
+        assert "1 baseline cell(s) not present in the current run" in output
+        assert "2 regression(s) beyond 10.0%" in output
+
+        assert bench.compare(baseline, current, threshold=60.0) == 0
+
+    def test_compare_exit_status(self, tmp_path):
+        """Test the compare command fails only when something regressed"""
+        baseline = _write(tmp_path / "baseline.json", _result("/get", 1000.0, 1.0))
+        slower = _write(tmp_path / "slower.json", _result("/get", 500.0, 1.0))
+        assert bench.main(["compare", str(baseline), str(baseline)]) == 0
+        assert bench.main(["compare", str(baseline), str(slower)]) == 1
+
+    @pytest.mark.parametrize("name", ROUTER_MODULES)
+    def test_every_router_covered(self, name):
+        """Test each router has at least one scenario hitting one of its routes"""
+        routes = load_router(name).routes
+        for scenario in bench.SCENARIOS:
+            path = scenario.url(0).partition("?")[0]
+            scope = {"type": "http", "path": path, "method": scenario.method}
+            if any(route.matches(scope)[0] == Match.FULL for route in routes):
+                return
+        pytest.fail(f"No benchmark scenario for the {name} router")
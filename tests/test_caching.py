@@ -0,0 +1,123 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from httpbin.config import settings
+from httpbin.main import create_app
+from httpbin.routers.caching import CACHE_ETAG, CACHE_LAST_MODIFIED, conditional_etag_response
+from httpbin.utils import etag_matches, parse_entity_tags
+
+
+class TestCache:
+    """Test the /cache endpoints"""
+
+    def test_cache(self, client):
+        """Test /cache returns the request data with validators"""
+        response = client.get("/cache")
+        assert response.status_code == 200
+        assert response.headers["etag"] == CACHE_ETAG
+        assert response.headers["last-modified"] == CACHE_LAST_MODIFIED
+        assert response.json()["url"].endswith("/cache")
+
+    @pytest.mark.parametrize(
+        "headers",
+        [
+            {"If-None-Match": CACHE_ETAG},
+            {"If-None-Match": '"other"'},
+            {"If-Modified-Since": CACHE_LAST_MODIFIED},
+        ],
+    )
+    def test_cache_not_modified(self, client, headers):
+        """Test any conditional header gets an empty 304 with the validators"""
+        response = client.get("/cache", headers=headers)
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == CACHE_ETAG
+        assert response.headers["last-modified"] == CACHE_LAST_MODIFIED
+
+    def test_cache_max_age(self, client):
+        """Test /cache/{n} sets Cache-Control max-age"""
+        response = client.get("/cache/60")
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == "public, max-age=60"
+        assert "etag" not in response.headers
+
+    def test_cache_max_age_negative(self, client):
+        """Test a negative max-age is rejected"""
+        assert client.get("/cache/-1").status_code == 400
+
+
+class TestETag:
+    """Test the /etag/{etag} endpoint"""
+
+    def test_etag(self, client):
+        """Test the given ETag is returned with the request data"""
+        response = client.get("/etag/abc")
+        assert response.status_code == 200
+        assert response.headers["etag"] == '"abc"'
+        assert response.json()["url"].endswith("/etag/abc")
+
+    @pytest.mark.parametrize(
+        ("headers", "status"),
+        [
+            ({"If-None-Match": '"abc"'}, 304),
+            ({"If-None-Match": 'W/"abc"'}, 304),
+            ({"If-None-Match": '"x", "abc"'}, 304),
+            ({"If-None-Match": "*"}, 304),
+            ({"If-None-Match": "abc"}, 304),
+            ({"If-None-Match": '"x", "y"'}, 200),
+            ({"If-Match": '"abc"'}, 200),
+            ({"If-Match": '"x","abc"'}, 200),
+            ({"If-Match": "*"}, 200),
+            ({"If-Match": '"x"'}, 412),
+            ({"If-Match": 'W/"abc"'}, 412),
+            ({"If-Match": '"x"', "If-None-Match": '"abc"'}, 412),
+            ({"If-Match": '"abc"', "If-None-Match": '"abc"'}, 304),
+        ],
+    )
+    def test_conditional(self, client, headers, status):
+        """Test If-Match and If-None-Match list semantics"""
+        response = client.get("/etag/abc", headers=headers)
+        assert response.status_code == status
+        assert response.headers["etag"] == '"abc"'
+        if status != 200:
+            assert response.content == b""
+
+    @pytest.mark.parametrize("fast_lane", [True, False])
+    @pytest.mark.parametrize("etag", ["%E2%82%AC", "a%22b", "a%20b"])
+    def test_invalid_etag(self, monkeypatch, etag, fast_lane):
+        """Test ETags that can't go in a header are rejected, with or without the fast lane"""
+        monkeypatch.setattr(settings, "FAST_LANE_ENABLED", fast_lane)
+        client = TestClient(create_app())
+        for headers in ({}, {"If-None-Match": '"x"'}, {"If-Match": '"x"'}):
+            response = client.get(f"/etag/{etag}", headers=headers)
+            assert response.status_code == 400
+            assert "etag" not in response.headers
+            assert "printable ASCII" in response.json()["detail"]
+
+    def test_conditional_responses_are_prebuilt(self):
+        """Test repeated conditional requests reuse one response object"""
+        first = conditional_etag_response("abc", None, '"abc"')
+        assert first is conditional_etag_response("abc", None, '"abc"')
+        assert conditional_etag_response("abc", '"x"', None).status_code == 412
+
+
+class TestEntityTagParsing:
+    """Test If-Match / If-None-Match list parsing"""
+
+    def test_parse(self):
+        """Test tags with commas inside quotes, weak tags and wildcards"""
+        wildcard, tags, strong = parse_entity_tags('"a,b", W/"c" ,d')
+        assert not wildcard
+        assert tags == {'"a,b"', '"c"', '"d"'}
+        assert strong == {'"a,b"', '"d"'}
+        assert parse_entity_tags(" * ")[0]
+
+    def test_parse_cached(self):
+        """Test repeated header values are parsed once"""
+        assert parse_entity_tags('"a", "b"') is parse_entity_tags('"a", "b"')
+
+    def test_strong_comparison(self):
+        """Test weak tags only match with the weak comparison function"""
+        assert etag_matches('W/"a"', '"a"')
+        assert not etag_matches('W/"a"', '"a"', strong=True)
+        assert etag_matches('"b", "a"', ('"c"', '"a"'), strong=True)
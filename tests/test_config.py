@@ -0,0 +1,35 @@
+import pytest
+
+from httpbin.config import Settings
+
+
+class TestSettings:
+    """Test environment overrides of Settings"""
+
+    def test_defaults(self, monkeypatch):
+        """Test class defaults apply without environment variables"""
+        monkeypatch.delenv("HTTPBIN_PORT", raising=False)
+        assert Settings().PORT == 8000
+
+    def test_env_overrides(self, monkeypatch):
+        """Test HTTPBIN_* variables are converted to the annotated types"""
+        monkeypatch.setenv("HTTPBIN_PORT", "9000")
+        monkeypatch.setenv("HTTPBIN_REUSE_PORT", "yes")
+        monkeypatch.setenv("HTTPBIN_METRICS_FLUSH_INTERVAL", "2.5")
+        monkeypatch.setenv("HTTPBIN_CORS_ORIGINS", "https://a.example, https://b.example")
+        monkeypatch.setenv("HTTPBIN_WORKERS", "16")
+        monkeypatch.setenv("HTTPBIN_LIMIT_CONCURRENCY", "none")
+
+        settings = Settings()
+        assert settings.PORT == 9000
+        assert settings.REUSE_PORT is True
+        assert settings.METRICS_FLUSH_INTERVAL == 2.5
+        assert settings.CORS_ORIGINS == ["https://a.example", "https://b.example"]
+        assert settings.WORKERS == 16
+        assert settings.LIMIT_CONCURRENCY is None
+
+    def test_invalid_boolean(self, monkeypatch):
+        """Test unparseable booleans are rejected"""
+        monkeypatch.setenv("HTTPBIN_RELOAD", "maybe")
+        with pytest.raises(ValueError):
+            Settings()
@@ -1,4 +1,17 @@
+import asyncio
+import base64
+import json
+import random
 import time
+import uuid
+
+import pytest
+
+from httpbin.config import settings
+from httpbin.main import create_app
+from httpbin.routers import dynamic
+from httpbin.timers import get_scheduler
+from httpbin.utils import Base64StreamDecoder
 
 
 class TestDynamic:
@@ -24,11 +37,154 @@ class TestDynamic:
         assert data["delay"] == 10  # Should be capped at max
         assert data["requested"] == 15
 
+    def test_drip(self, client):
+        """Test /drip spreads numbytes asterisks over the duration"""
+        start = time.perf_counter()
+        response = client.get("/drip?numbytes=5&duration=0.25&delay=0&code=201")
+        elapsed = time.perf_counter() - start
+        assert response.status_code == 201
+        assert response.content == b"*****"
+        assert response.headers["content-length"] == "5"
+        assert response.headers["content-type"] == "application/octet-stream"
+        # The last byte is due after four fifths of the duration
+        assert 0.2 <= elapsed < 1
+
+    def test_drip_rate(self, client):
+        """Test rate= paces the body at that many bytes per second"""
+        start = time.perf_counter()
+        response = client.get("/drip?numbytes=30000&rate=100000&delay=0")
+        elapsed = time.perf_counter() - start
+        assert len(response.content) == 30000
+        assert 0.29 <= elapsed < 1
+
+    def test_drip_delay(self, client):
+        """Test the initial delay comes before the response"""
+        start = time.perf_counter()
+        response = client.get("/drip?numbytes=1&duration=0&delay=0.2")
+        assert response.content == b"*"
+        assert time.perf_counter() - start >= 0.2
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "numbytes=0",
+            "duration=-1",
+            "duration=1&rate=10",
+            "rate=0",
+            "rate=1&numbytes=100000",
+            "delay=11",
+            "code=204",
+            "code=99",
+        ],
+    )
+    def test_drip_invalid(self, client, query):
+        """Test invalid /drip parameters are rejected"""
+        assert client.get(f"/drip?{query}").status_code == 400
+
+    def test_drip_disconnect(self):
+        """Test a throttled stream stops as soon as the client disconnects"""
+
+        async def scenario():
+            received = []
+
+            async def receive():
+                if not received:
+                    received.append(b"")
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                await asyncio.sleep(0.1)
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                received.append(message.get("body", b""))
+
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0", "spec_version": "2.3"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": "/drip",
+                "raw_path": b"/drip",
+                "query_string": b"numbytes=1000&duration=10&delay=0",
+                "root_path": "",
+                "headers": [],
+                "client": ("127.0.0.1", 1),
+                "server": ("test", 80),
+            }
+            await create_app()(scope, receive, send)
+            return b"".join(received), get_scheduler().pending
+
+        start = time.perf_counter()
+        body, pending = asyncio.run(scenario())
+        assert time.perf_counter() - start < 1
+        assert 0 < len(body) < 100
+        assert pending == 0
+
+    def test_limit(self, client):
+        """Test /limit applies the given rate per client"""
+        headers = {"X-Forwarded-For": "198.51.100.20"}
+        first = client.get("/limit/2/m", headers=headers)
+        assert first.status_code == 200
+        assert first.json() == {"limit": 2, "remaining": 1, "reset": 30}
+        assert first.headers["ratelimit-remaining"] == "1"
+        assert client.get("/limit/2/m", headers=headers).status_code == 200
+        limited = client.get("/limit/2/m", headers=headers)
+        assert limited.status_code == 429
+        assert limited.headers["retry-after"] == "30"
+        # Other rates and clients have their own buckets
+        assert client.get("/limit/3/m", headers=headers).status_code == 200
+        assert client.get("/limit/2/m").status_code == 200
+
+    def test_limit_invalid(self, client):
+        """Test invalid rates are rejected"""
+        assert client.get("/limit/fast").status_code == 400
+
     def test_delay_negative(self, client):
         """Test delay with negative value"""
         response = client.get("/delay/-1")
         assert response.status_code == 400
 
+    def test_delay_fractional(self, client):
+        """Test sub-second delays"""
+        start = time.perf_counter()
+        response = client.get("/delay/0.25")
+        elapsed = time.perf_counter() - start
+        assert response.status_code == 200
+        assert response.json()["delay"] == 0.25
+        assert 0.25 <= elapsed < 1.5
+
+    def test_delay_jitter(self, client):
+        """Test jittered delays stay within the requested spread"""
+        for _ in range(5):
+            data = client.get("/delay/0.1?jitter=0.05").json()
+            assert 0.05 <= data["delay"] <= 0.15
+            assert data["jitter"] == 0.05
+        assert client.get("/delay/0.1?jitter=-1").status_code == 400
+
+    @pytest.mark.parametrize(
+        "url",
+        ["/delay/inf", "/delay/-inf", "/delay/nan", "/delay/1?jitter=inf", "/delay/1?jitter=nan"],
+    )
+    def test_delay_not_finite(self, client, url):
+        """Test infinite and NaN delays or jitter are rejected up front"""
+        response = client.get(url)
+        assert response.status_code == 400
+        assert "finite" in response.json()["detail"]
+
+    def test_delay_zero(self, client, monkeypatch):
+        """Test a zero delay responds without waiting for the scheduler"""
+        waits = []
+
+        async def sleep(seconds, receive):
+            waits.append(seconds)
+            return True
+
+        monkeypatch.setattr(dynamic, "sleep_unless_disconnected", sleep)
+        assert client.get("/delay/0").json()["delay"] == 0
+        assert waits == []
+        assert client.get("/delay/0.01").status_code == 200
+        assert waits == [0.01]
+
     def test_uuid(self, client):
         """Test UUID generation"""
         response = client.get("/uuid")
@@ -62,6 +218,89 @@ class TestDynamic:
         response = client.post("/base64/encode", json={})
         assert response.status_code == 400
 
+    def test_base64_decode_invalid(self, client):
+        """Test invalid base64 is rejected with 400"""
+        assert client.get("/base64/not*base64").status_code == 400
+
+    def test_base64_stream_roundtrip(self, client):
+        """Test binary bodies survive streaming encode then decode"""
+        body = random.Random(3).randbytes(300_001)
+        for urlsafe in ("false", "true"):
+            encoded = client.post(f"/base64/stream/encode?urlsafe={urlsafe}", content=body)
+            assert encoded.status_code == 200
+            expected = (
+                base64.urlsafe_b64encode(body) if urlsafe == "true" else base64.b64encode(body)
+            )
+            assert encoded.content == expected
+
+            decoded = client.post(
+                f"/base64/stream/decode?urlsafe={urlsafe}", content=encoded.content
+            )
+            assert decoded.headers["content-type"] == "application/octet-stream"
+            assert decoded.content == body
+
+    def test_base64_stream_decode_lenient(self, client):
+        """Test whitespace and missing final padding are accepted"""
+        response = client.post("/base64/stream/decode?urlsafe=true", content=b"SGVs\nbG8_-w")
+        assert response.content == base64.urlsafe_b64decode("SGVsbG8_-w==")
+
+    def test_base64_stream_decoder_chunking(self):
+        """Test decoding is independent of chunk boundaries"""
+        encoded = base64.b64encode(bytes(range(256)) * 10)
+        for size in (1, 3, 7, 64):
+            decoder = Base64StreamDecoder()
+            chunks = [encoded[i : i + size] for i in range(0, len(encoded), size)]
+            decoded = b"".join(decoder.feed(chunk) for chunk in chunks) + decoder.finish()
+            assert decoded == bytes(range(256)) * 10
+
+        decoder = Base64StreamDecoder()
+        decoder.feed(b"SA=")
+        with pytest.raises(ValueError):
+            decoder.feed(b"=SGVs")
+
+    @pytest.mark.parametrize(
+        ("body", "urlsafe"),
+        [
+            (b"not*base64", "false"),
+            (b"SGVsbG8+", "true"),
+            (b"SGVsb", "false"),
+            (b"SA==SGVs", "false"),
+        ],
+    )
+    def test_base64_stream_decode_invalid(self, client, body, urlsafe):
+        """Test malformed input gets a 400"""
+        response = client.post(f"/base64/stream/decode?urlsafe={urlsafe}", content=body)
+        assert response.status_code == 400
+
+    def test_uuid_count(self, client):
+        """Test several UUIDs in one JSON response"""
+        response = client.get("/uuid?count=50")
+        assert response.status_code == 200
+        ids = response.json()["uuids"]
+        assert len(set(ids)) == 50
+        assert all(uuid.UUID(value).version == 4 for value in ids)
+
+    def test_uuid_version7(self, client):
+        """Test time-ordered UUIDs"""
+        ids = client.get("/uuid?version=7&count=100").json()["uuids"]
+        assert ids == sorted(ids)
+        assert uuid.UUID(client.get("/uuid?version=7").json()["uuid"]).version == 7
+
+    def test_uuid_ndjson(self, client):
+        """Test streaming UUIDs as NDJSON"""
+        response = client.get(f"/uuid?count={settings.MAX_UUID_COUNT + 5}&format=ndjson")
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.text.splitlines()
+        assert len(lines) == settings.MAX_UUID_COUNT + 5
+        assert uuid.UUID(json.loads(lines[-1])["uuid"]).version == 4
+
+    def test_uuid_limits(self, client):
+        """Test invalid counts, versions and formats"""
+        assert client.get("/uuid?count=0").status_code == 400
+        assert client.get(f"/uuid?count={settings.MAX_UUID_COUNT + 1}").status_code == 400
+        assert client.get("/uuid?version=5").status_code == 400
+        assert client.get("/uuid?format=xml").status_code == 400
+
     def test_random_bytes(self, client):
         """Test random bytes generation"""
         n = 100
@@ -75,5 +314,184 @@ class TestDynamic:
         response = client.get("/bytes/0")
         assert response.status_code == 400
 
-        response = client.get("/bytes/200000")  # Too large
+        response = client.get(f"/bytes/{settings.MAX_BYTES_SIZE + 1}")  # Too large
+        assert response.status_code == 400
+
+        response = client.get("/bytes/10?seed=1&secure=true")
+        assert response.status_code == 400
+
+    def test_random_bytes_seed(self, client):
+        """Test seeded bytes are reproducible, including chunked responses"""
+        n = 600_000
+        first = client.get(f"/bytes/{n}?seed=7")
+        assert first.headers["content-length"] == str(n)
+        assert first.content == random.Random(7).randbytes(n)
+        assert client.get("/bytes/100?seed=7").content == random.Random(7).randbytes(100)
+        assert client.get("/bytes/100?seed=8").content != random.Random(7).randbytes(100)
+
+    def test_random_bytes_large(self, client):
+        """Test large pool-backed and secure responses have the requested length"""
+        response = client.get("/bytes/1000000")
+        assert response.headers["content-length"] == "1000000"
+        assert len(response.content) == 1_000_000
+        assert len(set(response.content)) == 256
+
+        response = client.get("/bytes/300000?secure=true")
+        assert len(response.content) == 300_000
+
+    def test_stream(self, client):
+        """Test NDJSON streaming"""
+        response = client.get("/stream/3?foo=bar")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["id"] for line in lines] == [0, 1, 2]
+        assert all(line["args"] == {"foo": "bar"} for line in lines)
+        assert all(line["method"] == "GET" for line in lines)
+
+    def test_stream_limits(self, client):
+        """Test streaming with invalid line count"""
+        response = client.get("/stream/0")
+        assert response.status_code == 400
+
+    def test_payload(self, client):
+        """Test /payload returns items records nested depth levels deep"""
+        response = client.get("/payload?items=3&depth=4")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        records = response.json()["items"]
+        assert [record["id"] for record in records] == [0, 1, 2]
+        node, levels = records[0], 0
+        while "child" in node:
+            node, levels = node["child"], levels + 1
+        assert levels == 4
+        assert len(client.get("/payload").json()["items"]) == 10
+
+    @pytest.mark.parametrize("fmt", ["json", "array", "ndjson"])
+    @pytest.mark.parametrize("size", [None, 1000, 65_537, 300_001])
+    def test_payload_exact_size(self, client, fmt, size):
+        """Test sized payloads are exactly size bytes of valid JSON in every format"""
+        query = f"format={fmt}&depth=3" + (f"&size={size}" if size else "&items=2000")
+        response = client.get(f"/payload?{query}")
+        assert response.status_code == 200
+        if size:
+            assert response.headers["content-length"] == str(size)
+            assert len(response.content) == size
+        if fmt == "ndjson":
+            assert response.headers["content-type"] == "application/x-ndjson"
+            records = [json.loads(line) for line in response.text.splitlines()]
+        else:
+            document = response.json()
+            records = document["items"] if fmt == "json" else document
+        assert [record["id"] for record in records] == list(range(len(records)))
+
+    def test_payload_seed(self, client):
+        """Test payloads are deterministic per seed"""
+        first = client.get("/payload?size=5000&seed=7")
+        second = client.get("/payload?size=5000&seed=7")
+        other = client.get("/payload?size=5000&seed=8")
+        assert first.content == second.content
+        assert first.content != other.content
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "format=xml",
+            "depth=-1",
+            "depth=257",
+            "items=0",
+            "size=10",
+            "size=1000&items=5",
+            f"size={settings.MAX_PAYLOAD_SIZE + 1}",
+        ],
+    )
+    def test_payload_invalid(self, client, query):
+        """Test invalid payload parameters are rejected"""
+        assert client.get(f"/payload?{query}").status_code == 400
+
+    def test_stream_bytes(self, client):
+        """Test chunked random byte streaming"""
+        response = client.get("/stream-bytes/25000?chunk_size=1000")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/octet-stream"
+        assert len(response.content) == 25000
+
+    def test_stream_bytes_seed(self, client):
+        """Test seeded byte streams are reproducible"""
+        first = client.get("/stream-bytes/5000?seed=42")
+        second = client.get("/stream-bytes/5000?seed=42")
+        other = client.get("/stream-bytes/5000?seed=43")
+        assert first.content == second.content
+        assert first.content != other.content
+
+    def test_stream_bytes_limits(self, client):
+        """Test byte streaming with invalid sizes"""
+        assert client.get("/stream-bytes/0").status_code == 400
+        assert client.get("/stream-bytes/10?chunk_size=0").status_code == 400
+
+    def test_range_full(self, client):
+        """Test range endpoint without a Range header"""
+        response = client.get("/range/30")
+        assert response.status_code == 200
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["etag"] == '"range30"'
+        assert response.content == b"abcdefghijklmnopqrstuvwxyzabcd"
+
+    def test_range_single(self, client):
+        """Test single byte range"""
+        response = client.get("/range/100", headers={"Range": "bytes=25-29"})
+        assert response.status_code == 206
+        assert response.headers["content-range"] == "bytes 25-29/100"
+        assert response.content == b"zabcd"
+
+    def test_range_suffix(self, client):
+        """Test suffix and open-ended byte ranges"""
+        response = client.get("/range/52", headers={"Range": "bytes=-3"})
+        assert response.status_code == 206
+        assert response.content == b"xyz"
+
+        response = client.get("/range/52", headers={"Range": "bytes=50-"})
+        assert response.headers["content-range"] == "bytes 50-51/52"
+        assert response.content == b"yz"
+
+    def test_range_large_offset(self, client):
+        """Test slicing far into a large virtual file"""
+        offset = 10**12 - 10
+        response = client.get(f"/range/{10**12}", headers={"Range": f"bytes={offset}-{offset + 4}"})
+        assert response.status_code == 206
+        expected = bytes(97 + (offset + i) % 26 for i in range(5))
+        assert response.content == expected
+
+    def test_range_multipart(self, client):
+        """Test multiple byte ranges"""
+        response = client.get("/range/100", headers={"Range": "bytes=0-1,26-27"})
+        assert response.status_code == 206
+        content_type = response.headers["content-type"]
+        assert content_type.startswith("multipart/byteranges; boundary=")
+        boundary = content_type.split("boundary=")[1]
+        assert int(response.headers["content-length"]) == len(response.content)
+        body = response.content.decode("ascii")
+        assert "Content-Range: bytes 0-1/100\r\n\r\nab\r\n" in body
+        assert "Content-Range: bytes 26-27/100\r\n\r\nab\r\n" in body
+        assert body.endswith(f"--{boundary}--\r\n")
+
+    def test_range_not_satisfiable(self, client):
+        """Test unsatisfiable byte range"""
+        response = client.get("/range/10", headers={"Range": "bytes=10-20"})
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */10"
+
+    def test_range_if_range(self, client):
+        """Test If-Range with matching and stale validators"""
+        headers = {"Range": "bytes=0-1", "If-Range": '"range10"'}
+        assert client.get("/range/10", headers=headers).status_code == 206
+
+        headers["If-Range"] = '"stale"'
+        response = client.get("/range/10", headers=headers)
+        assert response.status_code == 200
+        assert len(response.content) == 10
+
+    def test_range_limits(self, client):
+        """Test range endpoint with invalid size"""
+        response = client.get("/range/0")
         assert response.status_code == 400
@@ -0,0 +1,188 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from httpbin.config import settings
+from httpbin.faults import FaultSpec, parse_duration, parse_fault_spec
+from httpbin.main import create_app
+from httpbin.middleware import FaultInjectionMiddleware
+
+
+class TestFaultSpec:
+    """Test fault spec parsing"""
+
+    @pytest.mark.parametrize(
+        ("value", "seconds"),
+        [("250ms", 0.25), ("1.5s", 1.5), ("800us", 0.0008), ("2", 2.0), (" 10 MS ", 0.01)],
+    )
+    def test_parse_duration(self, value, seconds):
+        """Test durations with and without units"""
+        assert parse_duration(value) == pytest.approx(seconds)
+
+    @pytest.mark.parametrize(
+        ("spec", "low", "high"),
+        [
+            ("latency=200ms", 0.2, 0.2),
+            ("latency=fixed:5ms", 0.005, 0.005),
+            ("latency=uniform:30ms,10ms", 0.01, 0.03),
+            ("latency=normal:50ms,0ms", 0.05, 0.05),
+            ("latency=pareto:10ms,3", 0.01, float("inf")),
+            ("latency=p99:100ms", 0.0, float("inf")),
+        ],
+    )
+    def test_latency_distributions(self, spec, low, high):
+        """Test each latency distribution samples within its support"""
+        fault = parse_fault_spec(spec)
+        assert isinstance(fault, FaultSpec)
+        samples = [fault.latency() for _ in range(1000)]
+        assert all(low - 1e-12 <= sample <= high + 1e-12 for sample in samples)
+
+    def test_percentile_latency(self):
+        """Test pNN places the NN-th percentile at the given duration"""
+        fault = parse_fault_spec("latency=p90:100ms")
+        samples = sorted(fault.latency() for _ in range(20000))
+        assert samples[18000] == pytest.approx(0.1, rel=0.1)
+
+    def test_parse_all(self):
+        """Test every fault in one spec"""
+        fault = parse_fault_spec("latency=1ms; error=0.5:503; reset=0.1; ttfb=2ms; trickle=64/10ms")
+        assert fault.error_rate == 0.5
+        assert fault.error_response.status_code == 503
+        assert fault.reset_rate == 0.1
+        assert fault.ttfb == 0.002
+        assert (fault.trickle_size, fault.trickle_interval) == (64, 0.01)
+
+    def test_cached(self):
+        """Test repeated specs are parsed once"""
+        assert parse_fault_spec("error=0.1") is parse_fault_spec("error=0.1")
+
+    @pytest.mark.parametrize(
+        "spec",
+        [
+            "bogus",
+            "latency=fast",
+            "latency=uniform:10ms",
+            "latency=p100:1s",
+            "error=2",
+            "error=0.1:200",
+            "trickle=0/1s",
+            "shake=1",
+        ],
+    )
+    def test_invalid(self, spec):
+        """Test invalid specs resolve to a 400 response"""
+        assert parse_fault_spec(spec).status_code == 400
+
+
+class TestFaultInjectionMiddleware:
+    """Test fault injection into any endpoint"""
+
+    @pytest.fixture
+    def faulty(self, monkeypatch):
+        monkeypatch.setattr(settings, "FAULT_INJECTION_ENABLED", True)
+        return TestClient(create_app())
+
+    def test_no_fault(self, faulty):
+        """Test requests without a fault are untouched"""
+        response = faulty.get("/status/200")
+        assert response.status_code == 200
+        assert response.json() == {"code": 200, "message": "OK"}
+
+    def test_latency(self, faulty):
+        """Test latency is added before the request is handled"""
+        start = time.perf_counter()
+        response = faulty.get("/get", headers={"X-Httpbin-Fault": "latency=100ms"})
+        assert response.status_code == 200
+        assert time.perf_counter() - start >= 0.1
+
+    def test_latency_capped(self, monkeypatch):
+        """Test waits are capped at MAX_DELAY_SECONDS"""
+        monkeypatch.setattr(settings, "MAX_DELAY_SECONDS", 0)
+        monkeypatch.setattr(settings, "FAULT_INJECTION_ENABLED", True)
+        faulty = TestClient(create_app())
+        start = time.perf_counter()
+        faulty.get("/get", headers={"X-Httpbin-Fault": "latency=10s"})
+        assert time.perf_counter() - start < 1
+
+    def test_error(self, faulty):
+        """Test an error probability of 1 always fails, fast-laned endpoints included"""
+        response = faulty.get("/status/200", headers={"X-Httpbin-Fault": "error=1:503"})
+        assert response.status_code == 503
+        assert response.json() == {"detail": "Injected fault"}
+
+    def test_error_cors_headers(self, faulty):
+        """Test injected errors carry CORS headers, so browser clients can read them"""
+        headers = {"X-Httpbin-Fault": "error=1:503", "Origin": "https://example.com"}
+        response = faulty.get("/get", headers=headers)
+        assert response.status_code == 503
+        assert response.headers["access-control-allow-origin"] == "https://example.com"
+
+    def test_query_parameter(self, faulty):
+        """Test faults can be requested with ?fault="""
+        assert faulty.get("/get?fault=error%3D1").status_code == 500
+        assert faulty.get("/get?nofault=error%3D1").status_code == 200
+
+    def test_invalid(self, faulty):
+        """Test an invalid spec gets a 400 naming the problem"""
+        response = faulty.get("/get", headers={"X-Httpbin-Fault": "latency=soon"})
+        assert response.status_code == 400
+        assert "Invalid duration" in response.json()["detail"]
+
+    def test_ttfb_and_trickle(self, faulty):
+        """Test a slow first byte and a trickled body keep the content intact"""
+        start = time.perf_counter()
+        response = faulty.get("/bytes/100?seed=1", headers={"X-Httpbin-Fault": "ttfb=50ms"})
+        expected = response.content
+        assert time.perf_counter() - start >= 0.05
+
+        start = time.perf_counter()
+        response = faulty.get("/bytes/100?seed=1", headers={"X-Httpbin-Fault": "trickle=25/20ms"})
+        assert response.content == expected
+        assert time.perf_counter() - start >= 0.06
+
+    def test_trickle_capped(self, monkeypatch):
+        """Test a trickle stops waiting after MAX_DRIP_DURATION and sends the rest"""
+        monkeypatch.setattr(settings, "MAX_DRIP_DURATION", 0.05)
+        monkeypatch.setattr(settings, "FAULT_INJECTION_ENABLED", True)
+        faulty = TestClient(create_app())
+        expected = faulty.get("/bytes/100?seed=1").content
+        start = time.perf_counter()
+        # Uncapped, this would take 99 intervals of 1s
+        response = faulty.get("/bytes/100?seed=1", headers={"X-Httpbin-Fault": "trickle=1/1s"})
+        assert response.content == expected
+        assert 0.05 <= time.perf_counter() - start < 1
+
+    def test_disabled_by_default(self, client):
+        """Test fault headers are ignored unless enabled"""
+        assert client.get("/get", headers={"X-Httpbin-Fault": "error=1"}).status_code == 200
+
+
+class TestConnectionReset:
+    """Test mid-body connection resets at the ASGI level"""
+
+    def test_reset(self):
+        """Test half the body is sent and the response is left unfinished"""
+
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"x" * 100})
+
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http",
+            "path": "/",
+            "query_string": b"",
+            "headers": [(b"x-httpbin-fault", b"reset=1")],
+        }
+        asyncio.run(FaultInjectionMiddleware(app, max_delay=1, max_trickle=1)(scope, receive, send))
+        assert len(messages) == 2
+        assert messages[1] == {"type": "http.response.body", "body": b"x" * 50, "more_body": True}
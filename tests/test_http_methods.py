@@ -1,3 +1,12 @@
+import hashlib
+
+from starlette.formparsers import MultiPartParser
+
+from httpbin import responses, utils
+from httpbin.config import settings
+from httpbin.schemas import RequestInfo
+
+
 class TestHTTPMethods:
     """Test HTTP method endpoints"""
 
@@ -55,3 +64,98 @@ class TestHTTPMethods:
         data = response.json()
         assert data["method"] == "DELETE"
         assert "headers" in data
+
+    def test_response_shape(self, client):
+        """Test the fast path keeps the RequestInfo shape and the json alias"""
+        response = client.post("/post?a=1", json={"nested": {"list": [1, 2]}})
+        data = response.json()
+        assert list(data) == [
+            "args",
+            "data",
+            "files",
+            "form",
+            "headers",
+            "json",
+            "method",
+            "origin",
+            "url",
+        ]
+        assert RequestInfo.model_validate(data).json_data == {"nested": {"list": [1, 2]}}
+
+    def test_large_integer_json(self, client):
+        """Test JSON values beyond 64-bit integers still serialize"""
+        response = client.post("/post", json={"big": 2**70})
+        assert response.status_code == 200
+        assert response.json()["json"] == {"big": 2**70}
+
+    def test_non_finite_json(self, client, monkeypatch):
+        """Test NaN and infinities echo as null on the stdlib backend too"""
+        monkeypatch.setattr(responses, "_backend_dumps", responses._stdlib_dumps)
+        response = client.post(
+            "/post",
+            content=b'{"a": NaN, "b": [Infinity, 1.5], "c": {"d": -Infinity}}',
+            headers={"Content-Type": "application/json"},
+        )
+        assert response.status_code == 200
+        assert response.json()["json"] == {"a": None, "b": [None, 1.5], "c": {"d": None}}
+
+    def test_repeated_headers_keep_first_value(self, client):
+        """Test repeated request headers echo their first value"""
+        response = client.get("/get", headers=[("X-Dup", "first"), ("X-Dup", "second")])
+        assert response.json()["headers"]["x-dup"] == "first"
+
+    def test_post_file_digest(self, client):
+        """Test uploaded files are reported by size and sha256"""
+        content = b"file content" * 100
+        response = client.post("/post", files={"upload": ("data.bin", content)})
+        assert response.status_code == 200
+        upload = response.json()["files"]["upload"]
+        assert upload["filename"] == "data.bin"
+        assert upload["size"] == len(content)
+        assert upload["sha256"] == hashlib.sha256(content).hexdigest()
+
+    def test_upload_spooled_to_disk(self, client, monkeypatch):
+        """Test uploads above MULTIPART_SPOOL_MAX_SIZE roll over to a temporary file"""
+        monkeypatch.setattr(settings, "MULTIPART_SPOOL_MAX_SIZE", 100)
+        rolled = {}
+        describe_file = utils._describe_file
+
+        async def spy(upload):
+            rolled[upload.filename] = upload.file._rolled
+            return await describe_file(upload)
+
+        monkeypatch.setattr(utils, "_describe_file", spy)
+        files = {"small": ("small.bin", b"x" * 50), "large": ("large.bin", b"x" * 500)}
+        assert client.post("/post", files=files).status_code == 200
+        assert rolled == {"small.bin": False, "large.bin": True}
+        # Starlette's own default is left alone
+        assert MultiPartParser.spool_max_size == 1024 * 1024
+
+    def test_body_too_large_declared(self, client, monkeypatch):
+        """Test bodies with an oversize Content-Length are rejected up front"""
+        monkeypatch.setattr(settings, "MAX_BODY_BYTES", 100)
+        response = client.post("/post", content=b"x" * 101)
+        assert response.status_code == 413
+
+    def test_body_too_large_streamed(self, client, monkeypatch):
+        """Test chunked bodies are rejected once the limit is crossed"""
+        monkeypatch.setattr(settings, "MAX_BODY_BYTES", 100)
+        response = client.post("/post", content=iter([b"x" * 60, b"x" * 60]))
+        assert response.status_code == 413
+
+    def test_form_too_large_streamed(self, client, monkeypatch):
+        """Test multipart bodies are rejected once the limit is crossed"""
+        monkeypatch.setattr(settings, "MAX_BODY_BYTES", 1000)
+        response = client.post("/post", files={"upload": ("big.bin", b"x" * 5000)})
+        assert response.status_code == 413
+
+    def test_large_body_digest(self, client, monkeypatch):
+        """Test bodies above the digest threshold are echoed as size and sha256"""
+        monkeypatch.setattr(settings, "BODY_DIGEST_THRESHOLD", 100)
+        body = b"y" * 1000
+        response = client.put("/put", content=iter([body[:500], body[500:]]))
+        assert response.status_code == 200
+        assert response.json()["data"] == {
+            "size": 1000,
+            "sha256": hashlib.sha256(body).hexdigest(),
+        }
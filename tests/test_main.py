@@ -0,0 +1,101 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from httpbin.config import settings
+from httpbin.main import create_app, main, parse_args, server_options
+from httpbin.routers import load_router
+
+
+class TestCommandLine:
+    """Test the httpbin command line options"""
+
+    def test_production_defaults(self, monkeypatch):
+        """Test the default launch uses one worker per CPU and no reload"""
+        monkeypatch.setattr("httpbin.main._cpu_count", lambda: 16)
+        options = server_options(parse_args([]))
+        assert options["workers"] == 16
+        assert "reload" not in options
+        assert options["host"] == "0.0.0.0"
+        assert options["port"] == 8000
+
+    def test_server_flags(self):
+        """Test server tuning flags are passed through to uvicorn"""
+        args = parse_args(
+            [
+                "--workers=4",
+                "--loop=uvloop",
+                "--http=httptools",
+                "--backlog=4096",
+                "--timeout-keep-alive=30",
+                "--limit-concurrency=1000",
+                "--no-access-log",
+            ]
+        )
+        options = server_options(args)
+        assert options["workers"] == 4
+        assert options["loop"] == "uvloop"
+        assert options["http"] == "httptools"
+        assert options["backlog"] == 4096
+        assert options["timeout_keep_alive"] == 30
+        assert options["limit_concurrency"] == 1000
+        assert options["access_log"] is False
+
+    def test_dev_mode(self):
+        """Test development mode reloads with a single worker"""
+        options = server_options(parse_args(["--dev"]))
+        assert options["reload"] is True
+        assert "workers" not in options
+
+
+class TestAppFactory:
+    """Test the app factory's startup options"""
+
+    def test_disabled_routers_not_imported(self):
+        """Test only enabled routers are imported and mounted"""
+        code = (
+            "import sys; from fastapi.testclient import TestClient; import httpbin.main as m; "
+            "c = TestClient(m.app); "
+            "assert c.get('/status/200').status_code == 200; "
+            "assert c.get('/get').status_code == 404; "
+            "assert c.get('/docs').status_code == 404; "
+            "assert 'httpbin.routers.dynamic' not in sys.modules; "
+            "assert 'httpbin.routers.http_methods' not in sys.modules"
+        )
+        env = {
+            **os.environ,
+            "HTTPBIN_ENABLED_ROUTERS": "status_codes",
+            "HTTPBIN_DOCS_ENABLED": "false",
+        }
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+    def test_unknown_router(self):
+        """Test an unknown router name is rejected"""
+        with pytest.raises(ValueError):
+            load_router("nope")
+
+    def test_docs_disabled(self, monkeypatch):
+        """Test /docs, /redoc and the root redirect can be turned off"""
+        monkeypatch.setattr(settings, "DOCS_ENABLED", False)
+        client = TestClient(create_app())
+        assert client.get("/docs").status_code == 404
+        assert client.get("/redoc").status_code == 404
+        assert client.get("/", follow_redirects=False).status_code == 404
+        assert client.get("/openapi.json").status_code == 200
+
+    def test_openapi_from_file(self, tmp_path, monkeypatch):
+        """Test an exported schema is served as is"""
+        path = tmp_path / "openapi.json"
+        main(["--export-openapi", str(path)])
+        schema = json.loads(path.read_text())
+        assert "/status/{codes}" in schema["paths"]
+
+        schema["info"]["title"] = "from file"
+        path.write_text(json.dumps(schema))
+        monkeypatch.setattr(settings, "OPENAPI_FILE", str(path))
+        response = TestClient(create_app()).get("/openapi.json")
+        assert response.json()["info"]["title"] == "from file"
@@ -0,0 +1,129 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from httpbin.config import settings
+from httpbin.main import create_app
+from httpbin.metrics import PENDING_ROUTE, MetricsRegistry
+
+
+class TestMetrics:
+    """Test the /metrics endpoint and metrics middleware"""
+
+    @pytest.fixture(autouse=True)
+    def enabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+
+    def test_metrics_format(self):
+        """Test metrics are exposed in the Prometheus text format"""
+        client = TestClient(create_app())
+        client.get("/get")
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE httpbin_requests_total counter" in response.text
+        assert "# TYPE httpbin_request_duration_seconds histogram" in response.text
+
+    def test_route_templates(self):
+        """Test requests are labelled by route template, not concrete URL"""
+        client = TestClient(create_app())
+        client.get("/status/200")
+        client.get("/status/404")
+        client.get("/status/404")
+        client.get("/no-such-path")
+        text = client.get("/metrics").text
+        assert 'httpbin_requests_total{route="/status/{codes}",method="GET",status="200"} 1' in text
+        assert 'httpbin_requests_total{route="/status/{codes}",method="GET",status="404"} 2' in text
+        assert 'httpbin_requests_total{route="<unmatched>",method="GET",status="404"} 1' in text
+        assert "/status/200" not in text
+
+    def test_histogram_and_bytes(self):
+        """Test latency histogram and response byte counters"""
+        client = TestClient(create_app())
+        body = client.get("/robots.txt").content
+        text = client.get("/metrics").text
+        labels = 'route="/robots.txt",method="GET"'
+        assert f'httpbin_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+        assert f"httpbin_request_duration_seconds_count{{{labels}}} 1" in text
+        assert f"httpbin_response_bytes_total{{{labels}}} {len(body)}" in text
+        assert f"httpbin_requests_in_flight{{{labels}}} 0" in text
+
+    def test_in_flight_new_path(self):
+        """Test a slow request on a path not seen before is counted in flight under its route"""
+        app = create_app()
+        registry = app.state.metrics
+        route = registry.stats("GET", "/delay/{seconds}")
+        pending = registry.stats("GET", PENDING_ROUTE)
+
+        async def scenario():
+            finished = asyncio.Event()
+            requested = False
+
+            async def receive():
+                nonlocal requested
+                if not requested:
+                    requested = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                await finished.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                pass
+
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": "/delay/0.2",
+                "raw_path": b"/delay/0.2",
+                "query_string": b"",
+                "root_path": "",
+                "headers": [(b"host", b"testserver")],
+                "client": ("127.0.0.1", 50000),
+                "server": ("testserver", 80),
+            }
+            request = asyncio.create_task(app(scope, receive, send))
+            await asyncio.sleep(0.05)
+            during = (route.in_flight, pending.in_flight)
+            await request
+            finished.set()
+            return during
+
+        assert asyncio.run(scenario()) == (1, 0)
+        assert (route.in_flight, pending.in_flight) == (0, 0)
+        assert sum(route.statuses.values()) == 1
+
+    def test_off_by_default(self, client):
+        """Test the default app has no /metrics"""
+        assert not hasattr(client.app.state, "metrics")
+        assert client.get("/metrics").status_code == 404
+
+    def test_disabled(self, monkeypatch):
+        """Test /metrics is absent when metrics are disabled"""
+        monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+        client = TestClient(create_app())
+        assert client.get("/metrics").status_code == 404
+
+    def test_multiprocess_aggregation(self, tmp_path):
+        """Test snapshots from several workers are merged"""
+        registry = MetricsRegistry(multiprocess_dir=str(tmp_path))
+        registry.stats("GET", "/get").observe(200, 0.001, 100)
+
+        # A snapshot left behind by another (exited) worker
+        other = MetricsRegistry()
+        stats = other.stats("GET", "/get")
+        stats.observe(200, 0.002, 50)
+        stats.in_flight = 3
+        snapshot = other.snapshot()
+        snapshot["pid"] = 2**22 + 12345
+        (tmp_path / "metrics-other.json").write_text(json.dumps(snapshot))
+
+        text = registry.render()
+        assert 'httpbin_requests_total{route="/get",method="GET",status="200"} 2' in text
+        assert 'httpbin_response_bytes_total{route="/get",method="GET"} 150' in text
+        # Gauges of exited workers are dropped
+        assert 'httpbin_requests_in_flight{route="/get",method="GET"} 0' in text
@@ -0,0 +1,253 @@
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from httpbin.config import settings
+from httpbin.main import create_app
+from httpbin.middleware import CompressionMiddleware, FastLaneMiddleware
+from httpbin.utils import etag_matches
+
+
+def _raw_get(client, url, **kwargs):
+    """Fetch a response without letting httpx decode the body"""
+    with client.stream("GET", url, **kwargs) as response:
+        return response, b"".join(response.iter_raw())
+
+
+class TestCompressionMiddleware:
+    """Test the response compression middleware"""
+
+    @pytest.fixture
+    def compressed_client(self):
+        app = FastAPI()
+        app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+        @app.get("/text")
+        async def text():
+            return PlainTextResponse("x" * 1000)
+
+        @app.get("/small")
+        async def small():
+            return PlainTextResponse("tiny")
+
+        @app.get("/tagged")
+        async def tagged(request: Request):
+            if etag_matches(request.headers.get("if-none-match", ""), '"v1"'):
+                return Response(status_code=304, headers={"ETag": '"v1"'})
+            return PlainTextResponse("x" * 1000, headers={"ETag": '"v1"'})
+
+        @app.get("/stream")
+        async def stream():
+            async def chunks():
+                for i in range(5):
+                    yield f"chunk {i} ".encode() * 50
+
+            return StreamingResponse(chunks(), media_type="text/plain")
+
+        return TestClient(app)
+
+    def test_compresses_complete_body(self, compressed_client):
+        """Test a single-message body is compressed with a content-length"""
+        response, raw = _raw_get(compressed_client, "/text", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) == len(raw)
+        assert gzip.decompress(raw) == b"x" * 1000
+
+    def test_skips_small_body(self, compressed_client):
+        """Test bodies below the minimum size are untouched"""
+        response, raw = _raw_get(compressed_client, "/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert raw == b"tiny"
+
+    def test_identity(self, compressed_client):
+        """Test responses are untouched without an acceptable coding"""
+        response, raw = _raw_get(
+            compressed_client, "/text", headers={"Accept-Encoding": "identity"}
+        )
+        assert "content-encoding" not in response.headers
+        assert raw == b"x" * 1000
+
+    def test_compresses_stream_incrementally(self, compressed_client):
+        """Test streamed bodies are compressed chunk by chunk"""
+        response, raw = _raw_get(
+            compressed_client, "/stream", headers={"Accept-Encoding": "deflate"}
+        )
+        assert response.headers["content-encoding"] == "deflate"
+        assert "content-length" not in response.headers
+        expected = b"".join(f"chunk {i} ".encode() * 50 for i in range(5))
+        assert zlib.decompress(raw) == expected
+
+    def test_encoded_etag(self, compressed_client):
+        """Test an encoded response gets its own strong ETag, and revalidates by either form"""
+        gzipped = {"Accept-Encoding": "gzip"}
+        response, _ = _raw_get(compressed_client, "/tagged", headers=gzipped)
+        assert response.headers["etag"] == '"v1-gzip"'
+        identity, _ = _raw_get(compressed_client, "/tagged", headers={"Accept-Encoding": ""})
+        assert identity.headers["etag"] == '"v1"'
+
+        response = compressed_client.get(
+            "/tagged", headers={**gzipped, "If-None-Match": '"v1-gzip"'}
+        )
+        assert (response.status_code, response.headers["etag"]) == (304, '"v1-gzip"')
+        response = compressed_client.get("/tagged", headers={**gzipped, "If-None-Match": '"v1"'})
+        assert (response.status_code, response.headers["etag"]) == (304, '"v1"')
+        # The tag of another encoding does not validate this one
+        response = compressed_client.get(
+            "/tagged", headers={"Accept-Encoding": "deflate", "If-None-Match": '"v1-gzip"'}
+        )
+        assert response.status_code == 200
+
+    def test_cache_reuses_identical_bodies(self):
+        """Test compressed output is cached for byte-identical bodies"""
+        middleware = CompressionMiddleware(app=None, cache_size=2)
+        first = middleware._compress(b"y" * 1000, "gzip")
+        assert middleware._compress(b"y" * 1000, "gzip") is first
+        middleware._compress(b"a" * 1000, "gzip")
+        middleware._compress(b"b" * 1000, "gzip")
+        assert len(middleware._cache) == 2
+
+    def test_skips_already_encoded(self, monkeypatch):
+        """Test endpoints that set their own encoding are passed through"""
+        monkeypatch.setattr(settings, "COMPRESSION_ENABLED", True)
+        client = TestClient(create_app())
+        response, raw = _raw_get(client, "/deflate", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "deflate"
+        assert zlib.decompress(raw)
+
+    @pytest.mark.parametrize(("path", "encoded"), [("/image/png", False), ("/image/svg", True)])
+    def test_skips_compressed_media(self, monkeypatch, path, encoded):
+        """Test raster images are not compressed again, while SVG still is"""
+        monkeypatch.setattr(settings, "COMPRESSION_ENABLED", True)
+        client = TestClient(create_app())
+        identity, expected = _raw_get(client, path, headers={"Accept-Encoding": "identity"})
+        response, raw = _raw_get(client, path, headers={"Accept-Encoding": "gzip"})
+        assert ("content-encoding" in response.headers) is encoded
+        assert (gzip.decompress(raw) if encoded else raw) == expected
+
+    def test_enabled_in_app(self, monkeypatch):
+        """Test the middleware is installed when enabled in settings"""
+        monkeypatch.setattr(settings, "COMPRESSION_ENABLED", True)
+        monkeypatch.setattr(settings, "COMPRESSION_MINIMUM_SIZE", 10)
+        client = TestClient(create_app())
+        response, raw = _raw_get(client, "/get", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert b'"method":"GET"' in gzip.decompress(raw)
+
+
+class TestFastLaneMiddleware:
+    """Test the raw ASGI fast lane for probe endpoints"""
+
+    @pytest.fixture
+    def clients(self, monkeypatch):
+        monkeypatch.setattr(settings, "FAST_LANE_ENABLED", True)
+        fast = TestClient(create_app())
+        monkeypatch.setattr(settings, "FAST_LANE_ENABLED", False)
+        routed = TestClient(create_app())
+        return fast, routed
+
+    @pytest.mark.parametrize(
+        ("method", "path", "headers"),
+        [
+            ("GET", "/status/200", {}),
+            ("POST", "/status/418", {}),
+            ("DELETE", "/status/204", {}),
+            ("GET", "/status/abc", {}),
+            ("GET", "/status/999", {}),
+            ("GET", "/ip", {}),
+            ("GET", "/ip", {"X-Forwarded-For": " 203.0.113.7 , 10.0.0.1"}),
+            ("GET", "/ip", {"X-Forwarded-For": 'a"b\\c\x7fé'.encode("latin-1")}),
+            ("GET", "/user-agent", {"User-Agent": 'probe/1.0 "quoted" \\ \t é'.encode("latin-1")}),
+            ("GET", "/robots.txt", {"Accept-Encoding": "gzip"}),
+            ("GET", "/status/200", {"Origin": "https://example.com"}),
+            ("GET", "/ip", {"Origin": "https://example.com"}),
+            ("GET", "/cache", {"If-None-Match": '"x"'}),
+            ("GET", "/cache", {"If-Modified-Since": "Thu, 01 Jan 2026 00:00:00 GMT"}),
+            ("GET", "/etag/abc", {"If-None-Match": 'W/"abc", "d"'}),
+            ("GET", "/etag/abc", {"If-Match": '"x"'}),
+            ("GET", "/redirect/3", {}),
+            ("GET", "/relative-redirect/1", {}),
+            ("GET", "/absolute-redirect/2", {}),
+            ("GET", "/absolute-redirect/2", {"Host": "example.com:8080"}),
+            ("GET", "/redirect/0", {}),
+            ("GET", "/redirect/11", {}),
+        ],
+    )
+    def test_identical_responses(self, clients, method, path, headers):
+        """Test fast-laned responses match the routed app byte for byte"""
+        fast, routed = clients
+        expected = routed.request(method, path, headers=headers, follow_redirects=False)
+        actual = fast.request(method, path, headers=headers, follow_redirects=False)
+        assert actual.status_code == expected.status_code
+        assert actual.headers.raw == expected.headers.raw
+        assert actual.content == expected.content
+
+    def test_uuid_shape(self, clients):
+        """Test /uuid matches the routed response apart from the random value"""
+        fast, routed = clients
+        actual, expected = fast.get("/uuid"), routed.get("/uuid")
+        assert actual.headers.raw == expected.headers.raw
+        assert actual.content.startswith(b'{"uuid":"') and len(actual.content) == 47
+
+    def test_bypasses_app(self):
+        """Test known requests are answered without calling the wrapped app"""
+
+        async def fallback(scope, receive, send):
+            await PlainTextResponse("fallback", status_code=599)(scope, receive, send)
+
+        routes = {"/ip", "/status/{codes}", "/etag/{etag}"}
+        client = TestClient(FastLaneMiddleware(fallback, routes=routes))
+        assert client.get("/ip").json() == {"origin": "testclient"}
+        assert "vary" not in client.get("/ip").headers
+        assert client.put("/status/202").status_code == 202
+        assert client.get("/uuid").status_code == 599
+        assert client.get("/etag/a", headers={"If-None-Match": '"a"'}).status_code == 304
+        assert client.get("/etag/a").status_code == 599
+        assert client.get("/cache", headers={"If-None-Match": '"a"'}).status_code == 599
+        assert client.get("/ip", headers={"Origin": "https://example.com"}).status_code == 200
+
+    def test_redirects_bypass_app(self):
+        """Test redirect hops within the cap are answered without calling the app"""
+
+        async def fallback(scope, receive, send):
+            await PlainTextResponse("fallback", status_code=599)(scope, receive, send)
+
+        routes = {"/redirect/{n}", "/absolute-redirect/{n}"}
+        client = TestClient(FastLaneMiddleware(fallback, routes=routes))
+        response = client.get("/redirect/2", follow_redirects=False)
+        assert response.status_code == 302
+        assert response.headers["location"] == "/relative-redirect/1"
+        response = client.get("/absolute-redirect/1", follow_redirects=False)
+        assert response.headers["location"] == "http://testserver/get"
+        assert client.get("/relative-redirect/2").status_code == 599
+        assert client.get("/redirect/0").status_code == 599
+        assert client.get("/redirect/x").status_code == 599
+        assert client.post("/redirect/2").status_code == 599
+
+    def test_falls_through(self, clients, monkeypatch):
+        """Test query strings, other methods and unknown paths reach the app"""
+        fast, _ = clients
+        assert fast.get("/status/200?seed=1").status_code == 200
+        assert fast.head("/ip").status_code == 405
+        assert fast.get("/status/200/extra").status_code == 404
+        assert fast.get("/get").json()["url"].endswith("/get")
+
+    def test_disabled_router_not_served(self, monkeypatch):
+        """Test the fast lane only serves routes the app mounts"""
+        monkeypatch.setattr(settings, "ENABLED_ROUTERS", ["status_codes"])
+        client = TestClient(create_app())
+        assert client.get("/status/201").status_code == 201
+        assert client.get("/ip").status_code == 404
+        assert client.get("/uuid").status_code == 404
+
+    def test_metrics_labels(self, monkeypatch):
+        """Test fast-laned requests are labelled with their route template"""
+        monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+        client = TestClient(create_app())
+        client.get("/status/503")
+        text = client.get("/metrics").text
+        assert 'httpbin_requests_total{route="/status/{codes}",method="GET",status="503"}' in text
@@ -0,0 +1,111 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from httpbin.config import settings
+from httpbin.main import create_app
+from httpbin.ratelimit import TokenBuckets, parse_rate, too_many_requests
+
+
+class TestTokenBuckets:
+    """Test the token-bucket store"""
+
+    @pytest.mark.parametrize(
+        ("spec", "expected"),
+        [("10", (10.0, 10)), ("10/s", (10.0, 10)), ("120/m", (2.0, 120)), ("36/H", (0.01, 36))],
+    )
+    def test_parse_rate(self, spec, expected):
+        """Test rate specs resolve to (tokens per second, burst)"""
+        assert parse_rate(spec) == expected
+
+    @pytest.mark.parametrize("spec", ["", "x", "0/s", "-1", "10/w", "1.5/s"])
+    def test_parse_rate_invalid(self, spec):
+        """Test invalid rate specs are rejected"""
+        with pytest.raises(ValueError):
+            parse_rate(spec)
+
+    def test_take_and_refill(self):
+        """Test a bucket drains, rejects without taking, then refills at the rate"""
+        buckets = TokenBuckets(10)
+        assert [buckets.take("a", 1.0, 2, 0.0) for _ in range(3)] == [1.0, 0.0, -1.0]
+        assert buckets.take("a", 1.0, 2, 0.5) == -0.5
+        assert buckets.take("a", 1.0, 2, 1.0) == 0.0
+        assert buckets.take("a", 1.0, 2, 100.0) == 1.0
+        assert buckets.rejected == 2
+
+    def test_lru_bound(self):
+        """Test the least recently seen client is evicted once max_size is reached"""
+        buckets = TokenBuckets(2)
+        buckets.take("a", 1.0, 1, 0.0)
+        buckets.take("b", 1.0, 1, 0.0)
+        buckets.take("a", 1.0, 1, 0.0)
+        buckets.take("c", 1.0, 1, 0.0)
+        assert len(buckets) == 2
+        # "b" was evicted and starts from a full bucket, "a" is still empty
+        assert buckets.take("a", 1.0, 1, 0.0) < 0.0
+        assert buckets.take("b", 1.0, 1, 0.0) == 0.0
+
+    def test_too_many_requests(self):
+        """Test 429 headers round Retry-After and Reset up to whole seconds"""
+        response = too_many_requests(-0.5, 2.0, 10)
+        headers = dict(response.raw_headers)
+        assert response.status_code == 429
+        assert headers[b"retry-after"] == b"1"
+        assert headers[b"ratelimit-reset"] == b"5"
+        assert response is too_many_requests(-0.5, 2.0, 10)
+
+
+class TestRateLimitMiddleware:
+    """Test the per-client rate limit"""
+
+    @pytest.fixture
+    def limited(self, monkeypatch):
+        monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+        monkeypatch.setattr(settings, "RATE_LIMIT", "2/m")
+        return TestClient(create_app())
+
+    def test_limits_client(self, limited):
+        """Test requests over the limit get a 429, fast-laned endpoints included"""
+        assert limited.get("/get").status_code == 200
+        assert limited.get("/status/200").status_code == 200
+        response = limited.get("/status/200")
+        assert response.status_code == 429
+        assert response.json() == {"detail": "Too Many Requests"}
+        assert response.headers["retry-after"] == "30"
+        assert response.headers["ratelimit-limit"] == "2"
+        assert response.headers["ratelimit-remaining"] == "0"
+
+    def test_cors_headers(self, limited):
+        """Test rejections carry CORS headers, so browser clients can read the 429"""
+        origin = {"Origin": "https://example.com", "X-Forwarded-For": "203.0.113.4"}
+        for _ in range(2):
+            limited.get("/status/200", headers=origin)
+        response = limited.get("/status/200", headers=origin)
+        assert response.status_code == 429
+        assert response.headers["access-control-allow-origin"] == "https://example.com"
+        assert "retry-after" in response.headers
+
+    def test_allowed_untouched(self, limited):
+        """Test allowed responses carry no rate limit headers"""
+        assert "ratelimit-limit" not in limited.get("/get").headers
+
+    def test_keyed_on_forwarded_for(self, limited):
+        """Test clients behind a proxy are limited separately"""
+        for _ in range(2):
+            assert limited.get("/ip", headers={"X-Forwarded-For": "203.0.113.1"}).status_code == 200
+        assert limited.get("/ip", headers={"X-Forwarded-For": "203.0.113.1"}).status_code == 429
+        assert limited.get("/ip", headers={"X-Forwarded-For": "203.0.113.2"}).status_code == 200
+
+    def test_metrics(self, monkeypatch):
+        """Test rejected requests are counted under their own route"""
+        monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+        monkeypatch.setattr(settings, "RATE_LIMIT", "2/m")
+        monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+        limited = TestClient(create_app())
+        for _ in range(3):
+            limited.get("/status/200", headers={"X-Forwarded-For": "203.0.113.3"})
+        text = limited.get("/metrics").text
+        assert 'route="<rate-limited>",method="GET",status="429"} 1' in text
+
+    def test_disabled_by_default(self, client):
+        """Test no limit applies unless enabled"""
+        assert all(client.get("/status/200").status_code == 200 for _ in range(200))
@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from httpbin.routers.realtime import _ticks
+
+
+def _events(body: str) -> list[dict]:
+    """Parse the data lines of an event stream"""
+    return [json.loads(line[6:]) for line in body.splitlines() if line.startswith("data: ")]
+
+
+class TestServerSentEvents:
+    """Test the /sse endpoint"""
+
+    def test_sse(self, client):
+        """Test events are streamed one per tick"""
+        with client.stream("GET", "/sse?count=3&interval=0.02") as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            assert response.headers["cache-control"] == "no-cache"
+            body = response.read().decode()
+
+        events = _events(body)
+        assert [event["id"] for event in events] == [0, 1, 2]
+        assert "id: 2\n" in body
+        ticks = [event["tick"] for event in events]
+        assert ticks == sorted(set(ticks))
+        assert all(event["interval"] == 0.02 for event in events)
+
+    @pytest.mark.parametrize(
+        "query", ["count=0", "count=100001", "interval=0", "interval=0.001", "interval=11"]
+    )
+    def test_sse_limits(self, client, query):
+        """Test counts and intervals out of range are rejected"""
+        response = client.get(f"/sse?{query}")
+        assert response.status_code == 400
+
+
+class TestTicks:
+    """Test the shared tick stream behind /sse and /ws/stream"""
+
+    def test_subscribers_share_frames(self):
+        """Test subscribers of one interval receive the same pre-encoded payloads"""
+
+        async def subscribe():
+            return [tail async for _, tail, _ in _ticks(3, 0.02)]
+
+        async def scenario():
+            return await asyncio.gather(subscribe(), subscribe())
+
+        first, second = asyncio.run(scenario())
+        assert all(a is b for a, b in zip(first, second, strict=True))
+
+    def test_slow_consumer_skips_ticks(self):
+        """Test ticks missed by a slow consumer are skipped and counted, not queued"""
+
+        async def scenario():
+            received = []
+            async for _, tail, dropped in _ticks(3, 0.01):
+                received.append((json.loads(b"{" + tail)["tick"], dropped))
+                await asyncio.sleep(0.055)
+            return received
+
+        received = asyncio.run(scenario())
+        assert received[1][1] >= 3
+        assert received[1][0] - received[0][0] == received[1][1] + 1
+
+
+class TestWebSockets:
+    """Test the /ws endpoints"""
+
+    def test_echo(self, client):
+        """Test text and binary messages are echoed"""
+        with client.websocket_connect("/ws/echo") as websocket:
+            websocket.send_text("hello")
+            assert websocket.receive_text() == "hello"
+            websocket.send_bytes(b"\x00\xff")
+            assert websocket.receive_bytes() == b"\x00\xff"
+
+    def test_stream(self, client):
+        """Test n messages are sent and the connection is closed"""
+        with client.websocket_connect("/ws/stream/3") as websocket:
+            messages = [json.loads(websocket.receive_text()) for _ in range(3)]
+            assert websocket.receive()["type"] == "websocket.close"
+        assert messages == [{"id": 0}, {"id": 1}, {"id": 2}]
+
+    def test_stream_interval(self, client):
+        """Test messages paced by interval carry their tick"""
+        with client.websocket_connect("/ws/stream/2?interval=0.02") as websocket:
+            messages = [json.loads(websocket.receive_text()) for _ in range(2)]
+        assert [message["id"] for message in messages] == [0, 1]
+        assert messages[1]["tick"] > messages[0]["tick"]
+
+    def test_stream_invalid(self, client):
+        """Test an invalid n closes the connection with a policy violation"""
+        with (
+            pytest.raises(WebSocketDisconnect) as exc_info,
+            client.websocket_connect("/ws/stream/0") as websocket,
+        ):
+            websocket.receive_text()
+        assert exc_info.value.code == 1008
@@ -0,0 +1,125 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from httpbin.config import settings
+from httpbin.main import create_app
+from httpbin.routers.redirects import absolute_redirects, redirect_base, relative_redirects
+
+
+class TestRedirectChains:
+    """Test the /redirect/{n}, /relative-redirect/{n} and /absolute-redirect/{n} endpoints"""
+
+    def test_redirect_chain(self, client):
+        """Test /redirect/{n} follows n relative hops to /get"""
+        response = client.get("/redirect/5")
+        assert response.status_code == 200
+        assert response.json()["url"] == "http://testserver/get"
+        assert len(response.history) == 5
+        assert [hop.headers["location"] for hop in response.history] == [
+            "/relative-redirect/4",
+            "/relative-redirect/3",
+            "/relative-redirect/2",
+            "/relative-redirect/1",
+            "/get",
+        ]
+
+    def test_redirect_hop(self, client):
+        """Test each hop is an empty 302"""
+        response = client.get("/relative-redirect/2", follow_redirects=False)
+        assert response.status_code == 302
+        assert response.content == b""
+        assert response.headers["content-length"] == "0"
+        assert response.headers["location"] == "/relative-redirect/1"
+
+    def test_absolute_redirect(self, client):
+        """Test absolute hops point at the requested host"""
+        response = client.get("/absolute-redirect/2", follow_redirects=False)
+        assert response.headers["location"] == "http://testserver/absolute-redirect/1"
+        response = client.get("/redirect/3")
+        assert all(not hop.headers["location"].startswith("http") for hop in response.history)
+        response = client.get("/redirect/1?absolute=true", follow_redirects=False)
+        assert response.headers["location"] == "http://testserver/get"
+
+    def test_absolute_redirect_host(self, client):
+        """Test the Host header, including its port, ends up in the Location"""
+        response = client.get(
+            "/absolute-redirect/1", headers={"Host": "example.com:8080"}, follow_redirects=False
+        )
+        assert response.headers["location"] == "http://example.com:8080/get"
+
+    @pytest.mark.parametrize("path", ["/redirect/0", "/redirect/11", "/absolute-redirect/-1"])
+    def test_out_of_range(self, client, path):
+        """Test hop counts outside 1..MAX_REDIRECT_COUNT are rejected"""
+        response = client.get(path)
+        assert response.status_code == 400
+        assert response.json() == {"detail": "n must be between 1 and 10"}
+
+    def test_cap_setting(self, monkeypatch):
+        """Test MAX_REDIRECT_COUNT caps the chain length"""
+        monkeypatch.setattr(settings, "MAX_REDIRECT_COUNT", 20)
+        client = TestClient(create_app())
+        response = client.get("/redirect/20")
+        assert response.status_code == 200
+        assert len(response.history) == 20
+        assert client.get("/redirect/21").status_code == 400
+
+    def test_prebuilt(self):
+        """Test hops are built once and shared between requests"""
+        assert relative_redirects(10) is relative_redirects(10)
+        assert len(relative_redirects(10)) == 10
+        assert absolute_redirects("http://a", 3)[0].raw_headers == [
+            (b"content-length", b"0"),
+            (b"location", b"http://a/get"),
+        ]
+
+    @pytest.mark.parametrize(
+        ("scope", "expected"),
+        [
+            ({"headers": [(b"host", b"example.com")], "scheme": "https"}, "https://example.com"),
+            ({"headers": [], "scheme": "http", "server": ("10.0.0.1", 80)}, "http://10.0.0.1"),
+            ({"headers": [], "scheme": "http", "server": ("h", 8080)}, "http://h:8080"),
+            ({"headers": [], "scheme": "http", "root_path": "/bin"}, "http://localhost/bin"),
+            ({"headers": [(b"host", b"a\r\nb")], "scheme": "http"}, "http://a%0D%0Ab"),
+        ],
+    )
+    def test_redirect_base(self, scope, expected):
+        """Test the base URL comes from Host, else the server address"""
+        assert redirect_base(scope) == expected
+
+
+class TestRedirectTo:
+    """Test the /redirect-to endpoint"""
+
+    def test_redirect_to(self, client):
+        """Test /redirect-to redirects to the given URL with a 302"""
+        response = client.get("/redirect-to?url=https://example.com/a?b=1", follow_redirects=False)
+        assert response.status_code == 302
+        assert response.headers["location"] == "https://example.com/a?b=1"
+        assert response.content == b""
+
+    @pytest.mark.parametrize("method", ["POST", "PUT", "PATCH", "DELETE"])
+    def test_methods(self, client, method):
+        """Test /redirect-to accepts other methods and status codes"""
+        response = client.request(
+            method, "/redirect-to?url=/anything&status_code=307", follow_redirects=False
+        )
+        assert response.status_code == 307
+        assert response.headers["location"] == "/anything"
+
+    def test_quoting(self, client):
+        """Test characters unsafe in a header are percent-encoded"""
+        response = client.get(
+            "/redirect-to", params={"url": "/a b\r\nX-Evil: 1é"}, follow_redirects=False
+        )
+        assert response.headers["location"] == "/a%20b%0D%0AX-Evil:%201%C3%A9"
+        assert "x-evil" not in response.headers
+
+    @pytest.mark.parametrize("status_code", [200, 299, 400, 503])
+    def test_invalid_status(self, client, status_code):
+        """Test status codes outside 3xx are rejected"""
+        response = client.get(f"/redirect-to?url=/get&status_code={status_code}")
+        assert response.status_code == 400
+
+    def test_missing_url(self, client):
+        """Test url is required"""
+        assert client.get("/redirect-to").status_code == 422
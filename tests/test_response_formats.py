@@ -1,3 +1,14 @@
+import gzip
+import json
+import struct
+import zlib
+
+import pytest
+
+from httpbin.compression import brotli
+from httpbin.images import IMAGES, adler32_combine, negotiate_image, render_png
+
+
 class TestResponseFormats:
     """Test response format endpoints"""
 
@@ -33,3 +44,192 @@ class TestResponseFormats:
         assert response.headers["content-type"] == "text/plain; charset=utf-8"
         assert "User-agent: *" in response.text
         assert "Disallow: /deny" in response.text
+
+    @pytest.mark.parametrize("path", ["/json", "/html", "/xml", "/robots.txt"])
+    def test_etag_not_modified(self, client, path):
+        """Test strong ETag and If-None-Match handling"""
+        response = client.get(path, headers={"Accept-Encoding": "identity"})
+        etag = response.headers["etag"]
+        assert etag.startswith('"')
+
+        response = client.get(
+            path, headers={"Accept-Encoding": "identity", "If-None-Match": f'"other", {etag}'}
+        )
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+    def test_stale_etag(self, client):
+        """Test a non-matching If-None-Match returns the full body"""
+        response = client.get("/json", headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+        assert response.json()["slideshow"]["title"] == "Sample Slide Show"
+
+    @pytest.mark.parametrize(
+        ("encoding", "decompress"),
+        [("gzip", gzip.decompress), ("deflate", zlib.decompress)],
+    )
+    def test_precompressed_variants(self, client, encoding, decompress):
+        """Test precompressed variants are chosen by Accept-Encoding"""
+        identity = client.get("/html", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in identity.headers
+
+        with client.stream("GET", "/html", headers={"Accept-Encoding": encoding}) as response:
+            assert response.headers["content-encoding"] == encoding
+            assert "Accept-Encoding" in response.headers["vary"]
+            assert response.headers["etag"] != identity.headers["etag"]
+            raw = b"".join(response.iter_raw())
+        assert decompress(raw) == identity.content
+
+    @pytest.mark.skipif(brotli is None, reason="brotli is not installed")
+    def test_brotli_variant(self, client):
+        """Test the brotli variant"""
+        response = client.get("/json", headers={"Accept-Encoding": "gzip, br"})
+        assert response.headers["content-encoding"] == "br"
+        assert response.json()["slideshow"]["author"] == "Yours Truly"
+
+    def test_tiny_payload_not_compressed(self, client):
+        """Test payloads that do not shrink are served uncompressed"""
+        response = client.get("/robots.txt", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+    @pytest.mark.parametrize(
+        ("path", "encoding", "flag", "decompress"),
+        [
+            ("/gzip", "gzip", "gzipped", gzip.decompress),
+            ("/deflate", "deflate", "deflated", zlib.decompress),
+        ],
+    )
+    def test_compressed_endpoints(self, client, path, encoding, flag, decompress):
+        """Test gzip and deflate encoded request data"""
+        with client.stream("GET", f"{path}?foo=bar") as response:
+            assert response.status_code == 200
+            assert response.headers["content-encoding"] == encoding
+            raw = b"".join(response.iter_raw())
+        data = json.loads(decompress(raw))
+        assert data[flag] is True
+        assert data["args"] == {"foo": "bar"}
+        assert data["method"] == "GET"
+
+    @pytest.mark.skipif(brotli is None, reason="brotli is not installed")
+    def test_brotli_endpoint(self, client):
+        """Test brotli encoded request data"""
+        with client.stream("GET", "/brotli") as response:
+            assert response.headers["content-encoding"] == "br"
+            raw = b"".join(response.iter_raw())
+        assert json.loads(brotli.decompress(raw))["brotli"] is True
+
+
+class TestImages:
+    """Test the /image endpoints"""
+
+    @pytest.mark.parametrize(
+        ("accept", "media_type"),
+        [
+            (None, "image/png"),
+            ("*/*", "image/png"),
+            ("image/*", "image/png"),
+            ("image/jpeg", "image/jpeg"),
+            ("image/svg+xml", "image/svg+xml"),
+            ("image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8", "image/webp"),
+            ("image/webp;q=0.5, image/jpeg;q=0.9", "image/jpeg"),
+            ("image/*, image/png;q=0", "image/webp"),
+        ],
+    )
+    def test_negotiated(self, client, accept, media_type):
+        """Test /image serves the format the Accept header prefers"""
+        headers = {"Accept": accept} if accept else {}
+        response = client.get("/image", headers=headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == media_type
+        assert response.headers["vary"].startswith("Accept")
+
+    def test_not_acceptable(self, client):
+        """Test /image returns 406 when no image type is acceptable"""
+        response = client.get("/image", headers={"Accept": "text/html, image/*;q=0"})
+        assert response.status_code == 406
+        assert response.headers["vary"].startswith("Accept")
+
+    def test_negotiation_cached(self):
+        """Test the negotiation result is cached per Accept header"""
+        negotiate_image.cache_clear()
+        negotiate_image("image/webp")
+        negotiate_image("image/webp")
+        assert negotiate_image.cache_info().hits == 1
+
+    @pytest.mark.parametrize(
+        ("fmt", "media_type", "magic"),
+        [
+            ("png", "image/png", b"\x89PNG"),
+            ("jpeg", "image/jpeg", b"\xff\xd8\xff"),
+            ("webp", "image/webp", b"RIFF"),
+            ("svg", "image/svg+xml", b"<svg"),
+        ],
+    )
+    def test_formats(self, client, fmt, media_type, magic):
+        """Test /image/{format} serves the bundled asset"""
+        response = client.get(f"/image/{fmt}")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == media_type
+        assert response.content == IMAGES[fmt]
+        assert response.content.startswith(magic)
+        assert not response.headers["vary"].startswith("Accept,")
+
+    def test_image_not_modified(self, client):
+        """Test image ETags revalidate"""
+        etag = client.get("/image/jpeg").headers["etag"]
+        response = client.get("/image/jpeg", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_raster_not_compressed(self, client):
+        """Test only SVG gets a compressed variant"""
+        response = client.get("/image/png", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        response = client.get("/image/svg", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+
+    def test_sized(self, client):
+        """Test /image/{width}x{height} renders a PNG of that size"""
+        response = client.get("/image/300x70")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/png"
+        assert struct.unpack(">II", response.content[16:24]) == (300, 70)
+        assert response.content == render_png(300, 70)
+        etag = response.headers["etag"]
+        assert client.get("/image/300x70", headers={"If-None-Match": etag}).status_code == 304
+
+    @pytest.mark.parametrize("path", ["/image/0x10", "/image/10x4097"])
+    def test_sized_out_of_range(self, client, path):
+        """Test sizes outside 1..MAX_IMAGE_SIZE are rejected"""
+        assert client.get(path).status_code == 400
+
+    @pytest.mark.parametrize(("width", "height"), [(1, 1), (33, 17), (50, 64), (7, 100)])
+    def test_render_png(self, width, height):
+        """Test rendered PNGs decode to a checkerboard with a valid checksum"""
+        png = render_png(width, height)
+        (length,) = struct.unpack(">I", png[33:37])
+        assert png[37:41] == b"IDAT"
+        # zlib.decompress verifies the Adler-32 trailer
+        pixels = zlib.decompress(png[41 : 41 + length])
+        stride = 1 + width * 3
+        assert len(pixels) == height * stride
+
+        # Undo the Up filter and check each square alternates
+        previous = bytes(stride - 1)
+        for y in range(height):
+            row = pixels[y * stride : (y + 1) * stride]
+            if row[0] == 2:
+                row = bytes((a + b) & 0xFF for a, b in zip(row[1:], previous, strict=True))
+            else:
+                row = row[1:]
+            for x in range(width):
+                light = (x // 16 + y // 16) % 2 == 0
+                assert row[x * 3] == (0xEE if light else 0xCC)
+            previous = row
+
+    def test_adler32_combine(self):
+        """Test checksums combine like zlib's adler32 over the concatenation"""
+        first, second = b"a" * 70000, b"checkerboard" * 9
+        combined = adler32_combine(zlib.adler32(first), zlib.adler32(second), len(second))
+        assert combined == zlib.adler32(first + second)
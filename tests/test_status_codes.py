@@ -1,5 +1,10 @@
+import random
+from collections import Counter
+
 import pytest
 
+from httpbin.routers.status_codes import _seeded, parse_status_spec
+
 
 class TestStatusCodes:
     """Test status code endpoints"""
@@ -14,11 +19,55 @@ class TestStatusCodes:
             assert data["code"] == status_code
 
     def test_multiple_status_codes(self, client):
-        """Test comma-separated status codes (returns first)"""
-        response = client.get("/status/404,500")
-        assert response.status_code == 404
-        data = response.json()
-        assert data["code"] == 404
+        """Test comma-separated status codes are chosen at random"""
+        seen = set()
+        for _ in range(50):
+            response = client.get("/status/404,500")
+            assert response.json()["code"] == response.status_code
+            seen.add(response.status_code)
+        assert seen == {404, 500}
+
+    def test_weighted_status_codes(self):
+        """Test weighted mixes are sampled in proportion to their weights"""
+        mix = parse_status_spec("200:0.9,500:0.05,503:0.05")
+        rng = random.Random(1)
+        counts = Counter(mix.choose(rng.random).status_code for _ in range(20000))
+        assert set(counts) == {200, 500, 503}
+        assert 0.88 < counts[200] / 20000 < 0.92
+        assert 0.04 < counts[500] / 20000 < 0.06
+
+    def test_zero_weight_never_chosen(self):
+        """Test a zero weight excludes a code"""
+        mix = parse_status_spec("200:1,500:0")
+        assert {mix.choose(random.random).status_code for _ in range(1000)} == {200}
+
+    def test_seed_reproducible(self, client):
+        """Test a seed replays the same sequence of codes"""
+        _seeded.clear()
+        first = [client.get("/status/200,404,500?seed=7").status_code for _ in range(20)]
+        _seeded.clear()
+        second = [client.get("/status/200,404,500?seed=7").status_code for _ in range(20)]
+        assert first == second
+        assert len(set(first)) > 1
+
+    def test_spec_cached(self):
+        """Test a repeated spec is parsed once"""
+        parse_status_spec("201:0.5,202:0.5")
+        hits = parse_status_spec.cache_info().hits
+        assert parse_status_spec("201:0.5,202:0.5") is parse_status_spec("201:0.5,202:0.5")
+        assert parse_status_spec.cache_info().hits == hits + 2
+
+    @pytest.mark.parametrize("spec", ["200:x", "200:-1", "200:0", "200:inf"])
+    def test_invalid_weight(self, client, spec):
+        """Test malformed or all-zero weights are rejected"""
+        response = client.get(f"/status/{spec}")
+        assert response.status_code == 400
+
+    def test_status_phrase(self, client):
+        """Test responses carry the standard reason phrase"""
+        assert client.get("/status/201").json() == {"code": 201, "message": "Created"}
+        assert client.get("/status/599").json()["message"] == "Unknown Status"
+        assert client.get("/status/204").content == b""
 
     def test_invalid_status_code(self, client):
         """Test invalid status code"""
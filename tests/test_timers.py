@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+from httpbin.timers import current_tick, get_scheduler, sleep_unless_disconnected, wait_for_tick
+
+
+def _receive_disconnect_after(seconds: float):
+    """Build an ASGI receive that reports a disconnect after ``seconds``"""
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.sleep(seconds)
+        return {"type": "http.disconnect"}
+
+    return receive
+
+
+class TestDelayScheduler:
+    """Test the shared deadline scheduler"""
+
+    def test_waiters_share_timer(self):
+        """Test concurrent waiters are woken in order from one scheduler"""
+
+        async def scenario():
+            scheduler = get_scheduler()
+            woken = []
+
+            async def wait(delay):
+                await scheduler.schedule(delay)
+                woken.append(delay)
+
+            await asyncio.gather(*(wait(d) for d in (0.03, 0.01, 0.02, 0.01)))
+            return scheduler, woken
+
+        scheduler, woken = asyncio.run(scenario())
+        assert woken == [0.01, 0.01, 0.02, 0.03]
+        assert scheduler.pending == 0
+        assert scheduler.max_pending == 4
+
+    def test_never_early(self):
+        """Test a waiter is not woken before its deadline"""
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await get_scheduler().schedule(0.05)
+            return loop.time() - start
+
+        assert asyncio.run(scenario()) >= 0.05
+
+    def test_tick_subscribers_share_entry(self):
+        """Test every subscriber of an interval shares one scheduler entry per tick"""
+
+        async def scenario():
+            scheduler = get_scheduler()
+            tick = current_tick(0.02) + 1
+            waits = [asyncio.ensure_future(wait_for_tick(tick, 0.02)) for _ in range(100)]
+            await asyncio.sleep(0)
+            entries = len(scheduler._ticks)
+            await asyncio.gather(*waits)
+            return entries, current_tick(0.02) >= tick
+
+        entries, reached = asyncio.run(scenario())
+        assert entries == 1
+        assert reached
+
+    def test_disconnect_cancels_wait(self):
+        """Test a client disconnect ends the wait early"""
+
+        async def scenario():
+            completed = await sleep_unless_disconnected(5, _receive_disconnect_after(0.05))
+            return completed, get_scheduler().pending
+
+        start = time.perf_counter()
+        completed, pending = asyncio.run(scenario())
+        assert completed is False
+        assert pending == 0
+        assert time.perf_counter() - start < 1
+
+    def test_completes_without_disconnect(self):
+        """Test the wait completes while the client stays connected"""
+        completed = asyncio.run(sleep_unless_disconnected(0.01, _receive_disconnect_after(5)))
+        assert completed is True
@@ -0,0 +1,35 @@
+import time
+import uuid
+
+from httpbin.uuids import UUID7Clock, uuid4_batch
+
+
+class TestUUIDs:
+    """Test bulk UUID generation"""
+
+    def test_uuid4_batch(self):
+        """Test bulk v4 ids are valid, distinct version 4 UUIDs"""
+        ids = uuid4_batch(1000)
+        assert len(set(ids)) == 1000
+        for value in ids:
+            parsed = uuid.UUID(value)
+            assert str(parsed) == value
+            assert parsed.version == 4
+            assert parsed.variant == uuid.RFC_4122
+
+    def test_uuid7_monotonic(self):
+        """Test v7 ids strictly increase, across batches and counter overflow"""
+        clock = UUID7Clock()
+        ids = clock.batch(10_000) + clock.batch(10)
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+        parsed = uuid.UUID(ids[0])
+        assert parsed.version == 7
+        assert parsed.variant == uuid.RFC_4122
+
+    def test_uuid7_timestamp(self):
+        """Test v7 ids carry the current Unix time in milliseconds"""
+        before = time.time_ns() // 1_000_000
+        value = UUID7Clock().batch(1)[0]
+        after = time.time_ns() // 1_000_000
+        assert before <= uuid.UUID(value).int >> 80 <= after